@@ -0,0 +1,94 @@
+"""
+csv_io's reader shapes vs list(csv.DictReader(f)) on an order-items file.
+
+A generated day of order items is repeated up to `rows` rows. Each shape
+reads the whole file and keeps every chunk; time is measured without
+tracing, memory as the bytes held per row afterwards (Python objects
+plus Arrow buffers). The process pool's time includes starting its
+workers and pickling the rows back, and only beats read_csv with more
+than one free core.
+
+    PYTHONPATH=src python benchmarks/bench_csv_reader.py [rows]
+"""
+import csv
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+import pyarrow as pa
+
+from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+from batch_data_pipeline.ingestion.utils.csv_io import iter_csv_chunks, iter_csv_parts, read_csv
+from batch_data_pipeline.ingestion.utils.file_finder import find_day_file
+
+DAY = date(2025, 1, 1)
+
+
+def dict_reader(path):
+    with path.open("r", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def chunks(output):
+    def read(path):
+        return list(iter_csv_chunks(path, output=output))
+    return read
+
+
+def parallel(workers):
+    def read(path):
+        return [row for part in iter_csv_parts(path, workers) for row in part.rows]
+    return read
+
+
+def arrow_table(path):
+    return pa.Table.from_batches(list(iter_csv_chunks(path, output="arrow")))
+
+
+READERS = [
+    ("csv.DictReader", dict_reader),
+    ("read_csv (dicts)", read_csv),
+    ("tuple chunks", chunks("tuple")),
+    ("column chunks", chunks("columns")),
+    ("arrow batches", arrow_table),
+    ("4 processes (dicts)", parallel(4)),
+]
+
+
+def make_file(tmp: str, rows: int) -> Path:
+    counts = {"customers": 100, "products": 100, "orders": 10_000}
+    EcommerceDataGenerator(tmp, counts, counts, seed=1).run_initial_load(DAY)
+    lines = find_day_file(Path(tmp) / DAY.isoformat(), "order_items", DAY).read_text().splitlines(keepends=True)
+    path = Path(tmp) / "order_items_big.csv"
+    with path.open("w", encoding="utf-8") as f:
+        f.write(lines[0])
+        body = lines[1:]
+        for i in range(rows):
+            f.write(body[i % len(body)])
+    return path
+
+
+def main(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_file(tmp, rows)
+        print(f"{rows:,} order items, {path.stat().st_size / 2**20:.0f} MiB")
+        for label, read in READERS:
+            start = time.perf_counter()
+            read(path)
+            elapsed = time.perf_counter() - start
+
+            arrow_before = pa.total_allocated_bytes()
+            tracemalloc.start()
+            held = read(path)
+            # Arrow buffers live outside the Python allocator
+            size = tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes() - arrow_before
+            tracemalloc.stop()
+            del held
+            print(f"  {label:<20} {elapsed:6.2f}s  {rows / elapsed / 1e6:5.2f}M rows/s  {size / rows:7.1f} B/row")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
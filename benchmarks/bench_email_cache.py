@@ -0,0 +1,61 @@
+"""
+Customer validation with pydantic's EmailStr vs the memoized email check.
+
+One generated day of customers (python engine, CSV). "cold" clears the caches
+before the pass, so mostly the domain cache helps; "warm" validates the same
+rows again, as when customers re-appear in a later file.
+
+    PYTHONPATH=src python benchmarks/bench_email_cache.py [customers]
+"""
+import csv
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+from pydantic import EmailStr
+
+from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+from batch_data_pipeline.validation.email_cache import clear_email_cache, email_cache_stats
+from batch_data_pipeline.validation.helpers import validate_records
+from batch_data_pipeline.validation.schema.customer import Customer
+
+DAY = date(2025, 1, 1)
+
+
+class EmailStrCustomer(Customer):
+    email: Optional[EmailStr]
+
+
+def per_row_us(rows, schema, clear: bool) -> float:
+    if clear:
+        clear_email_cache()
+    start = time.perf_counter()
+    validate_records(rows, schema)
+    return (time.perf_counter() - start) / len(rows) * 1e6
+
+
+def main(customers: int) -> None:
+    counts = {"customers": customers, "products": 10, "orders": 10}
+    with tempfile.TemporaryDirectory() as tmp:
+        EcommerceDataGenerator(tmp, counts, counts, seed=1).run_initial_load(DAY)
+        with (Path(tmp) / DAY.isoformat() / f"customers_{DAY}.csv").open() as f:
+            rows = list(csv.DictReader(f))
+
+    base = per_row_us(rows, EmailStrCustomer, clear=True)
+    cold = per_row_us(rows, Customer, clear=True)
+    stats = email_cache_stats()
+    warm = per_row_us(rows, Customer, clear=False)
+
+    print(f"{len(rows):,} customers")
+    print(f"EmailStr      {base:7.2f}us/row")
+    print(f"cached, cold  {cold:7.2f}us/row  speedup {base / cold:.2f}x  "
+          f"domain hit rate {stats['domains']['hit_rate']:.1%}")
+    print(f"cached, warm  {warm:7.2f}us/row  speedup {base / warm:.2f}x  "
+          f"email hit rate {email_cache_stats()['emails']['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
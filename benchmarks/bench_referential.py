@@ -0,0 +1,47 @@
+"""
+ReferenceIndex history: Bloom filter size and lookup speed vs a Python set.
+
+`n` historical customer IDs go into the index's history, then `n` order FKs
+(5% unknown, like the generator's) are checked against it.
+
+    PYTHONPATH=src python benchmarks/bench_referential.py [n]
+"""
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+
+from batch_data_pipeline.validation.referential import ReferenceIndex
+
+
+def main(n: int) -> None:
+    rng = random.Random(0)
+    keys = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(n)]
+    lookups = [str(uuid.uuid4()) if rng.random() < 0.05 else rng.choice(keys) for _ in range(n)]
+
+    tracemalloc.start()
+    known = set(keys)
+    set_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    orphans = sum(key not in known for key in lookups)
+    set_time = time.perf_counter() - start
+
+    index = ReferenceIndex()
+    start = time.perf_counter()
+    index.seed("customers", keys)
+    seed_time = time.perf_counter() - start
+    start = time.perf_counter()
+    found = index.contains("customers", lookups)
+    bloom_time = time.perf_counter() - start
+    history = index.history("customers")
+
+    print(f"{n:,} keys, {orphans:,} orphan lookups")
+    print(f"  set    {set_bytes / 2**20:8.1f} MiB  ({set_bytes / n:5.1f} B/key, str keys excluded)  lookup {set_time:5.2f}s")
+    print(f"  bloom  {history.nbytes / 2**20:8.1f} MiB  ({history.nbytes / n:5.1f} B/key)  seed {seed_time:5.2f}s  "
+          f"lookup {bloom_time:5.2f}s  orphans missed {orphans - int((~found).sum()):,}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
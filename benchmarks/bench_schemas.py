@@ -0,0 +1,61 @@
+"""
+Per-row validation cost of each entity schema vs its compiled variant.
+
+One generated day (python engine, CSV) per run; every row goes through
+schema.__pydantic_validator__ once per repeat, invalid rows included.
+
+    PYTHONPATH=src python benchmarks/bench_schemas.py [orders]
+"""
+import csv
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+from batch_data_pipeline.validation.schema.compiled import COMPILED_SCHEMAS
+from batch_data_pipeline.validation.schema.customer import Customer
+from batch_data_pipeline.validation.schema.order import Order
+from batch_data_pipeline.validation.schema.order_item import OrderItem
+from batch_data_pipeline.validation.schema.payment import Payment
+from batch_data_pipeline.validation.schema.product import Product
+
+SCHEMAS = {"customers": Customer, "products": Product, "orders": Order, "order_items": OrderItem, "payments": Payment}
+DAY = date(2025, 1, 1)
+
+
+def per_row_us(rows, schema, repeat: int = 3) -> float:
+    """Best of `repeat` passes, in microseconds per row."""
+    validator = schema.__pydantic_validator__
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for row in rows:
+            try:
+                validator.validate_python(row)
+            except ValidationError:
+                pass
+        best = min(best, time.perf_counter() - start)
+    return best / len(rows) * 1e6
+
+
+def main(orders: int) -> None:
+    counts = {"customers": orders // 2, "products": orders // 10, "orders": orders}
+    with tempfile.TemporaryDirectory() as tmp:
+        EcommerceDataGenerator(tmp, counts, counts, seed=1).run_initial_load(DAY)
+        for table, schema in SCHEMAS.items():
+            with (Path(tmp) / DAY.isoformat() / f"{table}_{DAY}.csv").open() as f:
+                rows = list(csv.DictReader(f))
+            base = per_row_us(rows, schema)
+            compiled = per_row_us(rows, COMPILED_SCHEMAS[schema])
+            print(
+                f"{table:<12} {len(rows):>8,} rows  {schema.__name__:<10} {base:6.2f}us/row  "
+                f"compiled {compiled:6.2f}us/row  speedup {base / compiled:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
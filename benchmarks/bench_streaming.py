@@ -0,0 +1,66 @@
+"""
+Peak traced memory of ingest_orders, in memory vs streaming=True.
+
+One generated day of orders (python engine, CSV); uploads go to a stub
+bucket that only records the object names.
+
+    PYTHONPATH=src python benchmarks/bench_streaming.py [orders]
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+from batch_data_pipeline.ingestion.ingestors.order_ingestion import ingest_orders
+from batch_data_pipeline.validation.helpers import DEFAULT_BATCH_SIZE
+
+DAY = date(2025, 1, 1)
+
+
+class _Blob:
+    def __init__(self, uploaded, path):
+        self.uploaded, self.path = uploaded, path
+
+    def exists(self):
+        return False
+
+    def upload_from_filename(self, filename):
+        self.uploaded.append(self.path)
+
+
+class _Bucket:
+    name = "bench"
+
+    def __init__(self):
+        self.uploaded = []
+
+    def blob(self, path):
+        return _Blob(self.uploaded, path)
+
+
+def measure(day_folder: Path, streaming: bool):
+    tracemalloc.start()
+    start = time.perf_counter()
+    summary = ingest_orders(day_folder, DAY, _Bucket(), streaming=streaming)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return summary, elapsed, peak
+
+
+def main(orders: int) -> None:
+    counts = {"customers": 100, "products": 100, "orders": orders}
+    with tempfile.TemporaryDirectory() as tmp:
+        EcommerceDataGenerator(tmp, counts, counts, seed=1).run_initial_load(DAY)
+        day_folder = Path(tmp) / DAY.isoformat()
+        for streaming in (False, True):
+            summary, elapsed, peak = measure(day_folder, streaming)
+            label = f"streaming (batch {DEFAULT_BATCH_SIZE:,})" if streaming else "in memory"
+            print(f"{summary['total_rows']:>9,} orders  {label:<26} {elapsed:6.2f}s  peak {peak / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,58 @@
+"""
+parse_timestamps vs one TypeAdapter(datetime) call per value.
+
+Timestamps in the generator's isoformat() layout, with a share of awkward
+values (offsets, spaces, typos) that take the fallback parser.
+
+    PYTHONPATH=src python benchmarks/bench_timestamps.py [n]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from pydantic import TypeAdapter, ValidationError
+
+from batch_data_pipeline.validation.timestamps import parse_timestamps
+
+AWKWARD = ["2025-04-01 05:55:32", "2025-04-01T05:55:32Z", " 2025-04-01T05:55:32 ", "2023-02-29T00:00:00", "yesterday"]
+
+
+def make_values(n: int, awkward_rate: float, seed: int = 0):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    return [
+        rng.choice(AWKWARD) if rng.random() < awkward_rate
+        else (start + timedelta(seconds=rng.randrange(86_400 * 365), microseconds=rng.choice([0, rng.randrange(10**6)]))).isoformat()
+        for _ in range(n)
+    ]
+
+
+def one_by_one(values):
+    adapter = TypeAdapter(datetime)
+    out = []
+    for v in values:
+        try:
+            out.append(adapter.validate_python(v.strip() if isinstance(v, str) else v))
+        except ValidationError:
+            out.append(None)
+    return out
+
+
+def main(n: int) -> None:
+    for rate in (0.0, 0.01, 0.1):
+        values = make_values(n, rate)
+        start = time.perf_counter()
+        one_by_one(values)
+        base = time.perf_counter() - start
+        start = time.perf_counter()
+        parsed = parse_timestamps(values)
+        column = time.perf_counter() - start
+        print(
+            f"{n:,} values, {rate:4.0%} awkward  per value {base:5.2f}s  "
+            f"column {column:5.2f}s  speedup {base / column:4.1f}x  fallback {parsed.fallback:,}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,33 @@
+"""
+Per-call uuid4 vs the bulk UUID path used by the generator.
+
+    PYTHONPATH=src python benchmarks/bench_uuids.py [n]
+"""
+import sys
+import time
+import uuid
+
+from batch_data_pipeline.generators.uuids import UuidBuffer, format_uuids, uuid4_bytes
+
+
+def timed(label: str, n: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s  {n / elapsed / 1e6:6.2f}M uuids/s")
+    return elapsed
+
+
+def main(n: int) -> None:
+    print(f"{n:,} UUIDs")
+    base = timed("str(uuid.uuid4()) per call", n, lambda: [str(uuid.uuid4()) for _ in range(n)])
+
+    buffer = UuidBuffer()
+    buffered = timed("UuidBuffer.next() per call", n, lambda: [buffer.next() for _ in range(n)])
+    bulk = timed("format_uuids(uuid4_bytes(n))", n, lambda: format_uuids(uuid4_bytes(n)).tolist())
+
+    print(f"speedup: buffer {base / buffered:.1f}x, bulk {base / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
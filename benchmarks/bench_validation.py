@@ -0,0 +1,127 @@
+"""
+Row-by-row model_validate vs the chunked list[Schema] path in validate_records,
+validate_records + model_dump(mode="json") vs the column-at-a-time
+validator, and the model / json / tuple outputs of validate_records
+written with write_validated_csv (time and peak traced memory per row).
+
+Order items as they come out of csv.DictReader (all strings), with a share of
+rows made invalid (empty order_id) at the generator's injection rates.
+
+    PYTHONPATH=src python benchmarks/bench_validation.py [n]
+"""
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from batch_data_pipeline.ingestion.loaders.validated_helpers import write_validated_csv
+from batch_data_pipeline.validation.columnar import validate_columnar
+from batch_data_pipeline.validation.helpers import extract_error_details, validate_records
+from batch_data_pipeline.validation.schema.order_item import OrderItem
+
+
+def make_rows(n: int, invalid_rate: float, seed: int = 0):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        quantity = rng.randint(1, 5)
+        price = round(rng.uniform(5, 500), 2)
+        rows.append({
+            "order_item_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "order_id": "" if rng.random() < invalid_rate else str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "product_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "quantity": str(quantity),
+            "unit_price": str(price),
+            "line_total": str(round(price * quantity, 2)),
+        })
+    return rows
+
+
+def per_row(rows, schema):
+    """validate_records as it was: one model_validate per row."""
+    valid, invalid = [], []
+    for idx, record in enumerate(rows):
+        try:
+            valid.append(schema.model_validate(record))
+        except ValidationError as e:
+            invalid.append({"row_index": idx, "raw_data": record, "errors": extract_error_details(e)})
+    return valid, invalid
+
+
+def dumped(rows, schema):
+    valid, invalid = validate_records(rows, schema)
+    return [m.model_dump(mode="json") for m in valid], invalid
+
+
+def timed(fn, repeat: int = 3):
+    """Best of `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(n: int) -> None:
+    print(f"{n:,} order items")
+    validate_records(make_rows(1_000, 0.05), OrderItem)  # build the adapter outside the timings
+
+    for rate in (0.01, 0.05, 0.10):
+        rows = make_rows(n, rate)
+        base, (valid_a, invalid_a) = timed(lambda: per_row(rows, OrderItem))
+        batch, (valid_b, invalid_b) = timed(lambda: validate_records(rows, OrderItem))
+
+        assert invalid_a == invalid_b
+        assert [m.model_dump() for m in valid_a] == [m.model_dump() for m in valid_b]
+        print(
+            f"{rate:>4.0%} invalid ({len(invalid_b):,} rows): "
+            f"per-row {base:6.2f}s  batched {batch:6.2f}s  speedup {base / batch:.1f}x"
+        )
+
+        dump, expected = timed(lambda: dumped(rows, OrderItem))
+        columnar, result = timed(lambda: validate_columnar(rows, OrderItem))
+        assert result == expected
+        print(
+            f"{'':>27}  pydantic+dump {dump:6.2f}s  columnar {columnar:6.2f}s  speedup {dump / columnar:.1f}x"
+        )
+
+
+def to_csv(rows, output: str, path: Path) -> None:
+    """validate_records with `output`, then write_validated_csv: the ingestor path up to the upload."""
+    valid, _ = validate_records(rows, OrderItem, output=output)
+    if output == "model":
+        valid = [m.model_dump(mode="json") for m in valid]
+    write_validated_csv(valid, path, list(OrderItem.model_fields) if output == "tuple" else None)
+
+
+def peak_bytes(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_outputs(n: int) -> None:
+    rows = make_rows(n, 0.05)
+    print(f"\n{n:,} order items → validated CSV, by validate_records output")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "validated.csv"
+        for output in ("model", "json", "tuple"):
+            to_csv(rows[:1_000], output, path)  # build the validators outside the timings
+            elapsed, _ = timed(lambda: to_csv(rows, output, path))
+            peak = peak_bytes(lambda: to_csv(rows, output, path))
+            print(f"{output:>6}: {elapsed / n * 1e6:6.2f}us/row  peak {peak / n:7.0f} B/row")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    main(n)
+    bench_outputs(n)
@@ -0,0 +1,43 @@
+"""
+Validating a raw orders file vs loading its cached result.
+
+One generated day of orders (CSV); the first pass validates and stores the
+result, the second is the retry that loads it.
+
+    PYTHONPATH=src python benchmarks/bench_validation_cache.py [orders]
+"""
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+from batch_data_pipeline.ingestion.ingestors.order_ingestion import validate_order_rows
+from batch_data_pipeline.ingestion.utils.csv_io import read_csv
+from batch_data_pipeline.ingestion.utils.file_finder import find_day_file
+from batch_data_pipeline.validation.cache import ValidationCache
+from batch_data_pipeline.validation.schema.order import Order
+
+DAY = date(2025, 1, 1)
+
+
+def main(orders: int) -> None:
+    counts = {"customers": 100, "products": 100, "orders": orders}
+    with tempfile.TemporaryDirectory() as tmp:
+        EcommerceDataGenerator(tmp, counts, counts, seed=1).run_initial_load(DAY)
+        path = find_day_file(Path(tmp) / DAY.isoformat(), "orders", DAY)
+        rows = read_csv(path)
+        cache = ValidationCache(Path(tmp) / "_validation_cache")
+
+        for label in ("validate + store", "cached"):
+            start = time.perf_counter()
+            cleaned, invalid = cache.get_or_validate(path, Order, "pydantic", lambda: validate_order_rows(rows))
+            print(f"{len(rows):,} orders  {label:<17} {time.perf_counter() - start:6.2f}s")
+
+        size = sum(p.stat().st_size for p in cache.root.iterdir())
+        print(f"entry {size / 2**20:.1f} MiB  (raw file {path.stat().st_size / 2**20:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
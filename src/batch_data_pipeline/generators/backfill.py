@@ -0,0 +1,148 @@
+import logging
+import multiprocessing
+import os
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tables of a day run in three waves across the whole range, so each day's FK
+# picks only see IDs registered for that day or earlier: every day's
+# customers/products exist before any orders are drawn, and so on.
+WAVES = [("customers", "products"), ("orders",), ("order_items", "payments")]
+
+_worker = None
+
+
+def backfill_days(start: date, end: date) -> List[date]:
+    """Every day from start to end, both included."""
+    if end < start:
+        raise ValueError(f"Backfill end {end} is before start {start}")
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def day_seed(master_seed: int, day: date, wave: int) -> int:
+    """
+    Reproducible seed per (day, wave), independent of which worker runs it or in what order.
+
+    128 bits, so the streams of a long backfill don't collide the way 2^32
+    seeds start to after tens of thousands of (day, wave) pairs. Primary-key
+    UUIDs don't come from these streams unless reproducible_ids is set.
+    """
+    return random.Random(f"{master_seed}/{day.isoformat()}/{wave}").getrandbits(128)
+
+
+def _init_worker(generator_kwargs: Dict[str, Any]) -> None:
+    """Build one generator per worker process and keep it warm for every day it is handed."""
+    global _worker
+    from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+
+    _worker = EcommerceDataGenerator(**generator_kwargs)
+    if _worker.engine == "numpy":
+        _worker._columnar_engine()
+
+
+def _run_day(task: Dict[str, Any], generator=None) -> str:
+    gen = generator or _worker
+    gen.reseed(task["seed"], email_serial=task["email_serial"])
+    gen.run_day_tables(task["day"], task["tables"], initial=task["initial"])
+    return task["day"].isoformat()
+
+
+class Backfill:
+    """
+    A date range generated with one warm generator per worker.
+
+    Faker, the vocabulary pools and the ID registry are set up once per worker
+    instead of once per day. Days run in parallel inside each wave; the
+    registry carries the IDs between waves and workers, so FKs are drawn from
+    every day up to the one being generated, as with one-by-one daily runs.
+    """
+
+    def __init__(self, generator, start: date, end: date, initial_first: bool = False):
+        if generator.registry is None:
+            raise ValueError("Backfill needs persistent_ids=True so days can share their IDs")
+        self.generator = generator
+        self.days = backfill_days(start, end)
+        self.initial_first = initial_first
+
+    def run(self, workers: int = 1) -> List[str]:
+        if workers <= 1:
+            return self._run_waves(None)
+
+        if self.generator.engine == "numpy":
+            # warm the Faker pool cache once so workers only read it
+            self.generator._columnar_engine()
+
+        # spawn, not fork: the parent may already run threads (pyarrow, GCS clients)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.generator_kwargs(),),
+        ) as pool:
+            return self._run_waves(pool)
+
+    def generator_kwargs(self) -> Dict[str, Any]:
+        """Constructor arguments that rebuild the generator in a worker process."""
+        gen = self.generator
+        return {
+            "output_path": gen.output_path,
+            "initial_rows": gen.initial_rows,
+            "daily_rows": gen.daily_rows,
+            "engine": gen.engine,
+            "seed": gen.seed,
+            "reproducible_ids": gen.reproducible_ids,
+            "pool_size": gen.pool_size,
+            "pool_seed": gen.pool_seed,
+            "pool_cache_dir": gen.pool_cache_dir,
+            "streaming": gen.streaming,
+            "chunk_size": gen.chunk_size,
+            "output_format": gen.output_format,
+            "row_group_size": gen.row_group_size,
+            "persistent_ids": True,
+            "registry_dir": gen.registry.root,
+        }
+
+    def _run_waves(self, pool: Optional[Executor]) -> List[str]:
+        master_seed = self.generator.seed
+        serials = self._email_serials()
+        logger.info(f"Backfilling {len(self.days)} days {self.days[0]} → {self.days[-1]}")
+
+        for wave, tables in enumerate(WAVES):
+            tasks = [
+                {
+                    "day": day,
+                    "tables": tables,
+                    "initial": self._initial(day),
+                    "seed": day_seed(master_seed, day, wave),
+                    "email_serial": serials[day],
+                }
+                for day in self.days
+            ]
+            if pool is None:
+                for task in tasks:
+                    _run_day(task, self.generator)
+            else:
+                # list() re-raises the first worker error before the next wave starts
+                list(pool.map(_run_day, tasks))
+            logger.info(f"Backfill wave {wave + 1}/{len(WAVES)} done: {', '.join(tables)}")
+
+        # leave the caller's generator pointing at the full history
+        self.generator.seed = master_seed
+        self.generator.load_pools(self.days[-1], ("customers", "products", "orders"))
+        return [os.path.join(self.generator.output_path, day.isoformat()) for day in self.days]
+
+    def _initial(self, day: date) -> bool:
+        return self.initial_first and day == self.days[0]
+
+    def _email_serials(self) -> Dict[date, int]:
+        """First email serial of each day, so numpy-engine addresses stay unique across parallel days."""
+        serials: Dict[date, int] = {}
+        total = self.generator.registry.count("customers", upto_day=self.days[0] - timedelta(days=1))
+        for day in self.days:
+            serials[day] = total
+            total += self.generator._rows("customers", self._initial(day))
+        return serials
@@ -0,0 +1,316 @@
+import csv
+import time
+from datetime import date
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from batch_data_pipeline.generators.pools import FakerPools
+from batch_data_pipeline.generators.uuids import format_packed, format_uuids, uuid4_bytes
+
+SECONDS_PER_YEAR = 365.24 * 24 * 3600
+
+
+class ColumnBatch:
+    """
+    A table held as NumPy columns plus sparse per-row overrides.
+
+    Bad-data injection produces mixed-type values (None, -10, "FREE") that
+    don't fit a typed column, so they're kept in `overrides` and only merged
+    in when the batch is turned into CSV rows.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+        self.overrides: Dict[str, Dict[int, Any]] = {name: {} for name in columns}
+
+    def __len__(self) -> int:
+        first = next(iter(self.columns.values()), None)
+        return 0 if first is None else len(first)
+
+    @property
+    def fieldnames(self) -> List[str]:
+        return list(self.columns)
+
+    def override(self, column: str, idx: np.ndarray, values: Sequence[Any]) -> None:
+        self.overrides[column].update(zip(idx.tolist(), values))
+
+    def to_lists(self) -> Dict[str, List[Any]]:
+        """Materialize every column as a Python list with overrides applied."""
+        out = {}
+        for name, arr in self.columns.items():
+            values = arr.tolist()
+            for i, v in self.overrides[name].items():
+                values[i] = v
+            out[name] = values
+        return out
+
+    def iter_rows(self) -> Iterator[Tuple[Any, ...]]:
+        return zip(*self.to_lists().values())
+
+
+def write_column_batch(path: str, batch: ColumnBatch) -> None:
+    write_column_batches(path, batch, ())
+
+
+def write_column_batches(path: str, first: ColumnBatch, rest: Iterable[ColumnBatch]) -> int:
+    """Write batches sharing one header; only one batch is materialized at a time."""
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(first.fieldnames)
+        for batch in chain([first], rest):
+            writer.writerows(batch.iter_rows())
+            written += len(batch)
+    return written
+
+
+class ColumnarEngine:
+    """
+    Vectorized counterpart of the per-row generate_* methods on EcommerceDataGenerator.
+
+    Every column is drawn in one call on a NumPy Generator. Column layout,
+    value ranges and bad-data injection rates match the row-based engine.
+    Names, countries and product names come from pre-sampled FakerPools.
+    IDs come from os.urandom unless reproducible_ids, so two runs with the
+    same seed don't mint the same primary keys.
+    """
+
+    ORDER_STATUSES = ["new", "processing", "shipped", "cancelled", "returned"]
+    PAYMENT_METHODS = ["card", "paypal", "bank", "apple_pay"]
+
+    def __init__(
+        self,
+        seed: int,
+        countries: Sequence[str],
+        campaigns: Sequence[str],
+        categories: Sequence[str] = (),
+        pools: Optional[FakerPools] = None,
+        now: Optional[float] = None,
+        reproducible_ids: bool = False,
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.reproducible_ids = reproducible_ids
+        self.countries = np.array(countries, dtype=object)
+        self.campaigns = np.array(campaigns, dtype=object)
+        self.categories = np.array(categories, dtype=object)
+        self.pools = pools
+        self.now = time.time() if now is None else now
+        self.email_serial = 0
+
+    def reseed(self, seed, email_serial: Optional[int] = None) -> None:
+        """Fresh rng stream on the same pools (one per backfill day)."""
+        self.rng = np.random.default_rng(seed)
+        if email_serial is not None:
+            self.email_serial = email_serial
+
+    # -----------------------------
+    # Tables
+    # -----------------------------
+
+    def customers(self, n: int) -> ColumnBatch:
+        pools = self._require_pools()
+        first_idx = self.rng.integers(0, len(pools["first_name"]), n)
+        last_idx = self.rng.integers(0, len(pools["last_name"]), n)
+
+        batch = ColumnBatch({
+            "customer_id": self.uuids(n),
+            "first_name": np.array(pools["first_name"], dtype=object)[first_idx],
+            "last_name": np.array(pools["last_name"], dtype=object)[last_idx],
+            "email": self.emails(first_idx, last_idx),
+            "country": self.choice(pools["country"], n),
+            "signup_date": self.dates(n, days_back=730),
+        })
+
+        idx, issue = self.inject(n, 0.005, 2)
+        batch.override("email", idx[issue == 0], [None] * int((issue == 0).sum()))
+        self.corrupt(batch, "country", idx[issue == 1], ["", "UNKNOWN", None])
+        return batch
+
+    def products(self, n: int) -> ColumnBatch:
+        pools = self._require_pools()
+        batch = ColumnBatch({
+            "product_id": self.uuids(n),
+            "name": self.choice(pools["product_name"], n),
+            "category": self.rng.choice(self.categories, n),
+            "price": self.amounts(n, 5, 500),
+            "stock_count": self.rng.integers(0, 1001, n),
+            "created_at": self.timestamps(n, years_back=1),
+            "is_active": self.rng.random(n) < 0.5,
+        })
+
+        idx, issue = self.inject(n, 0.05, 2)
+        self.corrupt(batch, "price", idx[issue == 0], [None, -10, 0, "FREE"])
+        self.corrupt(batch, "stock_count", idx[issue == 1], [None, -5, "??"])
+        return batch
+
+    def orders(self, n: int, customer_ids: Sequence[str]) -> ColumnBatch:
+        batch = ColumnBatch({
+            "order_id": self.uuids(n),
+            "customer_id": self.pick_ids(n, customer_ids),
+            "order_date": self.timestamps(n, years_back=2),
+            "status": self.choice(self.ORDER_STATUSES, n),
+            "total_amount": self.amounts(n, 20, 800),
+            "shipping_cost": self.amounts(n, 0, 30),
+            "shipping_country": self.rng.choice(self.countries, n),
+            "campaign": self.rng.choice(self.campaigns, n),
+        })
+
+        idx, issue = self.inject(n, 0.05, 3)
+        # issue 1 (bad_currency) has no column to corrupt, same as the row engine
+        self.corrupt(batch, "total_amount", idx[issue == 0], [None, -10, 0, -50])
+        self.corrupt(batch, "shipping_country", idx[issue == 2], [None, "unknown", "null"])
+        return batch
+
+    def order_items(
+        self,
+        n: int,
+        order_ids: Sequence[str],
+        product_ids: Sequence[str],
+        product_price_map: Dict[str, Any],
+        prices: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> ColumnBatch:
+        """`prices` is product_prices(product_ids, product_price_map), if already built for this pool."""
+        raw_prices, safe_prices = prices if prices is not None else self.product_prices(product_ids, product_price_map)
+        product_idx = self.pick_index(n, len(product_ids))
+        picked = product_idx >= 0
+
+        product_col = np.empty(n, dtype=object)
+        product_col[picked] = _take(product_ids, product_idx[picked])
+        product_col[~picked] = self.uuids(int((~picked).sum()))
+
+        unit_price = self.amounts(n, 5, 200).astype(object)
+        unit_price[picked] = raw_prices[product_idx[picked]]
+
+        quantity = self.rng.integers(1, 6, n)
+        price = np.full(n, np.nan)
+        price[picked] = safe_prices[product_idx[picked]]
+        priced = ~np.isnan(price)
+        line_total = np.where(priced, np.round(price * quantity, 2), 0.0)
+
+        batch = ColumnBatch({
+            "order_item_id": self.uuids(n),
+            "order_id": self.pick_ids(n, order_ids),
+            "product_id": product_col,
+            "quantity": quantity,
+            "unit_price": unit_price,
+            "line_total": line_total,
+        })
+        unpriced = np.flatnonzero(~priced)
+        self.corrupt(batch, "line_total", unpriced, [None, -1, 0])
+
+        idx, issue = self.inject(n, 0.10, 3)
+        self.corrupt(batch, "quantity", idx[issue == 0], [0, -3, None, "ten"])
+        self.corrupt(batch, "line_total", idx[issue == 1], [None, -50, 0, 9999, "NaN"])
+        bad_fk = idx[issue == 2]
+        batch.override("product_id", bad_fk, self.uuids(len(bad_fk)).tolist())
+        return batch
+
+    @staticmethod
+    def product_prices(product_ids: Sequence[str], product_price_map: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Prices aligned with `product_ids`: the raw price as stored on the
+        product (may itself be a bad value), and the usable float64 price,
+        NaN when missing or non-positive. One pass over the pool, so build
+        it once per table rather than per chunk.
+        """
+        raw_prices = np.array([product_price_map.get(p) for p in product_ids], dtype=object)
+        safe_prices = np.array([_safe_price(p) for p in raw_prices], dtype=np.float64)
+        return raw_prices, safe_prices
+
+    def payments(self, n: int, order_ids: Sequence[str]) -> ColumnBatch:
+        batch = ColumnBatch({
+            "payment_id": self.uuids(n),
+            "order_id": self.pick_ids(n, order_ids),
+            "amount": self.amounts(n, 20, 800),
+            "payment_method": self.choice(self.PAYMENT_METHODS, n),
+            "paid_at": self.timestamps(n, years_back=2),
+        })
+
+        idx, issue = self.inject(n, 0.10, 3)
+        self.corrupt(batch, "amount", idx[issue == 0], [None, -20, "free", 0])
+        self.corrupt(batch, "payment_method", idx[issue == 1], ["crypto", None, "???"])
+        return batch
+
+    # -----------------------------
+    # Column primitives
+    # -----------------------------
+
+    def uuids(self, n: int) -> np.ndarray:
+        """UUID4 strings; from the engine's RNG only with reproducible_ids, else os.urandom."""
+        return format_uuids(uuid4_bytes(n, self.rng.bytes if self.reproducible_ids else None))
+
+    def amounts(self, n: int, low: float, high: float) -> np.ndarray:
+        return np.round(self.rng.uniform(low, high, n), 2)
+
+    def choice(self, values: Sequence[str], n: int) -> np.ndarray:
+        return np.array(values, dtype=object)[self.rng.integers(0, len(values), n)]
+
+    def emails(self, first_idx: np.ndarray, last_idx: np.ndarray) -> np.ndarray:
+        """first.last<serial>@domain built from pooled parts; the serial keeps every address unique."""
+        pools = self._require_pools()
+        first = np.array(pools.email_parts("first_name"), dtype=object)[first_idx]
+        last = np.array(pools.email_parts("last_name"), dtype=object)[last_idx]
+        domains = self.choice(pools["email_domain"], len(first_idx))
+        start = self.email_serial
+        self.email_serial += len(first_idx)
+        return np.array(
+            [f"{f}.{la}{start + i}@{d}" for i, (f, la, d) in enumerate(zip(first, last, domains))],
+            dtype=object,
+        )
+
+    def dates(self, n: int, days_back: int) -> np.ndarray:
+        """ISO dates within the past N days, like EcommerceDataGenerator._random_date."""
+        offsets = self.rng.integers(0, days_back + 1, n)
+        days = np.datetime64(date.today().isoformat(), "D") - offsets
+        return np.datetime_as_string(days, unit="D").astype(object)
+
+    def timestamps(self, n: int, years_back: int) -> np.ndarray:
+        """ISO timestamps drawn uniformly from the last N years, as epoch microseconds."""
+        end = int(self.now * 1_000_000)
+        start = end - int(years_back * SECONDS_PER_YEAR * 1_000_000)
+        epochs = self.rng.integers(start, end, n, dtype=np.int64)
+        return np.datetime_as_string(epochs.astype("datetime64[us]"), unit="us").astype(object)
+
+    def pick_index(self, n: int, pool_size: int, broken_rate: float = 0.05) -> np.ndarray:
+        """Index into an FK pool per row; -1 marks a deliberately broken FK."""
+        if pool_size == 0:
+            return np.full(n, -1, dtype=np.int64)
+        idx = self.rng.integers(0, pool_size, n)
+        idx[self.rng.random(n) < broken_rate] = -1
+        return idx
+
+    def pick_ids(self, n: int, ids: Sequence[str]) -> np.ndarray:
+        """5% broken FK (fresh UUID), 95% a real ID from the pool."""
+        idx = self.pick_index(n, len(ids))
+        picked = idx >= 0
+        out = np.empty(n, dtype=object)
+        out[picked] = _take(ids, idx[picked])
+        out[~picked] = self.uuids(int((~picked).sum()))
+        return out
+
+    def inject(self, n: int, rate: float, n_issues: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows selected for bad data and which issue each one gets."""
+        idx = np.flatnonzero(self.rng.random(n) < rate)
+        return idx, self.rng.integers(0, n_issues, len(idx))
+
+    def corrupt(self, batch: ColumnBatch, column: str, idx: np.ndarray, bad_values: List[Any]) -> None:
+        picks = self.rng.integers(0, len(bad_values), len(idx))
+        batch.override(column, idx, [bad_values[i] for i in picks])
+
+    def _require_pools(self) -> FakerPools:
+        if self.pools is None:
+            raise RuntimeError("customers/products need FakerPools; pass pools= to ColumnarEngine")
+        return self.pools
+
+
+def _take(ids: Sequence[str], idx: np.ndarray) -> np.ndarray:
+    """ids[idx] for plain lists and for packed pools (CompactIds, registry views)."""
+    if isinstance(ids, (list, tuple, np.ndarray)):
+        return np.asarray(ids, dtype=object)[idx]
+    return format_packed(ids.packed(idx.tolist()))
+
+
+def _safe_price(price: Any) -> float:
+    return float(price) if isinstance(price, (int, float)) and price > 0 else np.nan
@@ -4,11 +4,19 @@ import os
 import random
 import uuid
 from datetime import date, datetime, timedelta
-from typing import Dict, List
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
 
 from faker import Faker
 from faker_commerce import Provider
 
+from batch_data_pipeline.generators.id_registry import IdRegistry
+from batch_data_pipeline.generators.id_store import CompactIds, CompactPriceMap
+
+# without persistent_ids each day numbers its numpy-engine emails from
+# YYYYMMDD * DAY_EMAIL_SERIALS, so days never share an address
+DAY_EMAIL_SERIALS = 10_000_000
+
 
 class EcommerceDataGenerator:
     """
@@ -19,8 +27,29 @@ class EcommerceDataGenerator:
     - Daily incremental batches
     - Cached IDs for FK relationships
     - Local folder per day: YYYY-MM-DD/*.csv
+    - Two engines: "python" (row by row) and "numpy" (columnar, see columnar.py)
+    - Streaming mode: rows are written in chunks of `chunk_size` and only the
+      FK pools are kept, packed as 16-byte IDs (see id_store.py)
+    - Persistent IDs: every day's customer/product/order IDs go into a
+      memory-mapped registry so FKs are picked from the full history
+    - Output as CSV (default) or typed Parquet (output_format="parquet",
+      see ingestion/utils/parquet_io.py)
+    - IDs are random (os.urandom) even with a seed; reproducible_ids=True
+      draws them from the seeded streams too (tests, benchmarks)
     """
 
+    ENGINES = ("python", "numpy")
+    OUTPUT_FORMATS = ("csv", "parquet")
+
+    # dependency order: every table picks FKs from the pools filled before it
+    TABLES = ("customers", "products", "orders", "order_items", "payments")
+    # table → (id column, FK pool attribute)
+    ID_POOLS = {
+        "customers": ("customer_id", "customer_ids"),
+        "products": ("product_id", "product_ids"),
+        "orders": ("order_id", "order_ids"),
+    }
+
     CATEGORIES = [
         "Electronics",
         "Clothing",
@@ -50,17 +79,53 @@ class EcommerceDataGenerator:
         "Q1 2024 Growth",
     ]
 
-    def __init__(self, output_path: str, initial_rows: Dict[str, int], daily_rows: Dict[str, int]):
+    def __init__(
+        self,
+        output_path: str,
+        initial_rows: Dict[str, int],
+        daily_rows: Dict[str, int],
+        engine: str = "python",
+        seed: Optional[int] = None,
+        pool_size: int = 5000,
+        pool_seed: int = 0,
+        pool_cache_dir: Optional[str] = None,
+        streaming: bool = False,
+        chunk_size: int = 10_000,
+        persistent_ids: bool = False,
+        registry_dir: Optional[str] = None,
+        output_format: str = "csv",
+        row_group_size: int = 100_000,
+        reproducible_ids: bool = False,
+    ):
         self.output_path = output_path
         self.initial_rows = initial_rows
         self.daily_rows = daily_rows
+        self.engine = self._check_engine(engine)
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        self.output_format = self._check_output_format(output_format)
+        self.row_group_size = row_group_size
 
         # faker & randomness
         self.fake = Faker()
         self.fake.add_provider(Provider)
-        seed = int(datetime.utcnow().timestamp())
-        Faker.seed(seed)
-        random.seed(seed)
+        self.seed = int(datetime.utcnow().timestamp()) if seed is None else seed
+        self.reproducible_ids = reproducible_ids
+        Faker.seed(self.seed)
+        random.seed(self.seed)
+        self._columnar = None
+        self._uuid_buffer = None
+
+        # Faker vocabulary pools used by the numpy engine, cached next to the output by default
+        self.pool_size = pool_size
+        # fixed by default so the cache is shared across runs with different row seeds
+        self.pool_seed = pool_seed
+        self.pool_cache_dir = pool_cache_dir or os.path.join(output_path, ".faker_pools")
+
+        # cross-day FK pools, kept under the output dir (ECOMMERCE_DATA_DIR) by default
+        self.registry: Optional[IdRegistry] = None
+        if persistent_ids:
+            self.registry = IdRegistry(registry_dir or os.path.join(output_path, "_id_registry"))
 
         # cached IDs (filled after generation)
         self.customers_ids: List[str] = []
@@ -76,62 +141,228 @@ class EcommerceDataGenerator:
         self.logger = logging.getLogger(__name__)
 
     # Public methods
-    def run_initial_load(self, day: datetime):
+    def run_initial_load(self, day: datetime, engine: Optional[str] = None):
         self.logger.info(f"This is the initial load {day}")
-        self._run_batch(day, initial=True)
+        self._continue_email_serial(day, engine)
+        self._run_batch(day, initial=True, engine=engine)
 
-    def run_incremental_batch(self, day: datetime):
+    def run_incremental_batch(self, day: datetime, engine: Optional[str] = None):
         self.logger.info(f"This is an incremental load {day}")
-        self._run_batch(day, initial=False)
+        self._continue_email_serial(day, engine)
+        self._run_batch(day, initial=False, engine=engine)
+
+    def run_sharded_load(self, day, initial: bool = True, shards: Optional[int] = None, merge: bool = True):
+        """
+        Generate one day with the numpy engine split across worker processes.
+
+        Each (table, shard) gets its own seed derived from self.seed, so a run is
+        reproducible for a given seed and shard count (its IDs only with
+        reproducible_ids). With persistent_ids the day's IDs are registered and
+        FKs are picked from the full history. With merge=False the
+        part files (orders_<day>_part-0003.csv) are left in the day folder.
+        """
+        from batch_data_pipeline.generators.sharded import ShardedRun
+
+        if self.output_format != "csv":
+            raise ValueError("run_sharded_load writes CSV part files; use output_format='csv'")
+        row_counts = self._row_counts(initial)
+        self.logger.info(f"Running sharded {'initial' if initial else 'incremental'} load for {day}")
+
+        run = ShardedRun(
+            output_path=self.output_path,
+            day=day,
+            row_counts=row_counts,
+            master_seed=self.seed,
+            shards=shards or os.cpu_count() or 1,
+            constants={"countries": self.COUNTRY, "campaigns": self.CAMPAIGN, "categories": self.CATEGORIES},
+            pool_seed=self.pool_seed,
+            pool_size=self.pool_size,
+            pool_cache_dir=self.pool_cache_dir,
+            now=datetime.utcnow().timestamp(),
+            reproducible_ids=self.reproducible_ids,
+            registry_dir=self.registry.root if self.registry is not None else None,
+            email_serial=self._email_serial_start(day),
+        )
+        outputs = run.run(merge=merge)
+        if self.registry is not None:
+            self.load_pools(day, list(self.ID_POOLS))
+        return outputs
+
+    def run_backfill(self, start: date, end: date, workers: int = 1, initial_first: bool = False) -> List[str]:
+        """
+        Generate every day from start to end (inclusive) in one call.
+
+        Needs persistent_ids. Each worker process keeps one warm generator for
+        all the days it runs; days are reseeded from self.seed so the output
+        (and, with reproducible_ids, the IDs) does not depend on the number of
+        workers. With initial_first the first
+        day uses the initial-load row counts. Returns the day folders.
+        """
+        from batch_data_pipeline.generators.backfill import Backfill
+
+        return Backfill(self, start, end, initial_first=initial_first).run(workers)
+
+    def run_day_tables(self, day, tables: Sequence[str], initial: bool = False, engine: Optional[str] = None) -> None:
+        """
+        Generate only `tables` for a day, picking FKs for the others from the registry.
+
+        Used by the backfill to run one wave of tables over many days.
+        """
+        if self.registry is None:
+            raise ValueError("run_day_tables needs persistent_ids=True to read FK pools from the registry")
+        self.load_pools(day, [t for t in self.ID_POOLS if t not in tables])
+        self._run_batch(day, initial, engine=engine, tables=[t for t in self.TABLES if t in tables])
+
+    def load_pools(self, day, tables: Sequence[str]) -> None:
+        """Point the FK pools of `tables` at every ID registered up to `day`."""
+        for table in tables:
+            if table == "products":
+                self.product_ids = self.registry.view("products", upto_day=day)
+                self.product_price_map = self.registry.price_map("products", upto_day=day)
+                # as after a daily run: the day's own products keep their raw (possibly bad) price
+                for pid, price in self.registry.raw_values("products", day).items():
+                    self.product_price_map.set(pid, price)
+            elif table in self.ID_POOLS:
+                _, attr = self.ID_POOLS[table]
+                setattr(self, attr, self.registry.view(table, upto_day=day))
+
+    def reseed(self, seed: int, email_serial: Optional[int] = None) -> None:
+        """Restart the random streams from `seed` while keeping Faker, the pools and the registry warm."""
+        self.seed = seed
+        Faker.seed(seed)
+        random.seed(seed)
+        self._uuid_buffer = None
+        if self.reproducible_ids:
+            try:
+                from batch_data_pipeline.generators.uuids import UuidBuffer
+            except ImportError:
+                pass
+            else:
+                # small blocks since a backfill reseeds for every (day, wave)
+                self._uuid_buffer = UuidBuffer(block_size=4_096, random_bytes=random.Random(seed).randbytes)
+        if self._columnar is not None:
+            self._columnar.reseed(seed, email_serial)
 
     """
         Core engine of the whole class. Every data generation run, initial or Incremental comes through here
     """
 
-    def _run_batch(self, day, initial: bool) -> None:
-        """Generate and write all tables for a given batch day."""
-        self.logger.info(f"Running {'initial' if initial else 'incremental'} load for {day}")
+    def _run_batch(self, day, initial: bool, engine: Optional[str] = None, tables: Optional[Sequence[str]] = None) -> None:
+        """Generate and write all tables (or the given subset, in dependency order) for a batch day."""
+        engine = self._check_engine(engine or self.engine)
+        self.logger.info(f"Running {'initial' if initial else 'incremental'} load for {day} ({engine} engine)")
 
         # Ensure folder exists for this batch day
         self._ensure_day_folder(day)
 
-        # --- Row counts ---
-        num_customers = self._rows("customers", initial)
-        num_products = self._rows("products", initial)
-        num_orders = self._rows("orders", initial)
-        num_order_items = num_orders * 3  # ~3 items per order
-        num_payments = num_orders  # 1 payment per order
-
-        # --- Customers ---
-        customers = self.generate_customers(num_customers)
-        self.customer_ids = [c["customer_id"] for c in customers]
-        self._write_csv("customers", day, customers)
-
-        # --- Products ---
-        products = self.generate_products(num_products)
-        self.product_ids = [p["product_id"] for p in products]
-        self.product_price_map = {p["product_id"]: p.get("price") for p in products}
-        self._write_csv("products", day, products)
-
-        # --- Orders ---
-        orders = self.generate_orders(num_orders)
-        self.order_ids = [o["order_id"] for o in orders]
-        self._write_csv("orders", day, orders)
-
-        # --- Order Items ---
-        order_items = self.generate_order_items(num_order_items)
-        self._write_csv("order_items", day, order_items)
-
-        # --- Payments ---
-        payments = self.generate_payments(num_payments)
-        self._write_csv("payments", day, payments)
+        row_counts = self._row_counts(initial)
+        for table in tables or self.TABLES:
+            self._run_table(table, day, row_counts[table], engine)
+
+    def _run_table(self, table: str, day, n: int, engine: str) -> None:
+        """
+        Generate, write and register one table.
+
+        Rows (or column batches) are written as they are produced; the FK pool
+        of the table (customer_ids, product_ids + prices, order_ids) is filled
+        on the way through and then swapped for the registry view.
+        """
+        if table in self.ID_POOLS:
+            self._reset_pool(table)
+
+        if engine == "numpy":
+            make_batch = self._batch_maker(table)
+            batches = self._column_chunks(n, make_batch) if self.streaming else iter([make_batch(n)])
+            if table in self.ID_POOLS:
+                batches = self._keep_batches(table, batches)
+            self._write_columns(table, day, batches)
+        else:
+            rows = getattr(self, f"iter_{table}")(n)
+            if table in self.ID_POOLS:
+                rows = self._keep_rows(table, rows)
+            self._write_csv(table, day, rows)
+
+        if table == "products":
+            self._register_products(day)
+        elif table in self.ID_POOLS:
+            _, attr = self.ID_POOLS[table]
+            setattr(self, attr, self._register(table, day, getattr(self, attr)))
+
+    def _reset_pool(self, table: str) -> None:
+        """Start an empty FK pool; packed 16-byte IDs in streaming mode, plain lists otherwise."""
+        _, attr = self.ID_POOLS[table]
+        setattr(self, attr, CompactIds() if self.streaming else [])
+        if table == "products":
+            self.product_price_map = CompactPriceMap() if self.streaming else {}
+
+    def _batch_maker(self, table: str):
+        """n → ColumnBatch for `table`, reading the current FK pools at call time."""
+        engine = self._columnar_engine()
+        if table == "orders":
+            return lambda n: engine.orders(n, self.customer_ids)
+        if table == "order_items":
+            # the product pool is final by now: look its prices up once, not per chunk
+            prices = engine.product_prices(self.product_ids, self.product_price_map)
+            return lambda n: engine.order_items(n, self.order_ids, self.product_ids, self.product_price_map, prices)
+        if table == "payments":
+            return lambda n: engine.payments(n, self.order_ids)
+        return getattr(engine, table)
+
+    def _column_chunks(self, n: int, make_batch) -> Iterator:
+        for start in range(0, n, self.chunk_size):
+            yield make_batch(min(self.chunk_size, n - start))
+
+    def _keep_rows(self, table: str, rows: Iterable[Dict]) -> Iterator[Dict]:
+        key, attr = self.ID_POOLS[table]
+        ids = getattr(self, attr)
+        for row in rows:
+            ids.append(row[key])
+            if table == "products":
+                self.product_price_map[row[key]] = row.get("price")
+            yield row
+
+    def _keep_batches(self, table: str, batches: Iterable) -> Iterator:
+        key, attr = self.ID_POOLS[table]
+        ids = getattr(self, attr)
+        for batch in batches:
+            if table == "products":
+                cols = batch.to_lists()
+                ids.extend(cols[key])
+                for product_id, price in zip(cols[key], cols["price"]):
+                    self.product_price_map[product_id] = price
+            else:
+                ids.extend(batch.columns[key].tolist())
+            yield batch
+
+    def _register(self, entity: str, day, ids: Sequence[str]) -> Sequence[str]:
+        """
+        With persistent IDs, record today's IDs in the registry and return every
+        ID registered up to this day as the FK pool; otherwise keep today's IDs.
+        """
+        if self.registry is None:
+            return ids
+        self.registry.append_day(entity, day, ids)
+        return self.registry.view(entity, upto_day=day)
+
+    def _register_products(self, day) -> None:
+        if self.registry is None:
+            return
+        today = [(pid, self.product_price_map.get(pid)) for pid in self.product_ids]
+        self.registry.append_day("products", day, [pid for pid, _ in today], values=[price for _, price in today])
+        self.product_ids = self.registry.view("products", upto_day=day)
+        # history comes back as floats; today's products keep their raw (possibly bad) price
+        self.product_price_map = self.registry.price_map("products", upto_day=day)
+        for pid, price in today:
+            self.product_price_map.set(pid, price)
 
     """
     Table Generators
     """
 
     def generate_customers(self, n: int) -> List[Dict]:
-        rows = []
+        return list(self.iter_customers(n))
+
+    def iter_customers(self, n: int) -> Iterator[Dict]:
 
         for _ in range(n):
             row = {
@@ -142,9 +373,7 @@ class EcommerceDataGenerator:
                 "country": self.fake.country(),
                 "signup_date": self._random_date(),
             }
-            row = self._maybe_inject_bad_customer_data(row)
-            rows.append(row)
-        return rows
+            yield self._maybe_inject_bad_customer_data(row)
 
     def _maybe_inject_bad_customer_data(self, row: Dict) -> Dict:
         if random.random() < 0.005:
@@ -158,7 +387,9 @@ class EcommerceDataGenerator:
         return row
 
     def generate_products(self, n: int) -> List[Dict]:
-        rows = []
+        return list(self.iter_products(n))
+
+    def iter_products(self, n: int) -> Iterator[Dict]:
 
         for _ in range(n):
             row = {
@@ -170,9 +401,7 @@ class EcommerceDataGenerator:
                 "created_at": self.fake.date_time_between(start_date="-1y", end_date="now").isoformat(),
                 "is_active": random.choice([True, False]),
             }
-            row = self._maybe_inject_bad_product_data(row)
-            rows.append(row)
-        return rows
+            yield self._maybe_inject_bad_product_data(row)
 
     def _maybe_inject_bad_product_data(self, row: Dict) -> Dict:
         if random.random() < 0.05:
@@ -186,7 +415,9 @@ class EcommerceDataGenerator:
         return row
 
     def generate_orders(self, n: int) -> List[Dict]:
-        rows = []
+        return list(self.iter_orders(n))
+
+    def iter_orders(self, n: int) -> Iterator[Dict]:
 
         for _ in range(n):
             row = {
@@ -200,9 +431,7 @@ class EcommerceDataGenerator:
                 "campaign": random.choice(self.CAMPAIGN),
             }
 
-            row = self._maybe_inject_bad_order_data(row)
-            rows.append(row)
-        return rows
+            yield self._maybe_inject_bad_order_data(row)
 
     def _maybe_pick_customer_id(self) -> str:
         """5% broken FK, 95% real customer"""
@@ -223,7 +452,9 @@ class EcommerceDataGenerator:
         return row
 
     def generate_order_items(self, n: int) -> List[Dict]:
-        rows = []
+        return list(self.iter_order_items(n))
+
+    def iter_order_items(self, n: int) -> Iterator[Dict]:
         for _ in range(n):
             order_id = self._maybe_pick_order_id()
             product_id = self._maybe_pick_product_id()
@@ -240,9 +471,7 @@ class EcommerceDataGenerator:
                 "unit_price": unit_price,
                 "line_total": line_total,
             }
-            row = self._maybe_inject_bad_order_item_data(row)
-            rows.append(row)
-        return rows
+            yield self._maybe_inject_bad_order_item_data(row)
 
     def _maybe_inject_bad_order_item_data(self, row: Dict) -> Dict:
         if random.random() < 0.10:
@@ -257,7 +486,9 @@ class EcommerceDataGenerator:
         return row
 
     def generate_payments(self, n: int) -> List[Dict]:
-        rows = []
+        return list(self.iter_payments(n))
+
+    def iter_payments(self, n: int) -> Iterator[Dict]:
         for _ in range(n):
             order_id = self._maybe_pick_payment_order_id()
             amount = round(random.uniform(20, 800), 2)
@@ -269,9 +500,7 @@ class EcommerceDataGenerator:
                 "payment_method": random.choice(["card", "paypal", "bank", "apple_pay"]),
                 "paid_at": self.fake.date_time_between(start_date="-2y", end_date="now").isoformat(),
             }
-            row = self._maybe_inject_bad_payment_data(row)
-            rows.append(row)
-        return rows
+            yield self._maybe_inject_bad_payment_data(row)
 
     def _maybe_pick_payment_order_id(self) -> str:
         if not self.order_ids or random.random() < 0.05:
@@ -298,28 +527,145 @@ class EcommerceDataGenerator:
         os.makedirs(folder, exist_ok=True)
         return folder
 
-    def _csv_path(self, table: str, day) -> str:
-        return os.path.join(self._day_folder(day), f"{table}_{day}.csv")
+    def _data_path(self, table: str, day) -> str:
+        return os.path.join(self._day_folder(day), f"{table}_{day}.{self.output_format}")
+
+    def _write_csv(self, table: str, day, rows: Iterable[Dict]) -> None:
+        """Write rows (a list or any iterator) `chunk_size` rows at a time."""
+        if self.output_format == "parquet":
+            from batch_data_pipeline.ingestion.utils.parquet_io import rows_to_columns
+
+            self._write_parquet(table, day, map(rows_to_columns, self._row_chunks(rows)))
+            return
 
-    def _write_csv(self, table: str, day, rows: List[Dict]) -> None:
-        if not rows:
+        chunks = self._row_chunks(rows)
+        chunk = next(chunks, None)
+        if not chunk:
             self.logger.warning(f"{table}: no rows generated, skipping write")
             return
         self._ensure_day_folder(day)
-        path = self._csv_path(table, day)
+        path = self._data_path(table, day)
+        written = 0
         with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+            writer = csv.DictWriter(f, fieldnames=chunk[0].keys())
             writer.writeheader()
-            writer.writerows(rows)
-        self.logger.info(f"Wrote {len(rows):,} {table} rows → {path}")
+            while chunk:
+                writer.writerows(chunk)
+                written += len(chunk)
+                chunk = next(chunks, None)
+        self.logger.info(f"Wrote {written:,} {table} rows → {path}")
+
+    def _row_chunks(self, rows: Iterable[Dict]) -> Iterator[List[Dict]]:
+        rows = iter(rows)
+        chunk = list(islice(rows, self.chunk_size))
+        while chunk:
+            yield chunk
+            chunk = list(islice(rows, self.chunk_size))
+
+    def _write_columns(self, table: str, day, batches) -> None:
+        """Write one ColumnBatch or an iterator of them (streaming mode)."""
+        from batch_data_pipeline.generators.columnar import ColumnBatch, write_column_batches
+
+        batches = iter([batches]) if isinstance(batches, ColumnBatch) else iter(batches)
+        if self.output_format == "parquet":
+            self._write_parquet(table, day, (batch.to_lists() for batch in batches))
+            return
+
+        first = next(batches, None)
+        if first is None or not len(first):
+            self.logger.warning(f"{table}: no rows generated, skipping write")
+            return
+        self._ensure_day_folder(day)
+        path = self._data_path(table, day)
+        written = write_column_batches(path, first, batches)
+        self.logger.info(f"Wrote {written:,} {table} rows → {path}")
+
+    def _write_parquet(self, table: str, day, chunks: Iterable[Dict[str, list]]) -> None:
+        """Write column chunks (name → values) as Parquet typed by raw_schema, `row_group_size` rows per row group."""
+        from batch_data_pipeline.ingestion.utils.parquet_io import ParquetTableWriter
+
+        chunks = iter(chunks)
+        first = next(chunks, None)
+        if not first or not len(next(iter(first.values()), ())):
+            self.logger.warning(f"{table}: no rows generated, skipping write")
+            return
+        self._ensure_day_folder(day)
+        path = self._data_path(table, day)
+        with ParquetTableWriter(path, table, self.row_group_size, raw=True) as writer:
+            writer.write_columns(first)
+            for columns in chunks:
+                writer.write_columns(columns)
+        self.logger.info(f"Wrote {writer.rows_written:,} {table} rows → {path}")
+
+    def _check_output_format(self, output_format: str) -> str:
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}', expected one of {self.OUTPUT_FORMATS}")
+        return output_format
+
+    def _check_engine(self, engine: str) -> str:
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {self.ENGINES}")
+        return engine
+
+    def _continue_email_serial(self, day, engine: Optional[str]) -> None:
+        """
+        Number the numpy engine's emails from _email_serial_start(day), so a
+        new process doesn't repeat earlier days' addresses. The backfill sets
+        the serial per day itself.
+        """
+        if self._check_engine(engine or self.engine) != "numpy":
+            return
+        self._columnar_engine().email_serial = self._email_serial_start(day)
+
+    def _email_serial_start(self, day) -> int:
+        """
+        The customers registered before `day` with persistent_ids; without
+        them, a block of DAY_EMAIL_SERIALS serials that only `day` uses.
+        """
+        if self.registry is None:
+            return int(day.strftime("%Y%m%d")) * DAY_EMAIL_SERIALS
+        return self.registry.count("customers", upto_day=day - timedelta(days=1))
+
+    def _columnar_engine(self):
+        """Build the NumPy engine on first use so numpy stays optional for the row engine."""
+        if self._columnar is None:
+            from batch_data_pipeline.generators.columnar import ColumnarEngine
+            from batch_data_pipeline.generators.pools import FakerPools
+
+            pools = FakerPools(seed=self.pool_seed, size=self.pool_size, cache_dir=self.pool_cache_dir)
+            self._columnar = ColumnarEngine(
+                self.seed,
+                self.COUNTRY,
+                self.CAMPAIGN,
+                categories=self.CATEGORIES,
+                pools=pools,
+                reproducible_ids=self.reproducible_ids,
+            )
+        return self._columnar
 
     def _rows(self, table: str, initial: bool) -> int:
         """Return number of rows to generate for a given table."""
         return self.initial_rows.get(table, 0) if initial else self.daily_rows.get(table, 0)
 
+    def _row_counts(self, initial: bool) -> Dict[str, int]:
+        num_orders = self._rows("orders", initial)
+        return {
+            "customers": self._rows("customers", initial),
+            "products": self._rows("products", initial),
+            "orders": num_orders,
+            "order_items": num_orders * 3,  # ~3 items per order
+            "payments": num_orders,  # 1 payment per order
+        }
+
     def _uuid(self) -> str:
-        """Return a UUID4 string."""
-        return str(uuid.uuid4())
+        """Return a UUID4 string, from a bulk-formatted buffer when numpy is available."""
+        if self._uuid_buffer is None:
+            try:
+                from batch_data_pipeline.generators.uuids import UuidBuffer
+            except ImportError:
+                return str(uuid.uuid4())
+            self._uuid_buffer = UuidBuffer()
+        return self._uuid_buffer.next()
 
     def _random_date(self, days_back: int = 730) -> str:
         """Return a random ISO date within the past N days (default 2 years)."""
@@ -0,0 +1,261 @@
+import bisect
+import fcntl
+import json
+import logging
+import math
+import mmap
+import os
+import threading
+import uuid
+from array import array
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from batch_data_pipeline.generators.id_store import UUID_BYTES, CompactPriceMap
+
+logger = logging.getLogger(__name__)
+
+
+class RegistryView(Sequence[str]):
+    """
+    Read-only, memory-mapped window over the IDs registered up to a given day.
+
+    The registry file is mapped once; ids[i] locates the day range holding i
+    (ranges are merged when contiguous, so there are usually only a few) and
+    decodes 16 bytes. Nothing is loaded into Python strings until it's picked.
+    """
+
+    def __init__(self, path: str, ranges: List[Tuple[int, int]]):
+        self._ranges = _merge_ranges(ranges)
+        self._starts: List[int] = []
+        total = 0
+        for _, count in self._ranges:
+            self._starts.append(total)
+            total += count
+        self._len = total
+        self._mm: Optional[mmap.mmap] = None
+        if total:
+            with open(path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("RegistryView index out of range")
+        offset = self.record(i) * UUID_BYTES
+        return str(uuid.UUID(bytes=self._mm[offset:offset + UUID_BYTES]))
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._len):
+            yield self[i]
+
+    def record(self, i: int) -> int:
+        """Position in the registry file of the i-th visible ID."""
+        r = bisect.bisect_right(self._starts, i) - 1
+        start, _ = self._ranges[r]
+        return start + (i - self._starts[r])
+
+    def take(self, indices: Iterable[int]) -> List[str]:
+        return [self[i] for i in indices]
+
+    def packed(self, indices: Iterable[int]) -> bytes:
+        """Raw 16-byte records for the given view positions, concatenated."""
+        mm = self._mm
+        return b"".join([mm[r * UUID_BYTES:(r + 1) * UUID_BYTES] for r in map(self.record, indices)])
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
+class IdRegistry:
+    """
+    Persistent record of every ID the generator has produced, per entity.
+
+    Layout under `root`:
+      <entity>.ids        packed 16-byte UUIDs, appended one day at a time
+      <entity>.values     optional float64 per ID (product prices), same order
+      <entity>.index.json day → [first record, count, write], "records", the
+                          logical length of the .ids file, and "raw": day →
+                          {position: value} for values a float can't hold as
+                          generated (ints, text such as "FREE")
+
+    Re-registering a day replaces its range: overwritten in place when it's
+    the last day in the file, otherwise appended again with the old range
+    dropped from the index. Files are never shrunk, since RegistryViews may
+    have them mapped; records past "records" are free space for the next day.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        # entity → (index entries the map was built from, map); see price_map
+        self._price_maps: Dict[str, Tuple[List[Tuple[str, Tuple[int, ...]]], CompactPriceMap]] = {}
+        self._price_lock = threading.Lock()
+
+    def _path(self, entity: str, suffix: str) -> str:
+        return os.path.join(self.root, f"{entity}.{suffix}")
+
+    def days(self, entity: str) -> Dict[str, List[int]]:
+        return self._read_index(entity)["days"]
+
+    def count(self, entity: str, upto_day: Optional[Any] = None) -> int:
+        return sum(entry[1] for day, entry in self.days(entity).items() if upto_day is None or day <= str(upto_day))
+
+    def append_day(self, entity: str, day, ids: Iterable[str], values: Optional[Sequence[Any]] = None) -> int:
+        """Register the IDs produced for `day`; returns how many were written."""
+        packed = bytearray()
+        for value in ids:
+            packed += uuid.UUID(value).bytes
+        count = len(packed) // UUID_BYTES
+
+        with self._locked(entity):
+            index = self._read_index(entity)
+            days = index["days"]
+            ids_path = self._path(entity, "ids")
+            records = index.get("records")
+            if records is None:
+                # index written before the logical length was kept
+                records = os.path.getsize(ids_path) // UUID_BYTES if os.path.exists(ids_path) else 0
+
+            start = records
+            previous = days.pop(str(day), None)
+            if previous and previous[0] + previous[1] == records:
+                # day is the tail of the file: overwrite it in place
+                start = previous[0]
+
+            self._write_at(ids_path, start * UUID_BYTES, bytes(packed))
+            raw = index.setdefault("raw", {})
+            raw.pop(str(day), None)
+            if values is not None:
+                floats = array("d", (_as_float(v) for v in values))
+                self._write_at(self._path(entity, "values"), start * floats.itemsize, floats.tobytes())
+                kept = {str(i): v for i, v in enumerate(values) if v is not None and not isinstance(v, float)}
+                if kept:
+                    raw[str(day)] = kept
+
+            # the write number tells price_map a re-registered day changed
+            index["writes"] = index.get("writes", 0) + 1
+            days[str(day)] = [start, count, index["writes"]]
+            index["records"] = start + count
+            self._write_index(entity, index)
+
+        logger.info(f"Registered {count:,} {entity} IDs for {day} → {ids_path}")
+        return count
+
+    def view(self, entity: str, upto_day: Optional[Any] = None) -> RegistryView:
+        """IDs of every registered day up to and including `upto_day` (all days if None)."""
+        ranges = [
+            (entry[0], entry[1])
+            for day, entry in sorted(self.days(entity).items())
+            if upto_day is None or day <= str(upto_day)
+        ]
+        return RegistryView(self._path(entity, "ids"), ranges)
+
+    def price_map(self, entity: str, upto_day: Optional[Any] = None) -> CompactPriceMap:
+        """
+        product_id → price for every registered product; unusable prices come back as None.
+
+        The last map built per entity is kept: asking for the same days again
+        only copies it, and a later day (daily runs and backfills walk days in
+        order) only reads the days added since. The caller owns the copy.
+        """
+        entries = [
+            (day, tuple(entry))
+            for day, entry in sorted(self.days(entity).items())
+            if upto_day is None or day <= str(upto_day)
+        ]
+        # the cached map is extended in place; threads sharing the registry take turns
+        with self._price_lock:
+            built, prices = self._price_maps.get(entity, ([], CompactPriceMap()))
+            if entries[:len(built)] != built:
+                built, prices = [], CompactPriceMap()
+            self._read_prices(entity, prices, [entry[:2] for _, entry in entries[len(built):]])
+            self._price_maps[entity] = (entries, prices)
+            return prices.copy()
+
+    def raw_values(self, entity: str, day) -> Dict[str, Any]:
+        """ID → value as generated, for the IDs of `day` whose value price_map returns as a float or None."""
+        index = self._read_index(entity)
+        kept = index.get("raw", {}).get(str(day))
+        if not kept:
+            return {}
+        start = index["days"][str(day)][0]
+        with open(self._path(entity, "ids"), "rb") as f:
+            out = {}
+            for i, value in kept.items():
+                f.seek((start + int(i)) * UUID_BYTES)
+                out[str(uuid.UUID(bytes=f.read(UUID_BYTES)))] = value
+        return out
+
+    def _read_prices(self, entity: str, prices: CompactPriceMap, ranges: List[Tuple[int, ...]]) -> None:
+        values_path = self._path(entity, "values")
+        if not ranges or not os.path.exists(values_path):
+            return
+        with open(self._path(entity, "ids"), "rb") as ids, open(values_path, "rb") as values:
+            for start, n in ranges:
+                ids.seek(start * UUID_BYTES)
+                packed = ids.read(n * UUID_BYTES)
+                stored = array("d")
+                values.seek(start * stored.itemsize)
+                stored.frombytes(values.read(n * stored.itemsize))
+                for i, price in enumerate(stored):
+                    prices.set_packed(packed[i * UUID_BYTES:(i + 1) * UUID_BYTES], None if math.isnan(price) else price)
+
+    @contextmanager
+    def _locked(self, entity: str):
+        """Serialize writers (e.g. parallel backfill workers) on one entity."""
+        with open(self._path(entity, "lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read_index(self, entity: str) -> Dict[str, Any]:
+        path = self._path(entity, "index.json")
+        if not os.path.exists(path):
+            return {"days": {}}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_index(self, entity: str, index: Dict[str, Any]) -> None:
+        path = self._path(entity, "index.json")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _write_at(path: str, offset: int, data: bytes) -> None:
+        # no truncate: a shorter file would fault readers that still map the old length
+        mode = "r+b" if os.path.exists(path) else "wb"
+        with open(path, mode) as f:
+            f.seek(offset)
+            f.write(data)
+
+
+def _merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Join contiguous ranges, keeping day order (not file order) so picks don't depend on write order."""
+    merged: List[Tuple[int, int]] = []
+    for start, count in ranges:
+        if not count:
+            continue
+        if merged and merged[-1][0] + merged[-1][1] == start:
+            merged[-1] = (merged[-1][0], merged[-1][1] + count)
+        else:
+            merged.append((start, count))
+    return merged
+
+
+def _as_float(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return math.nan
@@ -0,0 +1,119 @@
+import math
+import uuid
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+UUID_BYTES = 16
+
+
+class CompactIds(Sequence[str]):
+    """
+    UUID strings stored as packed 16-byte values in a single bytearray.
+
+    A Python str UUID costs ~85 bytes plus a list slot; this keeps the FK pools
+    (customer_ids, product_ids, order_ids) at 16 bytes per ID while still
+    behaving like a read-only list of strings for random.choice.
+    """
+
+    def __init__(self, ids: Iterable[str] = ()):
+        self._buf = bytearray()
+        self.extend(ids)
+
+    def __len__(self) -> int:
+        return len(self._buf) // UUID_BYTES
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("CompactIds index out of range")
+        start = i * UUID_BYTES
+        return str(uuid.UUID(bytes=bytes(self._buf[start:start + UUID_BYTES])))
+
+    def __iter__(self) -> Iterator[str]:
+        for start in range(0, len(self._buf), UUID_BYTES):
+            yield str(uuid.UUID(bytes=bytes(self._buf[start:start + UUID_BYTES])))
+
+    def append(self, value: str) -> None:
+        self._buf += uuid.UUID(value).bytes
+
+    def extend(self, values: Iterable[str]) -> None:
+        for value in values:
+            self.append(value)
+
+    def take(self, indices: Iterable[int]) -> List[str]:
+        """IDs at the given positions, for vectorized FK picks."""
+        buf = self._buf
+        return [str(uuid.UUID(bytes=bytes(buf[i * UUID_BYTES:(i + 1) * UUID_BYTES]))) for i in indices]
+
+    def packed(self, indices: Iterable[int]) -> bytes:
+        """Raw 16-byte records at the given positions, concatenated."""
+        view = memoryview(self._buf)
+        return b"".join([view[i * UUID_BYTES:(i + 1) * UUID_BYTES] for i in indices])
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buf)
+
+
+class CompactPriceMap:
+    """
+    product_id → raw price, the compact stand-in for product_price_map.
+
+    Prices live in an array('d'); the few injected non-numeric prices
+    (None, "FREE") are kept separately so lookups return exactly what was
+    written to products.csv.
+    """
+
+    def __init__(self):
+        self._index: Dict[int, int] = {}
+        self._prices = array("d")
+        self._raw: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def __contains__(self, product_id: object) -> bool:
+        return isinstance(product_id, str) and uuid.UUID(product_id).int in self._index
+
+    def set(self, product_id: str, price: Any) -> None:
+        self._set(uuid.UUID(product_id).int, price)
+
+    def set_packed(self, packed: bytes, price: Any) -> None:
+        """set() for a product ID given as its 16 raw bytes (registry records)."""
+        self._set(int.from_bytes(packed, "big"), price)
+
+    def copy(self) -> "CompactPriceMap":
+        other = CompactPriceMap()
+        other._index = dict(self._index)
+        other._prices = array("d", self._prices)
+        other._raw = dict(self._raw)
+        return other
+
+    def _set(self, key: int, price: Any) -> None:
+        pos = self._index.get(key)
+        if pos is None:
+            pos = self._index[key] = len(self._prices)
+            self._prices.append(math.nan)
+        self._raw.pop(pos, None)
+        if isinstance(price, float) or (isinstance(price, int) and not isinstance(price, bool)):
+            self._prices[pos] = float(price)
+            if isinstance(price, int):
+                self._raw[pos] = price
+        else:
+            self._raw[pos] = price
+
+    __setitem__ = set
+
+    def get(self, product_id: str, default: Optional[Any] = None) -> Any:
+        try:
+            pos = self._index.get(uuid.UUID(product_id).int)
+        except ValueError:
+            return default
+        if pos is None:
+            return default
+        if pos in self._raw:
+            return self._raw[pos]
+        return self._prices[pos]
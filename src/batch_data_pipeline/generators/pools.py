@@ -0,0 +1,95 @@
+import json
+import logging
+import os
+import random
+import re
+from typing import Callable, Dict, List, Optional
+
+from faker import Faker
+from faker_commerce import Provider
+
+logger = logging.getLogger(__name__)
+
+
+class FakerPools:
+    """
+    Pre-sampled vocabularies for the slow Faker providers.
+
+    Each provider is called until `size` distinct values are collected (or the
+    provider runs out of new values), once per (locale, seed, size). Results are
+    cached as JSON so later runs skip Faker entirely; rows are then built by
+    drawing indices into these lists.
+    """
+
+    PROVIDERS: Dict[str, Callable[[Faker], str]] = {
+        "first_name": lambda f: f.first_name(),
+        "last_name": lambda f: f.last_name(),
+        "country": lambda f: f.country(),
+        "product_name": lambda f: f.ecommerce_name(),
+        "email_domain": lambda f: f.free_email_domain(),
+    }
+
+    MAX_MISSES = 1000
+
+    def __init__(self, locale: str = "en_US", seed: int = 0, size: int = 5000, cache_dir: Optional[str] = None):
+        self.locale = locale
+        self.seed = seed
+        self.size = size
+        self.cache_dir = cache_dir
+        self.pools = self._load()
+
+    def __getitem__(self, provider: str) -> List[str]:
+        return self.pools[provider]
+
+    @property
+    def cache_path(self) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"faker_pools_{self.locale}_{self.seed}_{self.size}.json")
+
+    def email_parts(self, provider: str) -> List[str]:
+        """Pool values reduced to characters that are safe in an email local part."""
+        return [re.sub(r"[^a-z0-9]", "", v.lower()) or "user" for v in self.pools[provider]]
+
+    def _load(self) -> Dict[str, List[str]]:
+        path = self.cache_path
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                pools = json.load(f)
+            if set(pools) == set(self.PROVIDERS):
+                return pools
+            logger.warning(f"Ignoring stale Faker pool cache {path}")
+
+        pools = self._sample()
+        if path:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # per-process temp name: parallel workers may build the same cache at once
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(pools, f)
+            os.replace(tmp, path)
+            logger.info(f"Cached Faker pools → {path}")
+        return pools
+
+    def _sample(self) -> Dict[str, List[str]]:
+        fake = Faker(self.locale)
+        fake.add_provider(Provider)
+        fake.seed_instance(self.seed)
+        # faker_commerce's ecommerce_name draws from the module-level random; seed it
+        # for a reproducible pool and restore the caller's random state afterwards
+        saved_state = random.getstate()
+        random.seed(self.seed)
+
+        pools = {}
+        for name, provider in self.PROVIDERS.items():
+            values: Dict[str, None] = {}
+            misses = 0
+            # small vocabularies (countries, domains) stop once the provider stops producing new values
+            while len(values) < self.size and misses < self.MAX_MISSES:
+                value = provider(fake)
+                misses = misses + 1 if value in values else 0
+                values[value] = None
+            pools[name] = list(values)
+
+        random.setstate(saved_state)
+        return pools
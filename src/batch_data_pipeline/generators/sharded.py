@@ -0,0 +1,242 @@
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from batch_data_pipeline.generators.columnar import ColumnarEngine, write_column_batch
+from batch_data_pipeline.generators.id_registry import IdRegistry
+from batch_data_pipeline.generators.pools import FakerPools
+
+logger = logging.getLogger(__name__)
+
+# Stable position of each table in the seed tree; never reorder, it would change every shard's stream.
+TABLES = ["customers", "products", "orders", "order_items", "payments"]
+
+_worker_pools: Optional[FakerPools] = None
+# registry root → registry, one per worker process so price_map's cache carries across tasks
+_worker_registries: Dict[str, IdRegistry] = {}
+
+
+def shard_counts(n: int, shards: int) -> List[int]:
+    """Split n rows into `shards` near-equal parts (first parts get the remainder)."""
+    base, extra = divmod(n, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+
+def shard_seed(master_seed: int, table: str, shard: int) -> np.random.SeedSequence:
+    """Independent, reproducible stream per (table, shard) derived from one master seed."""
+    return np.random.SeedSequence(master_seed, spawn_key=(TABLES.index(table), shard))
+
+
+def part_path(day_folder: str, table: str, day, shard: int) -> str:
+    return os.path.join(day_folder, f"{table}_{day}_part-{shard:04d}.csv")
+
+
+def merge_parts(parts: Sequence[str], target: str) -> None:
+    """Concatenate part files into one CSV, keeping only the first header, then drop the parts."""
+    with open(target, "wb") as out:
+        for i, part in enumerate(parts):
+            with open(part, "rb") as f:
+                header = f.readline()
+                if i == 0:
+                    out.write(header)
+                shutil.copyfileobj(f, out, length=1 << 20)
+    for part in parts:
+        os.remove(part)
+
+
+def _init_worker(pool_seed: int, pool_size: int, pool_cache_dir: str) -> None:
+    """Load the Faker pools once per worker process (from the cache the parent warmed)."""
+    global _worker_pools
+    _worker_pools = FakerPools(seed=pool_seed, size=pool_size, cache_dir=pool_cache_dir)
+
+
+def _worker_registry(root: str) -> IdRegistry:
+    if root not in _worker_registries:
+        _worker_registries[root] = IdRegistry(root)
+    return _worker_registries[root]
+
+
+def _generate_shard(task: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+    """
+    Generate one (table, shard) part file.
+
+    Returns the IDs produced (and product prices) so later tables can pick FKs
+    from them.
+    """
+    engine = ColumnarEngine(
+        task["seed"],
+        task["countries"],
+        task["campaigns"],
+        categories=task["categories"],
+        pools=_worker_pools,
+        now=task["now"],
+        reproducible_ids=task["reproducible_ids"],
+    )
+    engine.email_serial = task["offset"]
+
+    # FK pools are read from the registry the parent filled, not shipped with the task
+    registry = _worker_registry(task["registry_dir"])
+    day = task["day"]
+    views = []
+
+    def pool(entity: str):
+        views.append(registry.view(entity, upto_day=day))
+        return views[-1]
+
+    table, n = task["table"], task["n"]
+    try:
+        if table == "customers":
+            batch = engine.customers(n)
+        elif table == "products":
+            batch = engine.products(n)
+        elif table == "orders":
+            batch = engine.orders(n, pool("customers"))
+        elif table == "order_items":
+            prices = registry.price_map("products", upto_day=day)
+            # the registry keeps floats; today's unusable prices go out as generated
+            for product_id, price in task["raw_prices"].items():
+                prices.set(product_id, price)
+            batch = engine.order_items(n, pool("orders"), pool("products"), prices)
+        else:
+            batch = engine.payments(n, pool("orders"))
+    finally:
+        for view in views:
+            view.close()
+
+    write_column_batch(task["path"], batch)
+
+    cols = batch.to_lists() if table == "products" else {}
+    id_col = batch.fieldnames[0]
+    ids = batch.columns[id_col].tolist() if table in ("customers", "products", "orders") else []
+    return ids, cols.get("price", [])
+
+
+class ShardedRun:
+    """
+    One day of data generated by `shards` workers per table.
+
+    Tables run in three dependency waves so FK picks only use IDs that
+    exist: (customers, products) → orders → (order_items, payments). Each
+    wave's IDs are registered in the IdRegistry at `registry_dir` before the
+    next starts, and workers read their FK pools from it by path; without a
+    registry_dir a scratch registry holds just this day's IDs.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        day,
+        row_counts: Dict[str, int],
+        master_seed: int,
+        shards: int,
+        constants: Dict[str, Sequence[str]],
+        pool_seed: int,
+        pool_size: int,
+        pool_cache_dir: str,
+        now: float,
+        reproducible_ids: bool = False,
+        registry_dir: Optional[str] = None,
+        email_serial: int = 0,
+    ):
+        self.day = day
+        self.day_folder = os.path.join(output_path, str(day))
+        self.row_counts = row_counts
+        self.master_seed = master_seed
+        self.shards = shards
+        self.constants = constants
+        self.pool_args = (pool_seed, pool_size, pool_cache_dir)
+        self.now = now
+        self.reproducible_ids = reproducible_ids
+        self.registry_dir = registry_dir
+        # first email serial of the day's customers (customers registered before it)
+        self.email_serial = email_serial
+
+    def run(self, merge: bool = True, max_workers: Optional[int] = None) -> Dict[str, List[str]]:
+        # warm the pool cache once in the parent so workers only read it
+        _init_worker(*self.pool_args)
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers or self.shards,
+            initializer=_init_worker,
+            initargs=self.pool_args,
+        ) as pool:
+            return self.run_with(pool, merge)
+
+    def run_with(self, pool: Executor, merge: bool) -> Dict[str, List[str]]:
+        if self.registry_dir is not None:
+            return self._run_waves(pool, merge, IdRegistry(self.registry_dir))
+        with tempfile.TemporaryDirectory(prefix="shard_ids_") as scratch:
+            return self._run_waves(pool, merge, IdRegistry(scratch))
+
+    def _run_waves(self, pool: Executor, merge: bool, registry: IdRegistry) -> Dict[str, List[str]]:
+        os.makedirs(self.day_folder, exist_ok=True)
+        outputs: Dict[str, List[str]] = {}
+        fk_inputs = {"registry_dir": registry.root}
+
+        wave = self._submit(pool, ["customers", "products"], fk_inputs)
+        registry.append_day("customers", self.day, self._collect(wave["customers"])[0])
+        product_ids, prices = self._collect(wave["products"])
+        registry.append_day("products", self.day, product_ids, values=prices)
+        outputs.update({t: self._paths(t) for t in wave})
+
+        wave = self._submit(pool, ["orders"], fk_inputs)
+        registry.append_day("orders", self.day, self._collect(wave["orders"])[0])
+        outputs["orders"] = self._paths("orders")
+
+        # only the few prices the registry can't hold as floats travel with the tasks
+        raw_prices = {pid: price for pid, price in zip(product_ids, prices) if not isinstance(price, float)}
+        wave = self._submit(pool, ["order_items", "payments"], {**fk_inputs, "raw_prices": raw_prices})
+        for table in wave:
+            self._collect(wave[table])
+            outputs[table] = self._paths(table)
+
+        if merge:
+            for table, parts in outputs.items():
+                target = os.path.join(self.day_folder, f"{table}_{self.day}.csv")
+                merge_parts(parts, target)
+                outputs[table] = [target]
+
+        for table, paths in outputs.items():
+            logger.info(f"Wrote {self.row_counts[table]:,} {table} rows → {len(paths)} file(s) in {self.day_folder}")
+        return outputs
+
+    def _paths(self, table: str) -> List[str]:
+        return [part_path(self.day_folder, table, self.day, i) for i in range(self.shards)]
+
+    def _submit(self, pool: Executor, tables: List[str], fk_inputs: Dict[str, Any]) -> Dict[str, list]:
+        futures = {}
+        for table in tables:
+            offset = self.email_serial if table == "customers" else 0
+            futures[table] = []
+            for shard, n in enumerate(shard_counts(self.row_counts[table], self.shards)):
+                task = {
+                    "table": table,
+                    "n": n,
+                    "offset": offset,
+                    "seed": shard_seed(self.master_seed, table, shard),
+                    "path": part_path(self.day_folder, table, self.day, shard),
+                    "day": self.day,
+                    "now": self.now,
+                    "reproducible_ids": self.reproducible_ids,
+                    **self.constants,
+                    **fk_inputs,
+                }
+                futures[table].append(pool.submit(_generate_shard, task))
+                offset += n
+        return futures
+
+    @staticmethod
+    def _collect(futures: list) -> Tuple[List[str], List[Any]]:
+        """Concatenate shard results in shard order."""
+        ids: List[str] = []
+        prices: List[Any] = []
+        for future in futures:
+            shard_ids, shard_prices = future.result()
+            ids.extend(shard_ids)
+            prices.extend(shard_prices)
+        return ids, prices
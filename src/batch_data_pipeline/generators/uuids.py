@@ -0,0 +1,84 @@
+import os
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from batch_data_pipeline.generators.id_store import UUID_BYTES
+
+# byte value → its two lowercase hex digits, packed so a uint16 lookup yields both chars
+_HEX_PAIRS = np.array([int.from_bytes(f"{i:02x}".encode(), "little") for i in range(256)], dtype="<u2")
+# (start, end) of each hex group in the 32-digit string and where it lands in the 36-char form
+_GROUPS = [((0, 8), 0), ((8, 12), 9), ((12, 16), 14), ((16, 20), 19), ((20, 32), 24)]
+
+
+def uuid4_bytes(n: int, random_bytes: Optional[Callable[[int], bytes]] = None) -> np.ndarray:
+    """
+    n random UUID4s as an (n, 16) uint8 array.
+
+    Bytes come from `random_bytes` (os.urandom by default, or a seeded
+    numpy Generator's .bytes) in one call; version and variant bits are then
+    set on the whole array at once.
+    """
+    raw = (random_bytes or os.urandom)(n * UUID_BYTES)
+    b = np.frombuffer(raw, dtype=np.uint8).reshape(n, UUID_BYTES).copy()
+    b[:, 6] = (b[:, 6] & 0x0F) | 0x40  # version 4
+    b[:, 8] = (b[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    return b
+
+
+def format_uuids(b: np.ndarray) -> np.ndarray:
+    """(n, 16) uint8 → n canonical 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx' strings (object array)."""
+    n = len(b)
+    if not n:
+        return np.empty(0, dtype=object)
+    digits = _HEX_PAIRS[b].view(np.uint8)  # (n, 32) ASCII hex digits
+
+    chars = np.empty((n, 36), dtype=np.uint8)
+    chars[:, [8, 13, 18, 23]] = ord("-")
+    for (start, end), dest in _GROUPS:
+        chars[:, dest:dest + end - start] = digits[:, start:end]
+
+    text = chars.tobytes().decode("ascii")
+    return np.array([text[i:i + 36] for i in range(0, 36 * n, 36)], dtype=object)
+
+
+def format_packed(packed: bytes) -> np.ndarray:
+    """Packed 16-byte UUIDs (CompactIds / registry records) → canonical strings."""
+    return format_uuids(np.frombuffer(packed, dtype=np.uint8).reshape(-1, UUID_BYTES))
+
+
+class UuidBuffer:
+    """
+    Pre-formatted UUID4 strings handed out one at a time.
+
+    Row producers call next() per ID; the buffer refills `block_size` UUIDs at
+    a time through uuid4_bytes/format_uuids, which is several times cheaper
+    than str(uuid.uuid4()) per call.
+    """
+
+    def __init__(self, block_size: int = 65_536, random_bytes: Optional[Callable[[int], bytes]] = None):
+        self.block_size = block_size
+        self.random_bytes = random_bytes
+        self._block: List[str] = []
+        self._pos = 0
+
+    def next(self) -> str:
+        if self._pos >= len(self._block):
+            self._refill()
+        value = self._block[self._pos]
+        self._pos += 1
+        return value
+
+    def take(self, n: int) -> List[str]:
+        out: List[str] = []
+        while len(out) < n:
+            if self._pos >= len(self._block):
+                self._refill()
+            end = min(len(self._block), self._pos + n - len(out))
+            out.extend(self._block[self._pos:end])
+            self._pos = end
+        return out
+
+    def _refill(self) -> None:
+        self._block = format_uuids(uuid4_bytes(self.block_size, self.random_bytes)).tolist()
+        self._pos = 0
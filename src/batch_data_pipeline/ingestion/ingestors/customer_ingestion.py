@@ -1,23 +1,41 @@
-import csv
+from concurrent.futures import Executor
 from pathlib import Path
 from datetime import date
-from typing import List, Dict, Any, Tuple, Type
+from typing import List, Dict, Any, Tuple, Type, Optional
 
 from batch_data_pipeline.validation.schema.customer import Customer
 from batch_data_pipeline.validation.helpers import validate_records
+from batch_data_pipeline.validation.columnar import validate_columnar
+from batch_data_pipeline.validation.schema.compiled import COMPILED_SCHEMAS
+from batch_data_pipeline.validation.referential import ReferenceIndex
+from batch_data_pipeline.validation.dedup import KeyIndex
+from batch_data_pipeline.validation.profiling import ValidatorProfile
+from batch_data_pipeline.validation.cache import ValidationCache
+from batch_data_pipeline.ingestion.loaders.blob_manifest import BlobManifest
 from batch_data_pipeline.ingestion.loaders.upload_quarantined_to_bucket import upload_quarantine_to_bucket
 from batch_data_pipeline.ingestion.loaders.upload_validated_to_bucket import upload_validated_to_bucket
+from batch_data_pipeline.ingestion.ingestors.streaming import ingest_streaming
+from batch_data_pipeline.ingestion.utils.file_finder import find_day_file
+from batch_data_pipeline.ingestion.utils.csv_io import read_csv
+from batch_data_pipeline.ingestion.utils.parquet_io import read_parquet_rows
 
 
 
-def read_csv(path: Path) -> List[Dict[str, Any]]:
-    with path.open("r", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
-
-def validate_customer_rows(rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-    valid_models, invalid_rows = validate_records(rows, Customer)
-    valid_dicts = [m.model_dump(mode="json") for m in valid_models]
-    return valid_dicts, invalid_rows
+def validate_customer_rows(
+    rows: List[Dict[str, Any]],
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+    engine: str = "pydantic",
+    profile: Optional[ValidatorProfile] = None,
+    pool: Optional[Executor] = None,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    if engine == "columnar":
+        return validate_columnar(rows, Customer, profile=profile, workers=workers, chunk_size=chunk_size)
+
+    schema = COMPILED_SCHEMAS[Customer] if engine == "compiled" else Customer
+    # dicts straight from pydantic-core, no model instance per row
+    return validate_records(rows, schema, chunk_size=chunk_size, workers=workers, output="json", profile=profile,
+                            pool=pool)
 
 def build_summary(
     entity: str,
@@ -39,18 +57,58 @@ def build_summary(
         "quarantine_path": quarantine_path,
     }
 
-def ingest_customers(day_folder: Path, run_dt: date, bucket: str) -> Dict[str, Any]:
+def ingest_customers(
+    day_folder: Path,
+    run_dt: date,
+    bucket: str,
+    output_format: str = "csv",
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+    engine: str = "pydantic",
+    streaming: bool = False,
+    fk_index: Optional[ReferenceIndex] = None,
+    key_index: Optional[KeyIndex] = None,
+    profile_validators: bool = False,
+    validation_cache: Optional[ValidationCache] = None,
+    blob_manifest: Optional[BlobManifest] = None,
+    validation_pool: Optional[Executor] = None,
+) -> Dict[str, Any]:
     entity = "customers"
-    file_path = day_folder / f"{entity}_{run_dt}.csv"
+    file_path = find_day_file(day_folder, entity, run_dt)
 
     if not file_path.exists():
         raise FileNotFoundError(f"Expected file not found: {file_path}")
 
+    if streaming:
+        # read, validate and write batch by batch instead of holding the whole file
+        return ingest_streaming(file_path, Customer, entity, run_dt, bucket, output_format, chunk_size, engine,
+                                fk_index=fk_index, key_index=key_index, profile_validators=profile_validators,
+                                blob_manifest=blob_manifest)
+
     # 1. Extract
-    rows = read_csv(file_path)
+    rows = read_parquet_rows(file_path) if file_path.suffix == ".parquet" else read_csv(file_path, workers=workers)
 
     # 2. Validate
-    cleaned, invalid = validate_customer_rows(rows)
+    profile = ValidatorProfile() if profile_validators else None
+
+    def validate():
+        return validate_customer_rows(rows, workers=workers, chunk_size=chunk_size, engine=engine, profile=profile,
+                                      pool=validation_pool)
+
+    if validation_cache is not None and profile is None:
+        # a retry of the same raw file reuses the earlier result
+        cleaned, invalid = validation_cache.get_or_validate(file_path, Customer, engine, validate)
+    else:
+        cleaned, invalid = validate()
+    if fk_index is not None:
+        # unknown parent keys → quarantine
+        cleaned, invalid = fk_index.split_orphans(entity, rows, cleaned, invalid)
+    if key_index is not None:
+        # keys loaded on an earlier day (or earlier in this file) → quarantine
+        cleaned, invalid = key_index.split_duplicates(entity, rows, cleaned, invalid, run_dt)
+    if fk_index is not None:
+        # this entity's keys become parents for the next
+        fk_index.register(entity, cleaned)
 
     # 3. Load validated rows
     validated_path = upload_validated_to_bucket(
@@ -58,6 +116,8 @@ def ingest_customers(day_folder: Path, run_dt: date, bucket: str) -> Dict[str, A
         entity=entity,
         run_date=run_dt.isoformat(),
         rows=cleaned,
+        output_format=output_format,
+        manifest=blob_manifest,
     )
 
     # 4. Load invalid rows
@@ -66,10 +126,11 @@ def ingest_customers(day_folder: Path, run_dt: date, bucket: str) -> Dict[str, A
         entity=entity,
         run_date=run_dt.isoformat(),
         rows=invalid,
+        manifest=blob_manifest,
     )
 
     # 5. Return summary
-    return build_summary(
+    summary = build_summary(
         entity=entity,
         run_date=run_dt,
         rows=rows,
@@ -78,5 +139,6 @@ def ingest_customers(day_folder: Path, run_dt: date, bucket: str) -> Dict[str, A
         validated_path=validated_path,
         quarantine_path=quarantine_path,
     )
-
-
+    if profile is not None:
+        summary["validator_profile"] = profile.rows()
+    return summary
@@ -0,0 +1,136 @@
+"""
+Streaming ingestion of one entity file.
+
+The raw file is read lazily, validated a batch at a time with
+iter_validate_records, and every batch goes straight into the validated and
+quarantine uploads before the next one is read. Peak memory follows the
+batch size instead of the file size, nothing is written to local disk, and
+the uploaded objects are the same as the in-memory path writes. Objects
+that already exist are checked for first and not written again.
+
+With a ReferenceIndex or KeyIndex, orphan and duplicate rows are moved to
+the quarantine batch by batch too, so only the current batch's raw rows
+are kept for them.
+"""
+from contextlib import ExitStack
+from datetime import date
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Type
+
+from pydantic import BaseModel
+
+from batch_data_pipeline.ingestion.loaders.blob_manifest import BlobManifest, blob_exists, record_upload
+from batch_data_pipeline.ingestion.loaders.gcs_io import CONTENT_TYPES, open_upload
+from batch_data_pipeline.ingestion.loaders.quanrantine_helpers import QuarantineCsvWriter, build_quarantine_blob_path
+from batch_data_pipeline.ingestion.loaders.validated_helpers import (
+    ValidatedRowWriter,
+    build_gcs_uri,
+    build_validated_blob_path,
+)
+from batch_data_pipeline.ingestion.utils.csv_io import iter_csv_rows
+from batch_data_pipeline.ingestion.utils.parquet_io import iter_parquet_rows
+from batch_data_pipeline.validation.helpers import DEFAULT_BATCH_SIZE, iter_validate_records
+from batch_data_pipeline.validation.referential import ReferenceIndex
+from batch_data_pipeline.validation.dedup import KeyIndex
+from batch_data_pipeline.validation.profiling import ValidatorProfile
+from batch_data_pipeline.validation.schema.compiled import COMPILED_SCHEMAS
+
+
+def iter_raw_rows(path: Path) -> Iterator[Dict[str, Any]]:
+    """Rows of a raw CSV or Parquet file, read as they are consumed."""
+    if path.suffix == ".parquet":
+        yield from iter_parquet_rows(path)
+        return
+    yield from iter_csv_rows(path)
+
+
+def _keep_pulled(rows: Iterator[Dict[str, Any]], pulled: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for row in rows:
+        pulled.append(row)
+        yield row
+
+
+def _open_upload(
+    uploads: ExitStack,
+    bucket,
+    blob_path: str,
+    content_type: str,
+    manifest: Optional[BlobManifest],
+) -> Optional[BinaryIO]:
+    """A streamed upload into `blob_path` closed with `uploads`; None if the object already exists."""
+    if blob_exists(bucket, blob_path, manifest):
+        return None
+    return uploads.enter_context(open_upload(bucket, blob_path, content_type))
+
+
+def ingest_streaming(
+    file_path: Path,
+    schema: Type[BaseModel],
+    entity: str,
+    run_dt: date,
+    bucket,
+    output_format: str = "csv",
+    chunk_size: Optional[int] = None,
+    engine: str = "pydantic",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    fk_index: Optional[ReferenceIndex] = None,
+    key_index: Optional[KeyIndex] = None,
+    profile_validators: bool = False,
+    blob_manifest: Optional[BlobManifest] = None,
+) -> Dict[str, Any]:
+    """Validate `file_path` batch by batch into validated_raw/quarantine_raw; returns the ingest summary."""
+    if engine == "columnar":
+        raise ValueError("Streaming ingestion validates with the 'pydantic' or 'compiled' engine")
+    if engine == "compiled":
+        schema = COMPILED_SCHEMAS[schema]
+
+    run_date = run_dt.isoformat()
+    validated_path = build_validated_blob_path(entity, run_date, output_format)
+    quarantine_path = build_quarantine_blob_path(entity, run_date)
+    fieldnames = list(schema.model_fields)
+    profile = ValidatorProfile() if profile_validators else None
+
+    with ExitStack() as uploads:
+        # rows are still validated (and counted) when both objects exist: the FK and dedup indexes need them
+        validated_f = _open_upload(uploads, bucket, validated_path, CONTENT_TYPES[output_format], blob_manifest)
+        quarantine_f = _open_upload(uploads, bucket, quarantine_path, CONTENT_TYPES["csv"], blob_manifest)
+        validated = uploads.enter_context(ValidatedRowWriter(validated_f, entity, output_format, fieldnames))
+        quarantine = uploads.enter_context(QuarantineCsvWriter(quarantine_f))
+
+        # raw rows of the batch being validated, for the FK and dedup quarantine entries
+        pulled: List[Dict[str, Any]] = []
+        raw_rows = iter_raw_rows(file_path)
+        if fk_index is not None or key_index is not None:
+            raw_rows = _keep_pulled(raw_rows, pulled)
+        batches = iter_validate_records(
+            raw_rows, schema, chunk_size=chunk_size, output="tuple", batch_size=batch_size, profile=profile
+        )
+        seen = 0
+        for valid, invalid in batches:
+            if fk_index is not None:
+                valid, invalid = fk_index.split_orphans(entity, pulled, valid, invalid, seen, fieldnames)
+            if key_index is not None:
+                valid, invalid = key_index.split_duplicates(entity, pulled, valid, invalid, run_dt, seen, fieldnames)
+            if fk_index is not None:
+                fk_index.register(entity, valid, fieldnames)
+            seen += len(pulled)
+            pulled.clear()
+            validated.write(valid)
+            quarantine.write(invalid)
+
+    for blob_path, f in ((validated_path, validated_f), (quarantine_path, quarantine_f)):
+        if f is not None:
+            record_upload(blob_manifest, blob_path)
+
+    summary = {
+        "entity": entity,
+        "run_date": run_date,
+        "total_rows": validated.rows_written + quarantine.rows_written,
+        "valid_rows": validated.rows_written,
+        "invalid_rows": quarantine.rows_written,
+        "validated_path": build_gcs_uri(bucket.name, validated_path),
+        "quarantine_path": build_gcs_uri(bucket.name, quarantine_path),
+    }
+    if profile is not None:
+        summary["validator_profile"] = profile.rows()
+    return summary
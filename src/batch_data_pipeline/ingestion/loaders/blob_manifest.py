@@ -0,0 +1,118 @@
+"""
+Existence checks for the loaders' "already uploaded" skips.
+
+bucket.blob(path).exists() is one metadata request per object: 15 per
+partition, thousands during a backfill. A BlobManifest lists each prefix
+(a run date's raw/ecommerce/, validated_raw/ or quarantine_raw/ folder)
+once with list_blobs, keeps name, size and CRC32C of what's there, and
+answers every later check from memory. Uploads the loaders make are
+added as they happen, with the size and CRC32C the upload reported.
+
+A raw file is skipped only if the stored object has its size and CRC32C
+(where known), so a regenerated or truncated file is uploaded again.
+Validated and quarantine objects are skipped on existence alone: their
+skip happens before serialization, when there is nothing to compare yet.
+
+A manifest describes the bucket as of its listing, so make one per run.
+"""
+import base64
+import threading
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+import google_crc32c
+from google.cloud import storage
+
+# only what BlobInfo keeps, instead of every object's full metadata
+LIST_FIELDS = "items(name,size,crc32c),nextPageToken"
+
+
+class BlobInfo(NamedTuple):
+    name: str
+    size: Optional[int]
+    crc32c: Optional[str]  # base64, as GCS reports it
+
+
+def blob_prefix(blob_path: str) -> str:
+    """The folder a blob is listed under: everything up to its last '/'."""
+    return blob_path[:blob_path.rfind("/") + 1]
+
+
+class BlobManifest:
+    """The objects of one bucket, one list_blobs per prefix; safe to share between upload threads."""
+
+    def __init__(self, bucket: storage.Bucket):
+        self.bucket = bucket
+        self.listings = 0
+        self._prefixes: Dict[str, Dict[str, BlobInfo]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, blob_path: str) -> Optional[BlobInfo]:
+        return self._listing(blob_prefix(blob_path)).get(blob_path)
+
+    def exists(self, blob_path: str) -> bool:
+        return self.get(blob_path) is not None
+
+    def add(self, blob_path: str, size: Optional[int] = None, crc32c: Optional[str] = None) -> None:
+        """Record an object uploaded after the listing."""
+        listing = self._listing(blob_prefix(blob_path))
+        with self._lock:
+            listing[blob_path] = BlobInfo(blob_path, size, crc32c)
+
+    def forget(self, prefix: Optional[str] = None) -> None:
+        """Drop the listing of `prefix` (of every prefix by default); the next check lists it again."""
+        with self._lock:
+            if prefix is None:
+                self._prefixes.clear()
+            else:
+                self._prefixes.pop(prefix, None)
+
+    def _listing(self, prefix: str) -> Dict[str, BlobInfo]:
+        # held while listing, so threads checking the same prefix wait for one listing
+        with self._lock:
+            if prefix not in self._prefixes:
+                blobs = self.bucket.list_blobs(prefix=prefix, fields=LIST_FIELDS)
+                self._prefixes[prefix] = {b.name: BlobInfo(b.name, b.size, b.crc32c) for b in blobs}
+                self.listings += 1
+            return self._prefixes[prefix]
+
+
+def blob_exists(bucket: storage.Bucket, blob_path: str, manifest: Optional[BlobManifest] = None) -> bool:
+    """Whether `blob_path` is in the bucket: from `manifest` if given, else one metadata request."""
+    if manifest is not None:
+        return manifest.exists(blob_path)
+    return bucket.blob(blob_path).exists()
+
+
+def stored_blob(bucket: storage.Bucket, blob_path: str, manifest: Optional[BlobManifest] = None) -> Optional[BlobInfo]:
+    """What the bucket holds at `blob_path` (None if nothing): from `manifest` if given, else one metadata request."""
+    if manifest is not None:
+        return manifest.get(blob_path)
+    blob = bucket.get_blob(blob_path)
+    return None if blob is None else BlobInfo(blob.name, blob.size, blob.crc32c)
+
+
+def file_crc32c(path: Path) -> str:
+    """CRC32C of a local file, base64 like BlobInfo.crc32c."""
+    checksum = google_crc32c.Checksum()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            checksum.update(block)
+    return base64.b64encode(checksum.digest()).decode()
+
+
+def holds_file(info: BlobInfo, path: Path) -> bool:
+    """Whether a stored object is `path` as it is now; size and CRC32C are compared where known."""
+    if info.size is not None and info.size != path.stat().st_size:
+        return False
+    return info.crc32c is None or info.crc32c == file_crc32c(path)
+
+
+def record_upload(manifest: Optional[BlobManifest], blob_path: str, blob: Optional[storage.Blob] = None) -> None:
+    """
+    Add an object just uploaded to `manifest`, if there is one. Size and
+    CRC32C come from `blob` once the upload has filled them in (uploads
+    from a file do; streamed ones don't, and are recorded without).
+    """
+    if manifest is not None:
+        manifest.add(blob_path, getattr(blob, "size", None), getattr(blob, "crc32c", None))
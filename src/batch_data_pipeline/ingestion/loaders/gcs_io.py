@@ -0,0 +1,25 @@
+"""
+Streamed uploads shared by the validated and quarantine loaders.
+
+Rows are serialized straight into a resumable upload (blob.open("wb"))
+instead of a local temp file.
+"""
+from typing import BinaryIO, Callable
+
+from google.cloud import storage
+
+CONTENT_TYPES = {"csv": "text/csv", "parquet": "application/octet-stream"}
+
+
+def open_upload(bucket: storage.Bucket, blob_path: str, content_type: str) -> BinaryIO:
+    """
+    A writable stream into `blob_path`. Used as a context manager, an
+    exception before close cancels the upload, so no partial object is left.
+    """
+    return bucket.blob(blob_path).open("wb", content_type=content_type, ignore_flush=True)
+
+
+def upload_stream(bucket: storage.Bucket, blob_path: str, write: Callable[[BinaryIO], None], content_type: str) -> None:
+    """Upload whatever `write` writes into the stream it is given."""
+    with open_upload(bucket, blob_path, content_type) as f:
+        write(f)
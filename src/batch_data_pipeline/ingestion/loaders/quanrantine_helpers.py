@@ -1,8 +1,12 @@
 import csv
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, BinaryIO, Optional
 from google.cloud import storage
 
+from batch_data_pipeline.ingestion.utils.csv_io import write_csv_stream
+
+from .blob_manifest import blob_exists
+
 
 def write_quarantine_to_csv(rows: List[Dict[str, Any]], output_path: Path):
     """Write invalid rows to CSV."""
@@ -41,8 +45,35 @@ def write_quarantine_csv(rows: List[Dict[str, Any]], path: Path) -> None:
         writer.writeheader()
         writer.writerows(rows)
 
-def blob_exists(bucket: storage.Bucket, blob_path: str) -> bool:
-    return bucket.blob(blob_path).exists()
+def stream_quarantine_csv(rows: List[Dict[str, Any]], f: BinaryIO) -> None:
+    """write_quarantine_csv into a binary stream (e.g. blob.open("wb"))."""
+    write_csv_stream(f, rows)
+
+class QuarantineCsvWriter:
+    """
+    Invalid rows appended batch by batch into a binary stream, as
+    stream_quarantine_csv writes them in one go; with no stream, only counted.
+    """
+
+    def __init__(self, f: Optional[BinaryIO]):
+        self.f = f
+        self.rows_written = 0
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if self.f is not None:
+            write_csv_stream(self.f, rows, header=not self.rows_written)
+        self.rows_written += len(rows)
+
+    def close(self) -> int:
+        return self.rows_written
+
+    def __enter__(self) -> "QuarantineCsvWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
 def upload_file(bucket: storage.Bucket, local_file: Path, blob_path: str) -> None:
-    bucket.blob(blob_path).upload_from_filename(str(local_file))
\ No newline at end of file
+    bucket.blob(blob_path).upload_from_filename(str(local_file))
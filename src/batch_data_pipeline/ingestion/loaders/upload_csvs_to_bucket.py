@@ -1,42 +1,118 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional
+from google.api_core.retry import if_transient_error
 from google.cloud import storage
 
+from .blob_manifest import BlobManifest, holds_file, record_upload, stored_blob
+
+# uploads are network-bound, so threads overlap them; the client's
+# connection pool holds 10 connections
+DEFAULT_UPLOAD_WORKERS = 8
+DEFAULT_UPLOAD_RETRIES = 3
+BACKOFF_SECONDS = 1.0
+
 def build_raw_blob_path(prefix: str, file: Path) -> str:
     return f"{prefix}/{file.name}"
 
 def build_gcs_uri(bucket_name: str, blob_path: str) -> str:
     return f"gs://{bucket_name}/{blob_path}"
 
-def blob_exists(bucket: storage.Bucket, blob_path: str) -> bool:
-    return bucket.blob(blob_path).exists()
+def upload_file(bucket: storage.Bucket, local_file: Path, blob_path: str) -> storage.Blob:
+    blob = bucket.blob(blob_path)
+    blob.upload_from_filename(str(local_file))
+    return blob
 
-def upload_file(bucket: storage.Bucket, local_file: Path, blob_path: str) -> None:
-    bucket.blob(blob_path).upload_from_filename(str(local_file))
+def upload_raw_file(
+    file: Path,
+    bucket: storage.Bucket,
+    prefix: str,
+    retries: int = DEFAULT_UPLOAD_RETRIES,
+    backoff: float = BACKOFF_SECONDS,
+    manifest: Optional[BlobManifest] = None,
+) -> Dict[str, Any]:
+    """
+    Upload one raw file unless the bucket already holds it (same size and
+    CRC32C); returns its report (uri, bytes, seconds, attempts, skipped).
+
+    Transient errors (5xx, 429, dropped connections) retry the existence
+    check and the upload up to `retries` times, backing off exponentially
+    with jitter; a retry after an upload that did land is then a skip.
+    The first check goes to `manifest` if given; retries ask the bucket.
+    """
+    blob_path = build_raw_blob_path(prefix, file)
+    start = time.perf_counter()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            stored = stored_blob(bucket, blob_path, manifest if attempt == 1 else None)
+            skipped = stored is not None and holds_file(stored, file)
+            if not skipped:
+                record_upload(manifest, blob_path, upload_file(bucket, file, blob_path))
+            break
+        except Exception as exc:
+            if attempt > retries or not if_transient_error(exc):
+                raise
+            time.sleep(backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+    return {
+        "file": file.name,
+        "uri": build_gcs_uri(bucket.name, blob_path),
+        "bytes": 0 if skipped else file.stat().st_size,
+        "seconds": round(time.perf_counter() - start, 3),
+        "attempts": attempt,
+        "skipped": skipped,
+    }
+
+def upload_raw_files_report(
+    csv_files: List[Path],
+    bucket: storage.Bucket,
+    prefix: str,
+    logger=None,
+    max_workers: int = DEFAULT_UPLOAD_WORKERS,
+    retries: int = DEFAULT_UPLOAD_RETRIES,
+    backoff: float = BACKOFF_SECONDS,
+    manifest: Optional[BlobManifest] = None,
+) -> List[Dict[str, Any]]:
+    """
+    upload_raw_file for every file, `max_workers` at a time; reports in
+    the order of `csv_files`. The whole upload takes about as long as the
+    slowest file instead of the sum.
+    """
+    def upload(file: Path) -> Dict[str, Any]:
+        return upload_raw_file(file, bucket, prefix, retries, backoff, manifest)
+
+    if max_workers > 1 and len(csv_files) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(csv_files))) as pool:
+            reports = list(pool.map(upload, csv_files))
+    else:
+        reports = [upload(file) for file in csv_files]
+
+    if logger:
+        for report in reports:
+            if report["skipped"]:
+                logger.info(f"Skipping {report['uri']} — already exists")
+            else:
+                logger.info(
+                    f"Uploaded {report['uri']} ({report['bytes']:,} bytes in {report['seconds']:.2f}s, "
+                    f"attempt {report['attempts']})"
+                )
+    return reports
 
 def upload_raw_files(
     csv_files: List[Path],
     bucket: storage.Bucket,
     prefix: str,
     logger=None,
+    max_workers: int = DEFAULT_UPLOAD_WORKERS,
+    manifest: Optional[BlobManifest] = None,
 ) -> List[str]:
     """
     Upload the original raw CSV files untouched.
     Perfect for Snowpipe.
     """
-    uris = []
-
-    for file in csv_files:
-        blob_path = build_raw_blob_path(prefix, file)
-        uri = build_gcs_uri(bucket.name, blob_path)
-
-        if blob_exists(bucket, blob_path):
-            if logger:
-                logger.info(f"Skipping {blob_path} — already exists")
-            uris.append(uri)
-            continue
-
-        upload_file(bucket, file, blob_path)
-        uris.append(uri)
-
-    return uris
+    reports = upload_raw_files_report(csv_files, bucket, prefix, logger, max_workers, manifest=manifest)
+    return [report["uri"] for report in reports]
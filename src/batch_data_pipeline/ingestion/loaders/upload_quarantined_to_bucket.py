@@ -1,12 +1,15 @@
+from .blob_manifest import BlobManifest, record_upload
+from .gcs_io import CONTENT_TYPES, upload_stream
 from .quanrantine_helpers import (
     build_quarantine_temp_path,
     build_quarantine_blob_path,
     build_gcs_uri,
     write_quarantine_csv,
+    stream_quarantine_csv,
     blob_exists,
     upload_file,
 )
-from typing import List, Dict, Any, Tuple, Type
+from typing import List, Dict, Any, Optional, Tuple, Type
 from google.cloud import storage
 
 
@@ -16,22 +19,29 @@ def upload_quarantine_to_bucket(
     entity: str,
     run_date: str,
     logger=None,
+    stream: bool = True,
+    manifest: Optional[BlobManifest] = None,
 ) -> str:
     """
-    Writes invalid rows → temp CSV,
-    uploads to injected bucket,
+    Writes invalid rows → CSV upload
+    (streamed into the object, or through a temp CSV without stream),
+    skipped before any serialization if the object exists (per `manifest`, if given),
     returns the gs:// URI.
     """
-    temp_path = build_quarantine_temp_path(entity, run_date)
     blob_path = build_quarantine_blob_path(entity, run_date)
     uri = build_gcs_uri(bucket.name, blob_path)
 
-    write_quarantine_csv(rows, temp_path)
-
-    if blob_exists(bucket, blob_path):
+    if blob_exists(bucket, blob_path, manifest):
         if logger:
             logger.info(f"Skipping {blob_path} — already exists")
         return uri
 
-    upload_file(bucket, temp_path, blob_path)
+    if stream:
+        upload_stream(bucket, blob_path, lambda f: stream_quarantine_csv(rows, f), CONTENT_TYPES["csv"])
+        record_upload(manifest, blob_path)
+        return uri
+
+    temp_path = build_quarantine_temp_path(entity, run_date)
+    write_quarantine_csv(rows, temp_path)
+    record_upload(manifest, blob_path, upload_file(bucket, temp_path, blob_path))
     return uri
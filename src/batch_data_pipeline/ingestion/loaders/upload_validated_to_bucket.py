@@ -1,66 +1,69 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 from google.cloud import storage
 from pathlib import Path
 
+from batch_data_pipeline.ingestion.utils.parquet_io import check_output_format
+
+from .blob_manifest import BlobManifest, record_upload
+from .gcs_io import CONTENT_TYPES, upload_stream
 from .validated_helpers import (
     build_validated_temp_path,
     build_validated_blob_path,
     build_gcs_uri,
     write_validated_csv,
+    write_validated_parquet,
+    stream_validated_rows,
     blob_exists,
     upload_file,
 )
 
 
 def upload_validated_to_bucket(
-    rows: List[Dict[str, Any]],
-    bucket: storage.Bucket,
-    entity: str,
-    run_date: str,
-    logger=None,
-) -> str:
-    temp_path = build_validated_temp_path(entity, run_date)
-    blob_path = build_validated_blob_path(entity, run_date)
-    uri = build_gcs_uri(bucket.name, blob_path)
-
-    write_validated_csv(rows, temp_path)
-
-    if blob_exists(bucket, blob_path):
-        if logger:
-            logger.info(f"Skipping {blob_path} — already exists")
-        return uri
-
-    upload_file(bucket, temp_path, blob_path)
-    return uri
-
-
-
-
-
-
-
-def upload_validated_to_bucket(
-    rows: List[Dict[str, Any]],
+    rows: Sequence[Any],
     bucket: storage.Bucket,
     entity: str,
     run_date: str,
     logger=None,
+    output_format: str = "csv",
+    fieldnames: Optional[Sequence[str]] = None,
+    stream: bool = True,
+    manifest: Optional[BlobManifest] = None,
 ) -> str:
     """
-    Write validated rows to a temp CSV and upload to the provided bucket.
+    Upload validated rows as CSV (or typed Parquet) to the provided bucket.
+    Rows are dicts, or tuples in `fieldnames` order.
+    With stream, rows are serialized chunk by chunk into a resumable upload
+    and nothing touches local disk; otherwise they go through a temp file.
+    An object that already exists (per `manifest`, if given) is skipped
+    before any serialization.
     Fully SRP, DI-friendly, no hidden mutation.
     """
+    check_output_format(output_format)
 
-    temp_path = build_validated_temp_path(entity, run_date)
-    blob_path = build_validated_blob_path(entity, run_date)
+    blob_path = build_validated_blob_path(entity, run_date, output_format)
     uri = build_gcs_uri(bucket.name, blob_path)
 
-    write_validated_csv(rows, temp_path)
-
-    if blob_exists(bucket, blob_path):
+    if blob_exists(bucket, blob_path, manifest):
         if logger:
             logger.info(f"Skipping {blob_path} — already exists")
         return uri
 
-    upload_file(bucket, temp_path, blob_path)
+    if stream:
+        upload_stream(
+            bucket,
+            blob_path,
+            lambda f: stream_validated_rows(rows, f, entity, output_format, fieldnames),
+            CONTENT_TYPES[output_format],
+        )
+        record_upload(manifest, blob_path)
+        return uri
+
+    temp_path = build_validated_temp_path(entity, run_date, output_format)
+
+    if output_format == "parquet":
+        write_validated_parquet(rows, temp_path, entity, fieldnames=fieldnames)
+    else:
+        write_validated_csv(rows, temp_path, fieldnames)
+
+    record_upload(manifest, blob_path, upload_file(bucket, temp_path, blob_path))
     return uri
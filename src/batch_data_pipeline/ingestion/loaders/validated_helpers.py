@@ -1,35 +1,126 @@
 import csv
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, BinaryIO, Optional, Sequence
 from google.cloud import storage
 
+from batch_data_pipeline.ingestion.utils.csv_io import write_csv_stream
 
-def build_validated_blob_path(entity: str, run_date: str) -> str:
-    return f"validated_raw/run_date={run_date}/{entity}.csv"
+from .blob_manifest import blob_exists
 
+from batch_data_pipeline.ingestion.utils.parquet_io import (
+    DEFAULT_ROW_GROUP_SIZE,
+    ParquetTableWriter,
+    check_output_format,
+    write_parquet_rows,
+)
 
-def build_validated_temp_path(entity: str, run_date: str) -> Path:
-    return Path(f"/tmp/{entity}_{run_date}_validated.csv")
+
+def build_validated_blob_path(entity: str, run_date: str, output_format: str = "csv") -> str:
+    return f"validated_raw/run_date={run_date}/{entity}.{output_format}"
+
+
+def build_validated_temp_path(entity: str, run_date: str, output_format: str = "csv") -> Path:
+    return Path(f"/tmp/{entity}_{run_date}_validated.{output_format}")
 
 
 def build_gcs_uri(bucket_name: str, blob_path: str) -> str:
     return f"gs://{bucket_name}/{blob_path}"
 
-def write_validated_csv(rows: List[Dict[str, Any]], path: Path) -> None:
-    """Write validated rows to CSV."""
+def write_validated_csv(rows: Sequence[Any], path: Path, fieldnames: Optional[Sequence[str]] = None) -> None:
+    """
+    Write validated rows to CSV.
+
+    Rows are dicts, or tuples in `fieldnames` order (validate_records(...,
+    output="tuple")), which skip DictWriter's per-row key lookups.
+    """
     if not rows:
         path.write_text("")
         return
 
-    fieldnames = rows[0].keys()
-
     with path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+        if fieldnames is not None:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+        else:
+            writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+            writer.writeheader()
         writer.writerows(rows)
 
-def blob_exists(bucket: storage.Bucket, blob_path: str) -> bool:
-    return bucket.blob(blob_path).exists()
+def write_validated_parquet(
+    rows: Sequence[Any],
+    path: Path,
+    entity: str,
+    row_group_size: int = 100_000,
+    fieldnames: Optional[Sequence[str]] = None,
+) -> None:
+    """Write validated rows (dicts, or tuples in `fieldnames` order) to Parquet with the entity's column types."""
+    if fieldnames is not None:
+        rows = [dict(zip(fieldnames, row)) for row in rows]
+    write_parquet_rows(rows, path, entity, row_group_size=row_group_size)
+
+def stream_validated_rows(
+    rows: Sequence[Any],
+    f: BinaryIO,
+    entity: str,
+    output_format: str = "csv",
+    fieldnames: Optional[Sequence[str]] = None,
+) -> None:
+    """Write validated rows into a binary stream as the bytes write_validated_csv / write_validated_parquet would."""
+    if output_format == "parquet":
+        write_validated_parquet(rows, f, entity, fieldnames=fieldnames)
+    else:
+        write_csv_stream(f, rows, fieldnames)
+
+class ValidatedRowWriter:
+    """
+    Validated rows written batch by batch as CSV or typed Parquet into a binary stream.
+
+    The stream ends up holding what stream_validated_rows would write for
+    all the rows at once; only the current batch is held in memory. With
+    no stream (the object is already uploaded) rows are only counted.
+    """
+
+    def __init__(
+        self,
+        f: Optional[BinaryIO],
+        entity: str,
+        output_format: str = "csv",
+        fieldnames: Optional[Sequence[str]] = None,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    ):
+        self.f = f
+        self.entity = entity
+        self.output_format = check_output_format(output_format)
+        self.fieldnames = fieldnames
+        self.rows_written = 0
+        self._parquet = None
+        if f is not None and output_format == "parquet":
+            self._parquet = ParquetTableWriter(f, entity, row_group_size)
+
+    def write(self, rows: Sequence[Any]) -> None:
+        if not rows:
+            return
+        if self._parquet is not None:
+            if self.fieldnames is not None:
+                rows = [dict(zip(self.fieldnames, row)) for row in rows]
+            self._parquet.write_rows(rows)
+        elif self.f is not None:
+            # header with the first batch, as write_validated_csv does; no rows, nothing written
+            write_csv_stream(self.f, rows, self.fieldnames, header=not self.rows_written)
+        self.rows_written += len(rows)
+
+    def close(self) -> int:
+        if self._parquet is not None:
+            self._parquet.close()
+            if not self.rows_written:
+                write_parquet_rows([], self.f, self.entity)
+        return self.rows_written
+
+    def __enter__(self) -> "ValidatedRowWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
 def upload_file(bucket: storage.Bucket, local_file: Path, blob_path: str) -> None:
-    bucket.blob(blob_path).upload_from_filename(str(local_file))
\ No newline at end of file
+    bucket.blob(blob_path).upload_from_filename(str(local_file))
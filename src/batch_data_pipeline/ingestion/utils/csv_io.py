@@ -0,0 +1,276 @@
+"""
+Reading raw CSV files.
+
+One reader for the ingestors, the streaming path and the raw_* assets.
+Files are read through a large buffer with csv.reader, a chunk of rows at
+a time, in one of four shapes:
+
+- "dict":    [{header: value}], what csv.DictReader gives
+- "tuple":   [(value, ...)] in header order (read_csv_header)
+- "columns": {header: [value, ...]}
+- "arrow":   pa.RecordBatch of string columns, parsed by Arrow's CSV reader
+
+Every value is the raw text ("" for an empty field), whatever the shape.
+Tuples skip the per-row dict and its repeated keys; Arrow skips Python
+objects entirely until a column is needed.
+
+Large files can also be parsed in parallel (iter_csv_parts): the file is
+memory-mapped and cut into byte ranges at line ends outside quoted
+fields, each range is parsed in a worker process, and the parts come back
+in file order with the row index of their first row.
+
+write_csv_stream is the writing side for uploads: rows are serialized a
+chunk at a time straight into a binary stream such as blob.open("wb").
+"""
+import csv
+import io
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+READ_BUFFER_SIZE = 1 << 20
+DEFAULT_CHUNK_ROWS = 50_000
+CSV_OUTPUTS = ("dict", "tuple", "columns", "arrow")
+# read_csv only spreads a file over processes from this size on
+PARALLEL_MIN_BYTES = 64 << 20
+# byte ranges per worker, so a slow range doesn't leave the others idle
+PARTS_PER_WORKER = 4
+_SCAN_WINDOW = 16 << 20
+
+
+class CsvPart(NamedTuple):
+    start: int  # row index of the first row in the whole file
+    rows: List[Any]
+
+
+def _open(path):
+    return open(path, "r", encoding="utf-8", newline="", buffering=READ_BUFFER_SIZE)
+
+
+def read_csv_header(path) -> List[str]:
+    with _open(path) as f:
+        return next(csv.reader(f), [])
+
+
+def read_csv(path, workers: int = 1) -> List[Dict[str, Any]]:
+    """
+    All rows of a CSV file as dicts (the same as list(csv.DictReader(f))).
+
+    With workers > 1, files of PARALLEL_MIN_BYTES or more are parsed by
+    iter_csv_parts in that many processes.
+    """
+    rows: List[Dict[str, Any]] = []
+    if workers > 1 and os.path.getsize(path) >= PARALLEL_MIN_BYTES:
+        for part in iter_csv_parts(path, workers):
+            rows.extend(part.rows)
+        return rows
+    for chunk in iter_csv_chunks(path):
+        rows.extend(chunk)
+    return rows
+
+
+def iter_csv_rows(path, chunk_size: int = DEFAULT_CHUNK_ROWS) -> Iterator[Dict[str, Any]]:
+    """read_csv one chunk at a time."""
+    for chunk in iter_csv_chunks(path, chunk_size):
+        yield from chunk
+
+
+def iter_csv_chunks(path, chunk_size: int = DEFAULT_CHUNK_ROWS, output: str = "dict") -> Iterator[Any]:
+    """
+    Rows of a CSV file, `chunk_size` at a time, shaped as `output`.
+
+    Arrow batches are cut by bytes rather than rows: about READ_BUFFER_SIZE
+    of text each.
+    """
+    if output not in CSV_OUTPUTS:
+        raise ValueError(f"Unknown output '{output}', expected one of {CSV_OUTPUTS}")
+    if output == "arrow":
+        yield from _arrow_batches(path)
+        return
+
+    with _open(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        # blank lines are skipped, like DictReader does
+        rows = filter(None, reader)
+        while True:
+            # rows are shaped as they're read: a chunk of csv.reader's lists
+            # would be walked by every GC pass (lists are never untracked)
+            if output == "dict":
+                chunk = _dicts(header, islice(rows, chunk_size))
+            else:
+                chunk = list(map(tuple, islice(rows, chunk_size)))
+            if not chunk:
+                return
+            yield _columns(header, chunk) if output == "columns" else chunk
+
+
+def _dicts(header: List[str], rows: Iterable[List[str]]) -> List[Dict[str, Any]]:
+    n = len(header)
+    return [dict(zip(header, row)) if len(row) == n else _ragged(header, row) for row in rows]
+
+
+def _ragged(header: List[str], row: List[str]) -> Dict[Any, Any]:
+    # DictReader's restval/restkey: missing fields are None, extra ones a list under None
+    out: Dict[Any, Any] = dict(zip(header, row))
+    if len(row) < len(header):
+        out.update(dict.fromkeys(header[len(row):]))
+    else:
+        out[None] = list(row[len(header):])
+    return out
+
+
+def _columns(header: List[str], rows: List[Tuple[str, ...]]) -> Dict[str, List[Optional[str]]]:
+    n = len(header)
+    if any(len(row) != n for row in rows):
+        rows = [(row + (None,) * n)[:n] for row in rows]
+    return {name: [row[i] for row in rows] for i, name in enumerate(header)}
+
+
+def _arrow_batches(path) -> Iterator[pa.RecordBatch]:
+    header = read_csv_header(path)
+    if not header:
+        return
+    reader = pa_csv.open_csv(
+        str(path),
+        read_options=pa_csv.ReadOptions(block_size=READ_BUFFER_SIZE),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True, ignore_empty_lines=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in header},
+            strings_can_be_null=False,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+    for batch in reader:
+        if batch.num_rows:
+            yield batch
+
+
+def write_csv_stream(
+    f: BinaryIO,
+    rows: Sequence[Any],
+    fieldnames: Optional[Sequence[str]] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    header: bool = True,
+) -> int:
+    """
+    Write rows as UTF-8 CSV into the binary stream `f`, `chunk_rows` at a time; returns the bytes written.
+
+    Rows are dicts (header from the first row's keys) or tuples in
+    `fieldnames` order. No rows, nothing written, like the empty files the
+    loaders leave. Later batches of the same file pass header=False.
+    """
+    if not rows:
+        return 0
+    text = io.StringIO(newline="")
+    if fieldnames is not None:
+        writer = csv.writer(text)
+        if header:
+            writer.writerow(fieldnames)
+    else:
+        writer = csv.DictWriter(text, fieldnames=rows[0].keys())
+        if header:
+            writer.writeheader()
+
+    written = 0
+    for start in range(0, len(rows), chunk_rows):
+        writer.writerows(rows[start:start + chunk_rows])
+        data = text.getvalue().encode("utf-8")
+        f.write(data)
+        written += len(data)
+        text.seek(0)
+        text.truncate()
+    return written
+
+
+# -----------------------------
+# Parallel parsing
+# -----------------------------
+
+def split_csv_ranges(path, parts: int) -> List[Tuple[int, int]]:
+    """
+    Byte ranges covering the data rows of `path` in about `parts` equal pieces.
+
+    Every range starts and ends on a line end outside a quoted field, so it
+    parses on its own: a position is inside quotes when an odd number of '"'
+    precede it (an escaped "" counts twice).
+    """
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            pos, quotes = _line_end(mm, 0, 0)
+            bounds = [pos]
+            for target in (bounds[0] + (size - bounds[0]) * i // parts for i in range(1, parts)):
+                if target <= pos:
+                    continue
+                quotes += _count_quotes(mm, pos, target)
+                pos, quotes = _line_end(mm, target, quotes)
+                if pos >= size:
+                    break
+                bounds.append(pos)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def iter_csv_parts(path, workers: int, output: str = "dict", parts: Optional[int] = None) -> Iterator[CsvPart]:
+    """
+    The rows of `path` parsed by `workers` processes, one CsvPart per byte range, in file order.
+
+    `output` is "dict" or "tuple" (see iter_csv_chunks); `parts` defaults
+    to PARTS_PER_WORKER ranges per worker.
+    """
+    if output not in ("dict", "tuple"):
+        raise ValueError(f"Parallel parsing returns 'dict' or 'tuple' rows, not '{output}'")
+    header = read_csv_header(path)
+    ranges = split_csv_ranges(path, parts or workers * PARTS_PER_WORKER)
+    if not header or not ranges:
+        return
+    tasks = [(str(path), start, end, header, output) for start, end in ranges]
+
+    row = 0
+    # spawn, not fork: Dagster and the GCS client may already run threads in this process
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        for rows in pool.map(_parse_range, tasks):
+            yield CsvPart(row, rows)
+            row += len(rows)
+
+
+def _parse_range(task: Tuple[str, int, int, List[str], str]) -> List[Any]:
+    path, start, end, header, output = task
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    rows = filter(None, csv.reader(io.StringIO(text, newline="")))
+    return _dicts(header, rows) if output == "dict" else list(map(tuple, rows))
+
+
+def _count_quotes(mm: mmap.mmap, start: int, end: int) -> int:
+    count = 0
+    for pos in range(start, end, _SCAN_WINDOW):
+        count += mm[pos:min(pos + _SCAN_WINDOW, end)].count(b'"')
+    return count
+
+
+def _line_end(mm: mmap.mmap, pos: int, quotes: int) -> Tuple[int, int]:
+    """Position after the first newline at or after `pos` that is outside quotes, and the quote count there."""
+    while True:
+        newline = mm.find(b"\n", pos)
+        if newline == -1:
+            return len(mm), quotes + _count_quotes(mm, pos, len(mm))
+        quotes += _count_quotes(mm, pos, newline)
+        pos = newline + 1
+        if quotes % 2 == 0:
+            return pos, quotes
@@ -1,6 +1,20 @@
+from datetime import date
 from pathlib import Path
 from typing import List
 
 
 def list_csvs(folder: Path) -> List[Path]:
     return sorted(folder.glob("*.csv"))
+
+
+def list_data_files(folder: Path) -> List[Path]:
+    """Raw table files of a day folder, CSV or Parquet."""
+    return sorted([*folder.glob("*.csv"), *folder.glob("*.parquet")])
+
+
+def find_day_file(day_folder: Path, entity: str, run_dt: date) -> Path:
+    """The entity's file for the day: Parquet when the generator wrote it, otherwise CSV."""
+    parquet = day_folder / f"{entity}_{run_dt}.parquet"
+    if parquet.exists():
+        return parquet
+    return day_folder / f"{entity}_{run_dt}.csv"
@@ -0,0 +1,295 @@
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+OUTPUT_FORMATS = ("csv", "parquet")
+DEFAULT_ROW_GROUP_SIZE = 100_000
+# UUID hex strings dominate these tables; zstd gets them well below snappy
+COMPRESSION = "zstd"
+
+# low-cardinality text: stored once per row group, rows keep int32 codes
+CATEGORICAL = pa.dictionary(pa.int32(), pa.string())
+TIMESTAMP = pa.timestamp("us")
+
+# Column types per entity, for validated files; anything that doesn't fit
+# the type is written as null. Raw files use raw_schema below.
+SCHEMAS: Dict[str, Dict[str, pa.DataType]] = {
+    "customers": {
+        "customer_id": pa.string(),
+        "first_name": pa.string(),
+        "last_name": pa.string(),
+        "email": pa.string(),
+        "country": CATEGORICAL,
+        "signup_date": pa.date32(),
+    },
+    "products": {
+        "product_id": pa.string(),
+        "name": pa.string(),
+        "category": CATEGORICAL,
+        "price": pa.float64(),
+        "stock_count": pa.int32(),
+        "created_at": TIMESTAMP,
+        "is_active": pa.bool_(),
+    },
+    "orders": {
+        "order_id": pa.string(),
+        "customer_id": pa.string(),
+        "order_date": TIMESTAMP,
+        "status": CATEGORICAL,
+        "total_amount": pa.float64(),
+        "shipping_cost": pa.float64(),
+        "shipping_country": CATEGORICAL,
+        "campaign": CATEGORICAL,
+    },
+    "order_items": {
+        "order_item_id": pa.string(),
+        "order_id": pa.string(),
+        "product_id": pa.string(),
+        "quantity": pa.int32(),
+        "unit_price": pa.float64(),
+        "line_total": pa.float64(),
+    },
+    "payments": {
+        "payment_id": pa.string(),
+        "order_id": pa.string(),
+        "amount": pa.float64(),
+        "payment_method": CATEGORICAL,
+        "paid_at": TIMESTAMP,
+    },
+}
+
+
+# Fields the generator fills with text on purpose ("FREE", "??", "ten", "NaN"),
+# or that copy such a value (unit_price takes the product's price). Raw files
+# keep them as text, so validation and the quarantine see the original value
+# as they do with CSV.
+RAW_TEXT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "products": ("price", "stock_count"),
+    "order_items": ("quantity", "unit_price", "line_total"),
+    "payments": ("amount",),
+}
+
+
+def raw_schema(entity: str) -> Dict[str, pa.DataType]:
+    """SCHEMAS[entity] with RAW_TEXT_FIELDS as text."""
+    text = RAW_TEXT_FIELDS.get(entity, ())
+    return {name: pa.string() if name in text else t for name, t in SCHEMAS.get(entity, {}).items()}
+
+
+def check_output_format(output_format: str) -> str:
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {OUTPUT_FORMATS}")
+    return output_format
+
+
+# -----------------------------
+# Value coercion
+# -----------------------------
+
+def _to_float(v: Any) -> Optional[float]:
+    if v is None or isinstance(v, bool):
+        return None
+    if isinstance(v, (int, float)):
+        return float(v)
+    try:
+        return float(str(v).strip())
+    except ValueError:
+        return None
+
+
+def _to_int(v: Any) -> Optional[int]:
+    if v is None or isinstance(v, bool):
+        return None
+    if isinstance(v, int):
+        return v if -2**31 <= v < 2**31 else None
+    f = _to_float(v)
+    if f is None or not f.is_integer():
+        return None
+    return _to_int(int(f))
+
+
+def _to_bool(v: Any) -> Optional[bool]:
+    if isinstance(v, bool):
+        return v
+    text = str(v).strip().lower() if v is not None else ""
+    return {"true": True, "false": False, "1": True, "0": False}.get(text)
+
+
+def _to_timestamp(v: Any) -> Optional[datetime]:
+    if isinstance(v, datetime):
+        value = v
+    elif isinstance(v, str) and v.strip():
+        try:
+            value = datetime.fromisoformat(v.strip())
+        except ValueError:
+            return None
+    else:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _to_date(v: Any) -> Optional[date]:
+    if isinstance(v, datetime):
+        return v.date()
+    if isinstance(v, date):
+        return v
+    if isinstance(v, str) and v.strip():
+        try:
+            return date.fromisoformat(v.strip())
+        except ValueError:
+            return None
+    return None
+
+
+def _to_str(v: Any) -> Optional[str]:
+    return None if v is None else str(v)
+
+
+_COERCE: Dict[pa.DataType, Callable[[Any], Any]] = {
+    pa.float64(): _to_float,
+    pa.int32(): _to_int,
+    pa.bool_(): _to_bool,
+    TIMESTAMP: _to_timestamp,
+    pa.date32(): _to_date,
+    pa.string(): _to_str,
+}
+
+
+def to_arrow(values: Sequence[Any], arrow_type: pa.DataType) -> pa.Array:
+    """
+    One column as a typed Arrow array.
+
+    Clean columns convert directly; only when Arrow rejects a value (a bad
+    string in a numeric column, a malformed timestamp) does the column go
+    through the per-value coercion above.
+    """
+    target = pa.string() if arrow_type == CATEGORICAL else arrow_type
+    try:
+        if target == TIMESTAMP or target == pa.date32():
+            array = pa.array(values).cast(target) if values else pa.array([], type=target)
+        else:
+            array = pa.array(values, type=target)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError, ValueError):
+        array = pa.array([_COERCE[target](v) for v in values], type=target)
+    if arrow_type == CATEGORICAL:
+        array = array.dictionary_encode()
+    return array
+
+
+def to_record_batch(
+    entity: str,
+    columns: Dict[str, Sequence[Any]],
+    types: Optional[Dict[str, pa.DataType]] = None,
+) -> pa.RecordBatch:
+    """Columns (name → values) as a RecordBatch typed by `types` (SCHEMAS by default); unknown columns stay text."""
+    types = SCHEMAS.get(entity, {}) if types is None else types
+    arrays = [to_arrow(list(values), types.get(name, pa.string())) for name, values in columns.items()]
+    return pa.RecordBatch.from_arrays(arrays, names=list(columns))
+
+
+def rows_to_columns(rows: Sequence[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    fieldnames = list(rows[0].keys())
+    return {name: [row.get(name) for row in rows] for name in fieldnames}
+
+
+# -----------------------------
+# Writing / reading
+# -----------------------------
+
+class ParquetTableWriter:
+    """
+    Incremental Parquet writer for one table.
+
+    Chunks of any size go in through write_columns/write_rows; they are
+    buffered and written out as row groups of `row_group_size` rows.
+    `path` may also be a writable binary file object (left open on close).
+    With raw=True the columns are typed by raw_schema, for the generator's
+    raw files.
+    """
+
+    def __init__(self, path, entity: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE, raw: bool = False):
+        self.path = path if hasattr(path, "write") else Path(path)
+        self.entity = entity
+        self.types = raw_schema(entity) if raw else SCHEMAS.get(entity, {})
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self._pending: List[pa.RecordBatch] = []
+        self._pending_rows = 0
+        self._writer: Optional[pq.ParquetWriter] = None
+
+    def write_rows(self, rows: Sequence[Dict[str, Any]]) -> None:
+        if rows:
+            self.write_columns(rows_to_columns(rows))
+
+    def write_columns(self, columns: Dict[str, Sequence[Any]]) -> None:
+        batch = to_record_batch(self.entity, columns, self.types)
+        if not batch.num_rows:
+            return
+        self._pending.append(batch)
+        self._pending_rows += batch.num_rows
+        if self._pending_rows >= self.row_group_size:
+            self._flush()
+
+    def close(self) -> int:
+        self._flush(final=True)
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        return self.rows_written
+
+    def __enter__(self) -> "ParquetTableWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _flush(self, final: bool = False) -> None:
+        """Write every full row group; the remainder stays buffered until more rows or close()."""
+        if not self._pending:
+            return
+        # dictionaries differ per chunk; unify so every chunk shares the file schema
+        table = pa.Table.from_batches(self._pending).unify_dictionaries().combine_chunks()
+        n = table.num_rows if final else table.num_rows - table.num_rows % self.row_group_size
+        rest = table.slice(n)
+        table = table.slice(0, n)
+
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema, compression=COMPRESSION)
+        else:
+            table = table.cast(self._writer.schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self.rows_written += table.num_rows
+        self._pending, self._pending_rows = rest.to_batches(), rest.num_rows
+
+
+def write_parquet_rows(
+    rows: Iterable[Dict[str, Any]],
+    path,
+    entity: str,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> int:
+    """Write dict rows to a typed Parquet file; returns the number of rows written."""
+    rows = list(rows)
+    with ParquetTableWriter(path, entity, row_group_size) as writer:
+        writer.write_rows(rows)
+    if not rows:
+        # still leave a readable (empty) file behind, like the empty CSVs
+        empty = {name: pa.array([], type=t) for name, t in SCHEMAS.get(entity, {}).items()}
+        pq.write_table(pa.table(empty), path, compression=COMPRESSION)
+    return len(rows)
+
+
+def read_parquet_rows(path) -> List[Dict[str, Any]]:
+    """Rows of a Parquet file as dicts with typed values (float, int, datetime, None)."""
+    return pq.read_table(path).to_pylist()
+
+
+def iter_parquet_rows(path, batch_size: int = DEFAULT_ROW_GROUP_SIZE) -> Iterator[Dict[str, Any]]:
+    """read_parquet_rows one record batch at a time."""
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
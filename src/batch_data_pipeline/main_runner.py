@@ -1,9 +1,10 @@
 from dotenv import load_dotenv
 load_dotenv()
+from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
 import os
-from typing import List, Dict, Any, Tuple, Type
+from typing import List, Dict, Any, Optional, Tuple, Type
 
 from google.cloud import storage
 
@@ -22,15 +23,62 @@ from batch_data_pipeline.ingestion.ingestors.order_ingestion import ingest_order
 from batch_data_pipeline.ingestion.ingestors.order_item_ingestion import ingest_order_items
 from batch_data_pipeline.ingestion.ingestors.payment_ingestion import ingest_payments
 
-from batch_data_pipeline.ingestion.loaders.upload_csvs_to_bucket import upload_raw_files
+from batch_data_pipeline.ingestion.loaders.blob_manifest import BlobManifest
+from batch_data_pipeline.ingestion.loaders.upload_csvs_to_bucket import DEFAULT_UPLOAD_WORKERS, upload_raw_files_report
 from batch_data_pipeline.generators.generator import EcommerceDataGenerator
-from batch_data_pipeline.ingestion.utils.file_finder import list_csvs
-
-
-def run_full_ingestion(run_dt: date, logger=None):
+from batch_data_pipeline.ingestion.utils.file_finder import list_data_files
+from batch_data_pipeline.validation.referential import ReferenceIndex
+from batch_data_pipeline.validation.dedup import DEFAULT_RETENTION_DAYS, KeyIndex
+from batch_data_pipeline.validation.profiling import format_profile_table
+from batch_data_pipeline.validation.cache import ValidationCache
+from batch_data_pipeline.validation.columnar import check_columnar_options
+from batch_data_pipeline.validation.parallel import validation_pool
+
+
+@dataclass
+class IngestionConfig:
+    """
+    Options of run_full_ingestion. The defaults generate and validate a day
+    as the plain pipeline does; the checks that quarantine more rows
+    (fk_check, dedup) and the generator's persistent_ids are opt-in.
+    """
+
+    # validation: workers > 1 shares one process pool across the entities;
+    # engine is "pydantic", "compiled" or "columnar"; streaming validates in batches
+    workers: int = 1
+    chunk_size: Optional[int] = None
+    engine: str = "pydantic"
+    streaming: bool = False
+    # quarantine orphan FKs (validation/referential.py); parents are the rows
+    # that passed validation on the runs made with the check on
+    fk_check: bool = False
+    # quarantine IDs loaded on an earlier day (validation/dedup.py)
+    dedup: bool = False
+    dedup_retention_days: int = DEFAULT_RETENTION_DAYS
+    # per-validator timings in the summaries (validation/profiling.py)
+    profile: bool = False
+    # reuse the result for an unchanged raw file on a retry or backfill (validation/cache.py);
+    # keyed on the file's hash, the validation code, schema and engine
+    cache: bool = True
+    # generator FKs drawn from every earlier day (generators/id_registry.py)
+    persistent_ids: bool = False
+    raw_upload_workers: int = DEFAULT_UPLOAD_WORKERS
+
+    def __post_init__(self):
+        if self.engine == "columnar":
+            check_columnar_options(self.workers, self.chunk_size)
+            if self.streaming:
+                raise ValueError("Streaming ingestion validates with the 'pydantic' or 'compiled' engine")
+
+
+def run_full_ingestion(run_dt: date, logger=None, config: Optional[IngestionConfig] = None):
+    """Generate, upload and validate one day; see IngestionConfig for the options."""
+    config = config or IngestionConfig()
     base_output_dir = Path(os.getenv("ECOMMERCE_DATA_DIR", "/tmp/ecommerce_data"))
     base_output_dir.mkdir(parents=True, exist_ok=True)
     day_folder = base_output_dir / run_dt.isoformat()
+    # "csv" (default) or "parquet" for the raw day folder and validated_raw/ objects
+    output_format = os.getenv("ECOMMERCE_OUTPUT_FORMAT", "csv")
 
     bucket_name = os.getenv("GCS_BUCKET")
     if not bucket_name:
@@ -41,33 +89,77 @@ def run_full_ingestion(run_dt: date, logger=None):
         output_path=str(base_output_dir),
         daily_rows={"customers": 200, "products": 10, "orders": 2000},
         initial_rows={"customers": 50000, "products": 5000, "orders": 100000},
+        persistent_ids=config.persistent_ids,
+        output_format=output_format,
     )
     gen.run_incremental_batch(run_dt)
 
     client = storage.Client()
     bucket = client.bucket(bucket_name)
+    blob_manifest = BlobManifest(bucket)
 
     # ------------------ RAW UPLOAD ------------------
-    raw_files = list_csvs(day_folder)
-    raw_uris = upload_raw_files(
+    raw_files = list_data_files(day_folder)
+    raw_report = upload_raw_files_report(
         csv_files=raw_files,
         bucket=bucket,
         prefix=f"raw/ecommerce/{run_dt.isoformat()}",
         logger=logger,
+        max_workers=config.raw_upload_workers,
+        manifest=blob_manifest,
     )
 
     # ------------------ VALIDATED / QUARANTINE ------------------
-    results = {
-        "customers": ingest_customers(day_folder, run_dt, bucket),
-        "products": ingest_products(day_folder, run_dt, bucket),
-        "orders": ingest_orders(day_folder, run_dt, bucket),
-        "order_items": ingest_order_items(day_folder, run_dt, bucket),
-        "payments": ingest_payments(day_folder, run_dt, bucket),
+    ingest_options = {
+        "output_format": output_format,
+        "workers": config.workers,
+        "chunk_size": config.chunk_size,
+        "engine": config.engine,
+        "streaming": config.streaming,
+        "profile_validators": config.profile,
+        "blob_manifest": blob_manifest,
     }
+    if config.cache:
+        ingest_options["validation_cache"] = ValidationCache(base_output_dir / "_validation_cache")
+    fk_index = None
+    if config.fk_check:
+        # not seeded from the generator's ID registry: that holds the parents
+        # whose rows were quarantined too
+        fk_index = ReferenceIndex(base_output_dir / "_fk_index")
+        ingest_options["fk_index"] = fk_index
+    key_index = None
+    if config.dedup:
+        key_index = KeyIndex(base_output_dir / "_key_index.sqlite")
+        ingest_options["key_index"] = key_index
+    pool = None
+    try:
+        if config.workers > 1 and not config.streaming and config.engine != "columnar":
+            # one set of worker processes for all five entities instead of one per file
+            pool = ingest_options["validation_pool"] = validation_pool(config.workers)
+        results = {
+            "customers": ingest_customers(day_folder, run_dt, bucket, **ingest_options),
+            "products": ingest_products(day_folder, run_dt, bucket, **ingest_options),
+            "orders": ingest_orders(day_folder, run_dt, bucket, **ingest_options),
+            "order_items": ingest_order_items(day_folder, run_dt, bucket, **ingest_options),
+            "payments": ingest_payments(day_folder, run_dt, bucket, **ingest_options),
+        }
+        if fk_index is not None:
+            fk_index.commit()
+        if key_index is not None:
+            key_index.compact(run_dt, config.dedup_retention_days)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if key_index is not None:
+            key_index.close()
+    if config.profile and logger:
+        for entity, summary in results.items():
+            logger.info(f"Validator profile for {entity}:\n{format_profile_table(summary['validator_profile'])}")
 
     return {
         "run_date": run_dt.isoformat(),
-        "raw_uploaded": raw_uris,
+        "raw_uploaded": [report["uri"] for report in raw_report],
+        "raw_upload_report": raw_report,
         "validated_and_quarantine": results,
     }
 
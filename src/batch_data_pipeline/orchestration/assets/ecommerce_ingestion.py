@@ -1,12 +1,12 @@
 import json
 import os
-import csv
 from datetime import date
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from dagster import asset, Output, DailyPartitionsDefinition
+from dagster import asset, Config, Output, DailyPartitionsDefinition
 from google.cloud import storage
+from pydantic import model_validator
 
 from batch_data_pipeline.generators.generator import EcommerceDataGenerator
 
@@ -32,6 +32,16 @@ from batch_data_pipeline.ingestion.loaders.upload_validated_to_bucket import (
 from batch_data_pipeline.ingestion.loaders.upload_quarantined_to_bucket import (
     upload_quarantine_to_bucket,
 )
+from batch_data_pipeline.ingestion.utils.file_finder import find_day_file
+from batch_data_pipeline.ingestion.utils.csv_io import read_csv
+from batch_data_pipeline.ingestion.utils.parquet_io import read_parquet_rows
+from batch_data_pipeline.validation.cache import ValidationCache
+from batch_data_pipeline.validation.columnar import check_columnar_options
+from batch_data_pipeline.validation.schema.customer import Customer
+from batch_data_pipeline.validation.schema.order import Order
+from batch_data_pipeline.validation.schema.order_item import OrderItem
+from batch_data_pipeline.validation.schema.payment import Payment
+from batch_data_pipeline.validation.schema.product import Product
 
 
 # -------------------------------------------------------------------
@@ -60,21 +70,36 @@ def partition_date(partition_key: str) -> date:
     return date.fromisoformat(partition_key)
 
 
-def read_csv(path: Path) -> List[Dict[str, Any]]:
-    with path.open("r", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
+def get_output_format() -> str:
+    """Format of the raw day folder and validated_raw/ objects: csv (default) or parquet."""
+    return os.getenv("ECOMMERCE_OUTPUT_FORMAT", "csv")
+
+
+def read_rows(path: Path) -> List[Dict[str, Any]]:
+    if path.suffix == ".parquet":
+        return read_parquet_rows(path)
+    return read_csv(path)
 
 
 def make_file_path(day_folder: Path, entity: str, run_dt: date) -> Path:
-    return day_folder / f"{entity}_{run_dt}.csv"
+    return find_day_file(day_folder, entity, run_dt)
 
 
 # -------------------------------------------------------------------
 # 1) Generator asset – creates all local raw CSVs for the day
 # -------------------------------------------------------------------
 
+class GeneratorConfig(Config):
+    """
+    Run config for generate_raw_ecommerce_data; with persistent_ids, FKs
+    are drawn from the IDs of every earlier day (generators/id_registry.py).
+    """
+
+    persistent_ids: bool = False
+
+
 @asset(partitions_def=daily_partitions)
-def generate_raw_ecommerce_data(context) -> Path:
+def generate_raw_ecommerce_data(context, config: GeneratorConfig) -> Path:
     """Generate all raw ecommerce CSVs for the given partition date."""
     run_dt = partition_date(context.partition_key)
 
@@ -88,6 +113,8 @@ def generate_raw_ecommerce_data(context) -> Path:
         output_path=str(base_output_dir),
         daily_rows={"customers": 200, "products": 10, "orders": 2000},
         initial_rows={"customers": 50000, "products": 5000, "orders": 100000},
+        persistent_ids=config.persistent_ids,
+        output_format=get_output_format(),
     )
     gen.run_incremental_batch(run_dt)
 
@@ -103,35 +130,35 @@ def generate_raw_ecommerce_data(context) -> Path:
 def raw_customers(context, generate_raw_ecommerce_data: Path) -> List[Dict[str, Any]]:
     run_dt = partition_date(context.partition_key)
     path = make_file_path(generate_raw_ecommerce_data, "customers", run_dt)
-    return read_csv(path)
+    return read_rows(path)
 
 
 @asset(partitions_def=daily_partitions)
 def raw_products(context, generate_raw_ecommerce_data: Path) -> List[Dict[str, Any]]:
     run_dt = partition_date(context.partition_key)
     path = make_file_path(generate_raw_ecommerce_data, "products", run_dt)
-    return read_csv(path)
+    return read_rows(path)
 
 
 @asset(partitions_def=daily_partitions)
 def raw_orders(context, generate_raw_ecommerce_data: Path) -> List[Dict[str, Any]]:
     run_dt = partition_date(context.partition_key)
     path = make_file_path(generate_raw_ecommerce_data, "orders", run_dt)
-    return read_csv(path)
+    return read_rows(path)
 
 
 @asset(partitions_def=daily_partitions)
 def raw_order_items(context, generate_raw_ecommerce_data: Path) -> List[Dict[str, Any]]:
     run_dt = partition_date(context.partition_key)
     path = make_file_path(generate_raw_ecommerce_data, "order_items", run_dt)
-    return read_csv(path)
+    return read_rows(path)
 
 
 @asset(partitions_def=daily_partitions)
 def raw_payments(context, generate_raw_ecommerce_data: Path) -> List[Dict[str, Any]]:
     run_dt = partition_date(context.partition_key)
     path = make_file_path(generate_raw_ecommerce_data, "payments", run_dt)
-    return read_csv(path)
+    return read_rows(path)
 
 
 # -------------------------------------------------------------------
@@ -139,37 +166,98 @@ def raw_payments(context, generate_raw_ecommerce_data: Path) -> List[Dict[str, A
 #    (to avoid double validation)
 # -------------------------------------------------------------------
 
+class ValidationConfig(Config):
+    """
+    Run config for the *_validation assets; workers > 1 validates in a
+    process pool; engine is "pydantic", "compiled" (native-constraint
+    schema variants) or "columnar" (column-at-a-time validator). With
+    cache, a retried partition reuses the result for an unchanged raw file.
+    """
+
+    workers: int = 1
+    chunk_size: Optional[int] = None
+    engine: str = "pydantic"
+    cache: bool = True
+
+    @model_validator(mode="after")
+    def _columnar_options(self):
+        if self.engine == "columnar":
+            check_columnar_options(self.workers, self.chunk_size)
+        return self
+
+
+def get_validation_cache() -> ValidationCache:
+    return ValidationCache(get_base_output_dir() / "_validation_cache")
+
+
 def _validate(
+    context,
     rows: List[Dict[str, Any]],
     validator,
+    config: ValidationConfig,
+    day_folder: Path,
+    entity: str,
+    schema,
 ) -> Dict[str, List[Dict[str, Any]]]:
-    cleaned, invalid = validator(rows)
+    def validate():
+        return validator(rows, workers=config.workers, chunk_size=config.chunk_size, engine=config.engine)
+
+    if config.cache:
+        path = make_file_path(day_folder, entity, partition_date(context.partition_key))
+        cleaned, invalid = get_validation_cache().get_or_validate(path, schema, config.engine, validate)
+    else:
+        cleaned, invalid = validate()
     return {"cleaned": cleaned, "invalid": invalid}
 
 
 @asset(partitions_def=daily_partitions)
-def customers_validation(raw_customers: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-    return _validate(raw_customers, validate_customer_rows)
+def customers_validation(
+    context,
+    config: ValidationConfig,
+    raw_customers: List[Dict[str, Any]],
+    generate_raw_ecommerce_data: Path,
+) -> Dict[str, List[Dict[str, Any]]]:
+    return _validate(context, raw_customers, validate_customer_rows, config, generate_raw_ecommerce_data, "customers", Customer)
 
 
 @asset(partitions_def=daily_partitions)
-def products_validation(raw_products: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-    return _validate(raw_products, validate_product_rows)
+def products_validation(
+    context,
+    config: ValidationConfig,
+    raw_products: List[Dict[str, Any]],
+    generate_raw_ecommerce_data: Path,
+) -> Dict[str, List[Dict[str, Any]]]:
+    return _validate(context, raw_products, validate_product_rows, config, generate_raw_ecommerce_data, "products", Product)
 
 
 @asset(partitions_def=daily_partitions)
-def orders_validation(raw_orders: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-    return _validate(raw_orders, validate_order_rows)
+def orders_validation(
+    context,
+    config: ValidationConfig,
+    raw_orders: List[Dict[str, Any]],
+    generate_raw_ecommerce_data: Path,
+) -> Dict[str, List[Dict[str, Any]]]:
+    return _validate(context, raw_orders, validate_order_rows, config, generate_raw_ecommerce_data, "orders", Order)
 
 
 @asset(partitions_def=daily_partitions)
-def order_items_validation(raw_order_items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-    return _validate(raw_order_items, validate_order_item_rows)
+def order_items_validation(
+    context,
+    config: ValidationConfig,
+    raw_order_items: List[Dict[str, Any]],
+    generate_raw_ecommerce_data: Path,
+) -> Dict[str, List[Dict[str, Any]]]:
+    return _validate(context, raw_order_items, validate_order_item_rows, config, generate_raw_ecommerce_data, "order_items", OrderItem)
 
 
 @asset(partitions_def=daily_partitions)
-def payments_validation(raw_payments: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-    return _validate(raw_payments, validate_payment_rows)
+def payments_validation(
+    context,
+    config: ValidationConfig,
+    raw_payments: List[Dict[str, Any]],
+    generate_raw_ecommerce_data: Path,
+) -> Dict[str, List[Dict[str, Any]]]:
+    return _validate(context, raw_payments, validate_payment_rows, config, generate_raw_ecommerce_data, "payments", Payment)
 
 
 # -------------------------------------------------------------------
@@ -188,6 +276,7 @@ def validated_customers(context, customers_validation: Dict[str, List[Dict[str,
         entity="customers",
         run_date=run_dt.isoformat(),
         logger=context.log,
+        output_format=get_output_format(),
     )
     context.log.info(f"Uploaded validated customers → {uri}")
     return uri
@@ -205,6 +294,7 @@ def validated_products(context, products_validation: Dict[str, List[Dict[str, An
         entity="products",
         run_date=run_dt.isoformat(),
         logger=context.log,
+        output_format=get_output_format(),
     )
     context.log.info(f"Uploaded validated products → {uri}")
     return uri
@@ -222,6 +312,7 @@ def validated_orders(context, orders_validation: Dict[str, List[Dict[str, Any]]]
         entity="orders",
         run_date=run_dt.isoformat(),
         logger=context.log,
+        output_format=get_output_format(),
     )
     context.log.info(f"Uploaded validated orders → {uri}")
     return uri
@@ -239,6 +330,7 @@ def validated_order_items(context, order_items_validation: Dict[str, List[Dict[s
         entity="order_items",
         run_date=run_dt.isoformat(),
         logger=context.log,
+        output_format=get_output_format(),
     )
     context.log.info(f"Uploaded validated order_items → {uri}")
     return uri
@@ -256,6 +348,7 @@ def validated_payments(context, payments_validation: Dict[str, List[Dict[str, An
         entity="payments",
         run_date=run_dt.isoformat(),
         logger=context.log,
+        output_format=get_output_format(),
     )
     context.log.info(f"Uploaded validated payments → {uri}")
     return uri
@@ -0,0 +1,127 @@
+"""
+Validation results cached by raw-file content.
+
+A retried or re-materialized partition validates the very same raw file
+again. ValidationCache stores each file's (cleaned, invalid) output under
+the file's content hash plus a fingerprint of the validation code, so the
+retry loads it instead. Any edit under validation/ (schemas, cleaners,
+engines) or a pydantic-core upgrade changes the fingerprint, which
+invalidates every entry.
+
+Entries are pickled and zlib-compressed, one file each. Reads refresh the
+file's mtime, and writes evict the least recently used entries once the
+directory is over `max_bytes`.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+import pydantic_core
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_BYTES = 1 << 30
+_SUFFIX = ".pkl.z"
+
+Result = Tuple[List[Any], List[Dict[str, Any]]]
+
+
+def file_digest(path: Path) -> str:
+    """blake2b of the file's bytes."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def code_fingerprint() -> str:
+    """Hash of the validation package's sources and the pydantic-core version."""
+    digest = hashlib.blake2b(pydantic_core.__version__.encode(), digest_size=12)
+    root = Path(__file__).parent
+    for path in sorted(root.rglob("*.py")):
+        digest.update(str(path.relative_to(root)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """(cleaned, invalid) per raw file, schema and engine, in `root`."""
+
+    def __init__(self, root, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def key(self, path: Path, schema: Type[BaseModel], engine: str) -> str:
+        parts = [file_digest(path), f"{schema.__module__}.{schema.__qualname__}", engine, code_fingerprint()]
+        return hashlib.blake2b("|".join(parts).encode(), digest_size=20).hexdigest()
+
+    def get(self, key: str) -> Optional[Result]:
+        entry = self._entry(key)
+        try:
+            data = entry.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            cleaned, invalid = pickle.loads(zlib.decompress(data))
+        except Exception as e:
+            logger.warning(f"Dropping unreadable validation cache entry {entry.name}: {e}")
+            entry.unlink(missing_ok=True)
+            return None
+        os.utime(entry)
+        return cleaned, invalid
+
+    def put(self, key: str, cleaned: List[Any], invalid: List[Dict[str, Any]]) -> None:
+        data = zlib.compress(pickle.dumps((cleaned, invalid), protocol=pickle.HIGHEST_PROTOCOL), 1)
+        entry = self._entry(key)
+        tmp = entry.with_name(entry.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, entry)
+        self.evict()
+
+    def get_or_validate(
+        self,
+        path: Path,
+        schema: Type[BaseModel],
+        engine: str,
+        validate: Callable[[], Result],
+    ) -> Result:
+        """The cached result for `path`, or validate() (and cache its result)."""
+        key = self.key(path, schema, engine)
+        cached = self.get(key)
+        if cached is not None:
+            logger.info(f"Reusing cached validation of {path.name} ({len(cached[0]):,} valid, {len(cached[1]):,} invalid)")
+            return cached
+        cleaned, invalid = validate()
+        self.put(key, cleaned, invalid)
+        return cleaned, invalid
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits in max_bytes; returns how many."""
+        entries = []
+        for entry in self.root.glob(f"*{_SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def _entry(self, key: str) -> Path:
+        return self.root / f"{key}{_SUFFIX}"
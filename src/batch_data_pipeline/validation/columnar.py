@@ -0,0 +1,403 @@
+"""
+Column-at-a-time validation for the entity schemas.
+
+The schema classes clean every value in a Python `mode="before"` validator,
+one call per field per row. The rules below apply the same cleaning to whole
+columns with Arrow/NumPy kernels: numeric parsing with range masks, enum
+membership, ISO timestamp parsing. Emails are checked once per distinct
+address through the email cache.
+
+Each rule returns the cleaned column and a mask of the rows it is *sure*
+about. Anything it is not sure about — invalid rows, but also values whose
+Python semantics a kernel could get subtly wrong (non-ASCII text, "1e5",
+"inf", timestamps outside the plain ISO form) — goes through the Pydantic
+model as before. The result is exactly what validating every row with the
+model and dumping it with model_dump(mode="json") gives; Pydantic is left
+to build the error details of rejected rows.
+"""
+import logging
+from operator import itemgetter
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pydantic import BaseModel
+from pydantic_core import PydanticCustomError
+
+from batch_data_pipeline.validation.email_cache import normalize_email
+from batch_data_pipeline.validation.helpers import validate_records
+from batch_data_pipeline.validation.profiling import ValidatorProfile
+from batch_data_pipeline.validation.schema.customer import Customer
+from batch_data_pipeline.validation.schema.order import Order
+from batch_data_pipeline.validation.schema.order_item import OrderItem
+from batch_data_pipeline.validation.schema.payment import Payment
+from batch_data_pipeline.validation.schema.product import Product
+from batch_data_pipeline.validation.timestamps import ParsedColumn, parse_timestamps
+
+logger = logging.getLogger(__name__)
+
+# (cleaned column, rows whose cleaned value is certain and valid)
+Rule = Callable[[pa.Array], Tuple[pa.Array, np.ndarray]]
+
+# the ASCII characters str.strip() removes (Arrow's ascii_trim_whitespace misses \x1c-\x1f)
+_PY_WHITESPACE = " \t\n\x0b\x0c\r\x1c\x1d\x1e\x1f"
+# what str_strip_whitespace removes: pydantic-core trims Unicode White_Space, which leaves \x1c-\x1f
+_CORE_WHITESPACE = (
+    " \t\n\x0b\x0c\r\x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006"
+    "\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+_DECIMAL = r"^-?[0-9]{1,15}(\.[0-9]{1,15})?$"
+_DIGITS = r"^[0-9]+$"
+# what Customer.validate_name accepts, for ASCII text: letters, spaces, hyphens, apostrophes
+_NAME = r"^[A-Za-z '-]{2,}$"
+_ANY_DIGIT = r"[0-9]"
+# text float() still parses without containing a digit
+_FLOAT_WORDS = frozenset({"inf", "+inf", "-inf", "infinity", "+infinity", "-infinity", "nan", "+nan", "-nan"})
+
+
+# -----------------------------
+# Kernels
+# -----------------------------
+
+def _mask(condition: pa.Array) -> np.ndarray:
+    """Boolean Arrow array → NumPy mask, null counting as False."""
+    return pc.fill_null(condition, False).to_numpy(zero_copy_only=False)
+
+
+def _is_text(arr: pa.Array) -> bool:
+    return pa.types.is_string(arr.type) or pa.types.is_null(arr.type)
+
+
+def _text(arr: pa.Array) -> Tuple[pa.Array, np.ndarray]:
+    """
+    str(v).strip() for a text column, plus the rows where the kernels are
+    guaranteed to agree with Python's str methods: the ASCII ones.
+    """
+    arr = arr.cast(pa.string())
+    return pc.ascii_trim(arr, characters=_PY_WHITESPACE), _mask(pc.string_is_ascii(arr))
+
+
+def _is_in(arr: pa.Array, words) -> np.ndarray:
+    return _mask(pc.is_in(arr, value_set=pa.array(sorted(words), type=pa.string())))
+
+
+def identifier(arr: pa.Array) -> Tuple[pa.Array, np.ndarray]:
+    """str, stripped by the model config (no cleaner), min_length=1."""
+    if not _is_text(arr):
+        return arr, np.zeros(len(arr), dtype=bool)
+    # the same character set as pydantic-core, so non-ASCII text is certain too
+    text = pc.utf8_trim(arr.cast(pa.string()), characters=_CORE_WHITESPACE)
+    return text, _mask(pc.greater_equal(pc.utf8_length(text), 1))
+
+
+def number(
+    low: float,
+    low_inclusive: bool = False,
+    high: Optional[float] = None,
+    null_words: FrozenSet[str] = frozenset(),
+) -> Rule:
+    """
+    Optional float: parsed, then None outside (low, high). Text in
+    `null_words` (after strip/lower) is None without parsing.
+    """
+    def in_range(values: pa.Array) -> pa.Array:
+        ok = pc.greater_equal(values, low) if low_inclusive else pc.greater(values, low)
+        return ok if high is None else pc.and_(ok, pc.less(values, high))
+
+    def rule(arr: pa.Array) -> Tuple[pa.Array, np.ndarray]:
+        if pa.types.is_integer(arr.type) or pa.types.is_floating(arr.type):
+            values = arr.cast(pa.float64())
+            keep = in_range(values)
+            finite = _mask(pc.is_finite(values)) | _mask(pc.is_null(values))
+            return pc.if_else(keep, values, None), finite
+        if not _is_text(arr):
+            return arr, np.zeros(len(arr), dtype=bool)
+
+        text, certain = _text(arr)
+        lower = pc.ascii_lower(text)
+        decimal = _mask(pc.match_substring_regex(text, _DECIMAL))
+        values = pc.if_else(decimal, text, None).cast(pa.float64())
+        # no digit and no inf/nan spelling: float() raises, the cleaner returns None
+        unparsable = ~_mask(pc.match_substring_regex(text, _ANY_DIGIT)) & ~_is_in(lower, _FLOAT_WORDS)
+        words = _is_in(lower, null_words)
+
+        keep = _mask(in_range(values)) & decimal & ~words
+        cleaned = pc.if_else(keep, values, None)
+        sure = _mask(pc.is_null(arr)) | (certain & (decimal | unparsable | words))
+        return cleaned, sure
+
+    return rule
+
+
+def whole_number(low: int) -> Rule:
+    """Optional int: digit strings / ints >= low, everything else None."""
+    def rule(arr: pa.Array) -> Tuple[pa.Array, np.ndarray]:
+        if pa.types.is_integer(arr.type):
+            values = arr.cast(pa.int64())
+            return pc.if_else(pc.greater_equal(values, low), values, None), np.ones(len(arr), dtype=bool)
+        if not _is_text(arr):
+            return arr, np.zeros(len(arr), dtype=bool)
+
+        text, certain = _text(arr)
+        digits = _mask(pc.match_substring_regex(text, _DIGITS))
+        # int64 holds 18 digits; longer ones are left to Python ints
+        short = _mask(pc.less_equal(pc.utf8_length(text), 18))
+        values = pc.if_else(digits & short, text, None).cast(pa.int64())
+        cleaned = pc.if_else(pc.greater_equal(values, low), values, None)
+        sure = _mask(pc.is_null(arr)) | (certain & (~digits | short))
+        return cleaned, sure
+
+    return rule
+
+
+def timestamp(arr: pa.Array) -> Tuple[pa.Array, np.ndarray]:
+    """Required datetime, as model_dump(mode="json") writes it: ISO, microseconds only when non-zero."""
+    if pa.types.is_timestamp(arr.type) and arr.type.tz is None:
+        text = pc.strftime(arr.cast(pa.timestamp("us")), format="%Y-%m-%dT%H:%M:%S")
+        return pc.replace_substring_regex(text, r"\.000000$", ""), _mask(pc.is_valid(arr))
+    if not _is_text(arr):
+        return arr, np.zeros(len(arr), dtype=bool)
+
+    text, certain = _text(arr)
+    parsed = _parsed(text, "datetime")
+    cleaned = pa.array(np.char.replace(np.datetime_as_string(parsed.values, unit="us"), ".000000", ""))
+    return cleaned, certain & parsed.fast
+
+
+def calendar_date(arr: pa.Array) -> Tuple[pa.Array, np.ndarray]:
+    """Required date, as model_dump(mode="json") writes it: YYYY-MM-DD."""
+    if pa.types.is_date(arr.type):
+        return arr.cast(pa.date32()).cast(pa.string()), _mask(pc.is_valid(arr))
+    if not _is_text(arr):
+        return arr, np.zeros(len(arr), dtype=bool)
+
+    text, certain = _text(arr)
+    parsed = _parsed(text, "date")
+    return pa.array(np.datetime_as_string(parsed.values, unit="D")), certain & parsed.fast
+
+
+def _parsed(text: pa.Array, kind: str) -> ParsedColumn:
+    # rows outside the generator's layout are left to the model, which also reports why they fail
+    parsed = parse_timestamps(text, kind)
+    if parsed.fallback:
+        logger.debug(f"{parsed.fallback:,} of {len(text):,} {kind} values took the general parser")
+    return parsed
+
+
+def name(arr: pa.Array) -> Tuple[pa.Array, np.ndarray]:
+    """Required str, stripped, title-cased; letters, spaces, hyphens and apostrophes only."""
+    if not _is_text(arr):
+        return arr, np.zeros(len(arr), dtype=bool)
+    text, certain = _text(arr)
+    return pc.ascii_title(text), certain & _mask(pc.match_substring_regex(text, _NAME))
+
+
+def email(arr: pa.Array) -> Tuple[pa.Array, np.ndarray]:
+    """
+    Optional email, normalized as EmailStr does. Each distinct address is
+    checked once, through the email cache; rejected ones, and any with
+    whitespace to strip, are left to the model.
+    """
+    if not _is_text(arr):
+        return arr, np.zeros(len(arr), dtype=bool)
+    arr = arr.cast(pa.string())
+    distinct = pc.unique(arr)
+    normalized, ok = zip(*map(_normalized_email, distinct.to_pylist())) if len(distinct) else ((), ())
+    at = pc.index_in(arr, value_set=distinct).to_numpy(zero_copy_only=False)
+    return pa.array(normalized, type=pa.string()).take(at), np.array(ok, dtype=bool)[at]
+
+
+def _normalized_email(value: Optional[str]) -> Tuple[Optional[str], bool]:
+    if value is None:
+        return None, True
+    if value != value.strip():
+        return None, False
+    try:
+        return normalize_email(value), True
+    except PydanticCustomError:
+        return None, False
+
+
+def choice(allowed: FrozenSet[str], required: bool = False) -> Rule:
+    """strip().lower() into `allowed`; otherwise an error (required) or None."""
+    def rule(arr: pa.Array) -> Tuple[pa.Array, np.ndarray]:
+        if not _is_text(arr):
+            return arr, np.zeros(len(arr), dtype=bool)
+        text, certain = _text(arr)
+        lower = pc.ascii_lower(text)
+        member = _is_in(lower, allowed)
+        cleaned = pc.if_else(member, lower, None)
+        if required:
+            return cleaned, certain & member
+        return cleaned, _mask(pc.is_null(arr)) | certain
+
+    return rule
+
+
+def optional_text(null_words: FrozenSet[str]) -> Rule:
+    """Optional str, stripped; None when it lowercases into `null_words`."""
+    def rule(arr: pa.Array) -> Tuple[pa.Array, np.ndarray]:
+        if not _is_text(arr):
+            return arr, np.zeros(len(arr), dtype=bool)
+        text, certain = _text(arr)
+        bad = _is_in(pc.ascii_lower(text), null_words)
+        return pc.if_else(bad, None, text), _mask(pc.is_null(arr)) | certain
+
+    return rule
+
+
+def required_text(min_length: int) -> Rule:
+    """Required str, stripped, at least `min_length` characters."""
+    def rule(arr: pa.Array) -> Tuple[pa.Array, np.ndarray]:
+        if not _is_text(arr):
+            return arr, np.zeros(len(arr), dtype=bool)
+        text, certain = _text(arr)
+        return text, certain & _mask(pc.greater_equal(pc.utf8_length(text), min_length))
+
+    return rule
+
+
+def flag(true_words: FrozenSet[str]) -> Rule:
+    """bool kept; text True when it lowercases into `true_words`; None and anything else False."""
+    def rule(arr: pa.Array) -> Tuple[pa.Array, np.ndarray]:
+        if pa.types.is_boolean(arr.type):
+            return pc.fill_null(arr, False), np.ones(len(arr), dtype=bool)
+        if not _is_text(arr):
+            return arr, np.zeros(len(arr), dtype=bool)
+        text, certain = _text(arr)
+        return pa.array(_is_in(pc.ascii_lower(text), true_words)), _mask(pc.is_null(arr)) | certain
+
+    return rule
+
+
+# -----------------------------
+# Schema rules
+# -----------------------------
+
+# One rule per field, mirroring the field validators of each schema class.
+RULES: Dict[Type[BaseModel], Dict[str, Rule]] = {
+    Customer: {
+        "customer_id": identifier,
+        "first_name": name,
+        "last_name": name,
+        "email": email,
+        "country": optional_text(frozenset({"", "unknown", "n/a", "null", "none", "--"})),
+        "signup_date": calendar_date,
+    },
+    Order: {
+        "order_id": identifier,
+        "customer_id": identifier,
+        "order_date": timestamp,
+        "status": choice(frozenset({"new", "processing", "shipped", "cancelled", "returned"}), required=True),
+        "total_amount": number(0),
+        "shipping_cost": number(0, low_inclusive=True),
+        "shipping_country": optional_text(frozenset({"", "unknown", "null", "none", "--"})),
+        "campaign": optional_text(frozenset({""})),
+    },
+    OrderItem: {
+        "order_item_id": identifier,
+        "order_id": identifier,
+        "product_id": identifier,
+        "quantity": whole_number(1),
+        "unit_price": number(0),
+        "line_total": number(0, high=10_000, null_words=frozenset({"nan", "inf", "-inf"})),
+    },
+    Payment: {
+        "payment_id": identifier,
+        "order_id": identifier,
+        "amount": number(0, null_words=frozenset({"free", "nan", "", "null"})),
+        "payment_method": choice(frozenset({"card", "paypal", "bank", "apple_pay"})),
+        "paid_at": timestamp,
+    },
+    Product: {
+        "product_id": identifier,
+        "name": required_text(2),
+        "category": required_text(2),
+        "price": number(0),
+        "stock_count": whole_number(0),
+        "created_at": timestamp,
+        "is_active": flag(frozenset({"true", "1", "yes"})),
+    },
+}
+
+
+def _column(values: Sequence[Any]) -> Optional[pa.Array]:
+    """Python values → Arrow array, or None when they don't share one type."""
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+        return None
+
+
+def _field_values(raw_records: List[Dict[str, Any]], fields: List[str]) -> Tuple[List[Sequence[Any]], np.ndarray]:
+    """The records transposed to one value list per field, plus the records that have every field."""
+    try:
+        return list(zip(*map(itemgetter(*fields), raw_records))), np.ones(len(raw_records), dtype=bool)
+    except KeyError:
+        # a missing key is a "Field required" error even for Optional fields
+        complete = np.fromiter((row.keys() >= set(fields) for row in raw_records), dtype=bool, count=len(raw_records))
+        return [[row.get(name) for row in raw_records] for name in fields], complete
+
+
+def check_columnar_options(workers: int = 1, chunk_size: Optional[int] = None) -> None:
+    """Reject the process-pool options, for configs to fail when they are built rather than mid-run."""
+    if workers > 1 or chunk_size is not None:
+        raise ValueError("The columnar engine validates whole columns in one process; drop workers and chunk_size")
+
+
+def validate_columnar(
+    raw_records: List[Dict[str, Any]],
+    schema: Type[BaseModel],
+    profile: Optional[ValidatorProfile] = None,
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Validate records column by column.
+    Returns: (cleaned rows as model_dump(mode="json") dicts, invalid_details)
+
+    Both lists are identical to validating every record with validate_records
+    and dumping the valid models. Rows the column rules can't vouch for are
+    validated by the model; schemas without rules go through it entirely.
+    A `profile` times the model's validators for those rows only.
+
+    Whole columns are validated in this process: `workers` and `chunk_size`
+    are taken only to reject them instead of ignoring them.
+    """
+    check_columnar_options(workers, chunk_size)
+    rules = RULES.get(schema)
+    fields = list(schema.model_fields)
+    n = len(raw_records)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * n
+    sure = np.zeros(n, dtype=bool)
+    if rules and n:
+        values, sure = _field_values(raw_records, fields)
+        columns = []
+        for name, column in zip(fields, values):
+            arr = _column(column)
+            if arr is None:
+                sure[:] = False
+                break
+            cleaned, ok = rules[name](arr)
+            sure &= ok
+            columns.append(cleaned.to_pylist())
+        else:
+            results = [
+                dict(zip(fields, row)) if ok else None
+                for row, ok in zip(zip(*columns), sure.tolist())
+            ]
+
+    rest = np.flatnonzero(~sure).tolist()
+    logger.debug(f"{schema.__name__}: {len(rest):,} of {n:,} rows fell back to the model")
+    valid_rows, invalid = validate_records([raw_records[i] for i in rest], schema, output="json", profile=profile)
+    valid_iter = iter(valid_rows)
+    failed = {row["row_index"] for row in invalid}
+    for pos, i in enumerate(rest):
+        if pos not in failed:
+            results[i] = next(valid_iter)
+    for row in invalid:
+        row["row_index"] = rest[row["row_index"]]
+
+    return [row for row in results if row is not None], invalid
@@ -0,0 +1,155 @@
+"""
+Primary-key dedup across daily partitions.
+
+A re-sent order_id, order_item_id or payment_id would otherwise be loaded
+again on a later day and double-counted by the marts. KeyIndex keeps every
+key loaded so far, with its day, in an on-disk SQLite table; ingestion
+moves rows whose key is already there (or earlier in the same file) to the
+quarantine with a "duplicate_key" error. The first row loaded wins.
+
+Lookups are batched primary-key probes on a WITHOUT ROWID B-tree, so memory
+is SQLite's page cache whatever the history size. compact() drops keys older
+than a retention window; a key re-sent after that is no longer caught. The
+pages it frees are reused by the next days' keys, and only handed back to
+the filesystem once they are a sizeable share of the file.
+
+Re-running a day is idempotent: the first check of (entity, day) forgets the
+keys an earlier run of that day recorded.
+"""
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from batch_data_pipeline.validation.helpers import field_getter, move_to_invalid
+
+# entity → key that must be unique across days
+DEDUP_KEYS: Dict[str, str] = {"orders": "order_id", "order_items": "order_item_id", "payments": "payment_id"}
+DUPLICATE_KEY = "duplicate_key"
+DEFAULT_RETENTION_DAYS = 730
+
+# below SQLite's bound-parameter limit, with room for the entity
+_LOOKUP_BATCH = 900
+# share of free pages in the file before compact() gives them back
+_RECLAIM_FREE_SHARE = 0.25
+
+
+class KeyIndex:
+    """
+    Keys already loaded per entity, in `path` (in memory when None).
+
+    split_duplicates() quarantines repeated keys and records the new ones in
+    the same transaction.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path) if self.path is not None else ":memory:")
+        # takes effect on a new file; an older one switches on its next VACUUM
+        self._db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS keys ("
+            " entity TEXT NOT NULL, key TEXT NOT NULL, day TEXT NOT NULL,"
+            " PRIMARY KEY (entity, key)) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS keys_by_day ON keys (entity, day)")
+        self._db.commit()
+        self._started: Set[Tuple[str, str]] = set()
+
+    def __enter__(self) -> "KeyIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def count(self, entity: str) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM keys WHERE entity = ?", (entity,)).fetchone()[0]
+
+    def loaded_on(self, entity: str, keys: Iterable[str]) -> Dict[str, str]:
+        """Day each of `keys` was first loaded, for the ones in the index."""
+        keys = list(keys)
+        found: Dict[str, str] = {}
+        for i in range(0, len(keys), _LOOKUP_BATCH):
+            batch = keys[i:i + _LOOKUP_BATCH]
+            found.update(self._db.execute(
+                f"SELECT key, day FROM keys WHERE entity = ? AND key IN ({','.join('?' * len(batch))})",
+                (entity, *batch),
+            ))
+        return found
+
+    def split_duplicates(
+        self,
+        entity: str,
+        raw_rows: Sequence[Dict[str, Any]],
+        cleaned: List[Any],
+        invalid: List[Dict[str, Any]],
+        run_dt: date,
+        start: int = 0,
+        fieldnames: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Any], List[Dict[str, Any]]]:
+        """
+        Move cleaned rows whose key was loaded before to `invalid`, and record the rest.
+
+        `cleaned` and `invalid` are validate_records' output for `raw_rows`,
+        whose first row has row_index `start` (see move_to_invalid).
+        """
+        field = DEDUP_KEYS.get(entity)
+        if field is None:
+            return cleaned, invalid
+        day = run_dt.isoformat()
+        self._start_day(entity, day)
+
+        keys = list(map(field_getter(field, fieldnames), cleaned))
+        loaded = self.loaded_on(entity, keys)
+        errors: Dict[int, List[Dict[str, Any]]] = {}
+        new: Dict[str, None] = {}
+        for i, key in enumerate(keys):
+            if key in loaded or key in new:
+                where = "earlier in this file" if loaded.get(key, day) == day else f"on {loaded[key]}"
+                errors[i] = [{
+                    "field": field,
+                    "error": f"{DUPLICATE_KEY}: {field} '{key}' already loaded {where}",
+                    "input": key,
+                }]
+            else:
+                new[key] = None
+
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO keys (entity, key, day) VALUES (?, ?, ?)", ((entity, key, day) for key in new)
+            )
+        return move_to_invalid(raw_rows, cleaned, invalid, errors, start)
+
+    def compact(self, today: date, retention_days: int = DEFAULT_RETENTION_DAYS) -> int:
+        """Drop keys loaded more than `retention_days` before `today`; returns how many."""
+        cutoff = (today - timedelta(days=retention_days)).isoformat()
+        with self._db:
+            deleted = self._db.execute("DELETE FROM keys WHERE day < ?", (cutoff,)).rowcount
+        if deleted:
+            self._reclaim()
+        return deleted
+
+    def _reclaim(self) -> None:
+        """Truncate free pages off the file once they are _RECLAIM_FREE_SHARE of it."""
+        pages = self._db.execute("PRAGMA page_count").fetchone()[0]
+        free = self._db.execute("PRAGMA freelist_count").fetchone()[0]
+        if free < pages * _RECLAIM_FREE_SHARE:
+            return
+        if self._db.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:  # incremental
+            self._db.execute("PRAGMA incremental_vacuum").fetchall()
+        else:
+            # index created without incremental auto-vacuum: rebuild once, which also turns it on
+            self._db.execute("VACUUM")
+
+    def _start_day(self, entity: str, day: str) -> None:
+        if (entity, day) not in self._started:
+            with self._db:
+                self._db.execute("DELETE FROM keys WHERE entity = ? AND day = ?", (entity, day))
+            self._started.add((entity, day))
@@ -0,0 +1,145 @@
+"""
+Memoized email validation for `Customer.email`.
+
+`EmailStr` runs email-validator on every row, and most of that time goes into
+the IDNA checks of the domain. Customers re-appear across days and their
+addresses share a handful of domains, so results are cached at two levels:
+
+- emails: raw string -> normalized address (or the rejection reason)
+- domains: domain -> normalized domain (or the rejection reason)
+
+Every check goes through pydantic's own `validate_email`, which is
+email-validator's public `validate_email(..., check_deliverability=False)`
+behind the display-name and length handling of `EmailStr`. For a plain ASCII
+`local@domain`, the two halves are checked apart: the domain once per domain,
+on a one-letter local part, and the local part on a short fixed domain. When
+both pass and the joined address is within the length limit, that is the
+normalized address. Anything else — a rejected half, display names, unicode,
+domain literals — is validated whole, so the normalized value and the error
+reported match `EmailStr`.
+
+Both caches are bounded LRUs, live per process and are shared by every
+`validate_records` call in it.
+"""
+from collections import OrderedDict
+from typing import Annotated, Any, Callable, Dict, Hashable, Tuple
+
+from pydantic import AfterValidator, WithJsonSchema
+from pydantic.networks import validate_email
+from pydantic_core import PydanticCustomError
+
+EMAIL_CACHE_SIZE = 100_000
+DOMAIN_CACHE_SIZE = 10_000
+# email-validator's limit on the whole address
+MAX_ADDRESS_LENGTH = 254
+# the fixed halves the other half is checked against
+_PROBE_LOCAL = "a"
+_PROBE_DOMAIN = "a.co"
+
+_ERROR = "value is not a valid email address: {reason}"
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with hit/miss counters."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[Hashable], Any]) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            value = self._data[key] = compute(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return value
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+_emails = LRUCache(EMAIL_CACHE_SIZE)
+_domains = LRUCache(DOMAIN_CACHE_SIZE)
+
+
+# (ok, normalized address or rejection reason)
+def _check_email(value: str) -> Tuple[bool, str]:
+    if _is_plain(value):
+        local, _, domain = value.partition("@")
+        domain_ok, normalized_domain = _domains.get_or_compute(domain, _check_domain)
+        if domain_ok:
+            local_ok, probed = _check_address(f"{local}@{_PROBE_DOMAIN}")
+            address = f"{probed.rpartition('@')[0]}@{normalized_domain}"
+            if local_ok and len(address) <= MAX_ADDRESS_LENGTH:
+                return True, address
+    # a rejection is reported for the whole address, as EmailStr reports it
+    return _check_address(value)
+
+
+def _is_plain(value: str) -> bool:
+    """ASCII `local@domain`: no display name, surrounding space, line breaks or domain literal."""
+    local, at, domain = value.partition("@")
+    return (
+        value.isascii()
+        and bool(at and local and domain)
+        and "@" not in domain
+        and value == value.strip()
+        and not any(c in value for c in "<>\r\n")
+        and not domain.startswith("[")
+    )
+
+
+def _check_domain(domain: str) -> Tuple[bool, str]:
+    ok, result = _check_address(f"{_PROBE_LOCAL}@{domain}")
+    return ok, result.rpartition("@")[2] if ok else result
+
+
+def _check_address(value: str) -> Tuple[bool, str]:
+    try:
+        return True, validate_email(value)[1]
+    except PydanticCustomError as e:
+        return False, e.context["reason"]
+
+
+def normalize_email(value: str) -> str:
+    """`EmailStr` validation of `value`, memoized on the raw string."""
+    ok, result = _emails.get_or_compute(value, _check_email)
+    if not ok:
+        raise PydanticCustomError("value_error", _ERROR, {"reason": result})
+    return result
+
+
+def email_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss counters and sizes of the email and domain caches in this process."""
+    return {"emails": _emails.stats(), "domains": _domains.stats()}
+
+
+def clear_email_cache() -> None:
+    _emails.clear()
+    _domains.clear()
+
+
+# drop-in for pydantic's EmailStr
+CachedEmailStr = Annotated[
+    str,
+    AfterValidator(normalize_email),
+    WithJsonSchema({"type": "string", "format": "email"}),
+]
@@ -0,0 +1,72 @@
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+# rows sent to a worker per task; large enough that pickling stays small next to validation
+DEFAULT_TASK_SIZE = 20_000
+# below this many rows, starting a pool (spawned interpreters importing pydantic) costs more than it saves
+PARALLEL_MIN_ROWS = 50_000
+
+
+def validation_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    A pool for validate_records_parallel to share across calls, e.g. every
+    entity of a run; the caller shuts it down.
+    """
+    # spawn, not fork: Dagster and the GCS client may already run threads in this process
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _validate_chunk(task: Tuple[Type[BaseModel], str, int, List[Dict[str, Any]]]) -> Tuple[List[Any], List[Dict[str, Any]]]:
+    # validators are built once per worker and schema (helpers._validators is cached)
+    from batch_data_pipeline.validation.helpers import validate_records
+
+    schema, output, start, rows = task
+    valid, invalid = validate_records(rows, schema, output=output)
+    for row in invalid:
+        row["row_index"] += start
+    return valid, invalid
+
+
+def validate_records_parallel(
+    raw_records: List[Dict[str, Any]],
+    schema: Type[BaseModel],
+    workers: int,
+    chunk_size: int = DEFAULT_TASK_SIZE,
+    output: str = "model",
+    pool: Optional[Executor] = None,
+) -> Tuple[List[Any], List[Dict[str, Any]]]:
+    """
+    validate_records spread over `workers` processes, `chunk_size` rows per task.
+
+    Results are merged in task order and row_index is shifted back to the
+    position in raw_records, so the output matches the single-process call.
+
+    Tasks go to `pool` when given (see validation_pool); otherwise a pool is
+    started for this call, unless there are fewer than PARALLEL_MIN_ROWS
+    records. A single task is validated in this process either way.
+    """
+    from batch_data_pipeline.validation.helpers import validate_records
+
+    tasks = [
+        (schema, output, start, raw_records[start:start + chunk_size])
+        for start in range(0, len(raw_records), chunk_size)
+    ]
+    if len(tasks) < 2 or (pool is None and len(raw_records) < PARALLEL_MIN_ROWS):
+        return validate_records(raw_records, schema, output=output)
+
+    if pool is None:
+        with validation_pool(min(workers, len(tasks))) as own_pool:
+            return _merge(own_pool.map(_validate_chunk, tasks))
+    return _merge(pool.map(_validate_chunk, tasks))
+
+
+def _merge(results) -> Tuple[List[Any], List[Dict[str, Any]]]:
+    valid: List[Any] = []
+    invalid: List[Dict[str, Any]] = []
+    for chunk_valid, chunk_invalid in results:
+        valid.extend(chunk_valid)
+        invalid.extend(chunk_invalid)
+    return valid, invalid
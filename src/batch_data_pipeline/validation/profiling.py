@@ -0,0 +1,159 @@
+"""
+Per-validator profiling of the entity schemas.
+
+ValidatorProfile.instrument(schema) builds a subclass of `schema` whose
+field validators are timed: every @field_validator of the class (e.g.
+Customer.validate_name, Order.clean_total_amount), plus one wrap validator
+per field around everything else pydantic-core does for it. The rest of a
+field's time is reported as its "(type)" step: the coercion and
+constraints of the annotation, e.g. EmailStr, datetime parsing or
+Field(min_length=1). The timers' own overhead, a few hundred ns per call,
+mostly lands there too: compare fields against each other rather than
+reading "(type)" as an absolute cost.
+
+Only the instrumented class pays for the timers; validate_records uses it
+when given a profile, so normal runs are unchanged.
+"""
+import inspect
+import time
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+from pydantic import BaseModel, ValidationError, create_model, field_validator
+
+FIELD = "(field)"
+TYPE = "(type)"
+
+# [calls, nanoseconds, failures]
+_Stat = List[int]
+
+
+class ValidatorProfile:
+    """Call counts, time and failures per (schema, field, validator)."""
+
+    def __init__(self):
+        self.stats: Dict[Tuple[str, str, str], _Stat] = {}
+        self._instrumented: Dict[Type[BaseModel], Type[BaseModel]] = {}
+
+    def instrument(self, schema: Type[BaseModel]) -> Type[BaseModel]:
+        """A subclass of `schema` that records into this profile (built once per schema)."""
+        if schema not in self._instrumented:
+            self._instrumented[schema] = self._build(schema)
+        return self._instrumented[schema]
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """One entry per schema, field and step, slowest field first."""
+        fields: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for (schema, field, step), (calls, ns, failures) in self.stats.items():
+            fields.setdefault((schema, field), []).append(_row(schema, field, step, calls, ns, failures))
+
+        out = []
+        for steps in fields.values():
+            total = next((s for s in steps if s["step"] == FIELD), None)
+            if total is not None:
+                # what's left after the Python validators is pydantic-core's own work
+                validators = [s for s in steps if s["step"] != FIELD]
+                ns = total["_ns"] - sum(s["_ns"] for s in validators)
+                failures = total["failures"] - sum(s["failures"] for s in validators)
+                steps.append(_row(total["schema"], total["field"], TYPE, total["calls"], max(ns, 0), max(failures, 0)))
+            steps.sort(key=lambda s: (s["step"] != FIELD, -s["_ns"]))
+            out.append(steps)
+        out.sort(key=lambda steps: -steps[0]["_ns"])
+        return [{k: v for k, v in s.items() if k != "_ns"} for steps in out for s in steps]
+
+    def format_table(self) -> str:
+        return format_profile_table(self.rows())
+
+    def _record(self, key: Tuple[str, str, str], ns: int, failed: bool) -> None:
+        stat = self.stats.get(key)
+        if stat is None:
+            stat = self.stats[key] = [0, 0, 0]
+        stat[0] += 1
+        stat[1] += ns
+        stat[2] += failed
+
+    def _build(self, schema: Type[BaseModel]) -> Type[BaseModel]:
+        name = schema.__name__
+        validators: Dict[str, Any] = {}
+
+        # same names as the originals, so they take their place (and order)
+        for attr, decorator in schema.__pydantic_decorators__.field_validators.items():
+            info = decorator.info
+            timed = self._timed_validator(name, attr, decorator.func, info.mode)
+            validators[attr] = field_validator(*info.fields, mode=info.mode, check_fields=info.check_fields)(timed)
+
+        # defined last, so each wraps everything else for its field
+        for field in schema.model_fields:
+            validators[f"_profile_{field}"] = field_validator(field, mode="wrap")(self._timed_field(name, field))
+
+        return create_model(name, __base__=schema, __module__=schema.__module__, __validators__=validators)
+
+    def _timed_validator(self, schema: str, attr: str, func: Callable, mode: str) -> Callable:
+        record = self._record
+        takes_info = len(inspect.signature(func).parameters) > (2 if mode == "wrap" else 1)
+
+        if mode == "wrap":
+            def timed(cls, v, handler, info):
+                start = time.perf_counter_ns()
+                try:
+                    out = func(v, handler, info) if takes_info else func(v, handler)
+                except Exception:
+                    record((schema, info.field_name, attr), time.perf_counter_ns() - start, True)
+                    raise
+                record((schema, info.field_name, attr), time.perf_counter_ns() - start, False)
+                return out
+        else:
+            def timed(cls, v, info):
+                start = time.perf_counter_ns()
+                try:
+                    out = func(v, info) if takes_info else func(v)
+                except Exception:
+                    record((schema, info.field_name, attr), time.perf_counter_ns() - start, True)
+                    raise
+                record((schema, info.field_name, attr), time.perf_counter_ns() - start, False)
+                return out
+
+        timed.__name__ = attr
+        return timed
+
+    def _timed_field(self, schema: str, field: str) -> Callable:
+        record = self._record
+        key = (schema, field, FIELD)
+
+        def timed(cls, v, handler):
+            start = time.perf_counter_ns()
+            try:
+                out = handler(v)
+            except ValidationError:
+                record(key, time.perf_counter_ns() - start, True)
+                raise
+            record(key, time.perf_counter_ns() - start, False)
+            return out
+
+        return timed
+
+
+def format_profile_table(rows: List[Dict[str, Any]]) -> str:
+    """ValidatorProfile.rows() (e.g. an ingest summary's "validator_profile") as a text table."""
+    width = max([len("schema")] + [len(r["schema"]) for r in rows])
+    header = f"{'schema':<{width}} {'field':<18} {'step':<24} {'calls':>9} {'total ms':>10} {'µs/call':>9} {'failed':>7}"
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        lines.append(
+            f"{r['schema']:<{width}} {r['field']:<18} {r['step']:<24} {r['calls']:>9,} "
+            f"{r['total_ms']:>10.1f} {r['mean_us']:>9.2f} {r['failure_rate']:>7.1%}"
+        )
+    return "\n".join(lines)
+
+
+def _row(schema: str, field: str, step: str, calls: int, ns: int, failures: int) -> Dict[str, Any]:
+    return {
+        "schema": schema,
+        "field": field,
+        "step": step,
+        "calls": calls,
+        "total_ms": round(ns / 1e6, 3),
+        "mean_us": round(ns / calls / 1e3, 3) if calls else 0.0,
+        "failures": failures,
+        "failure_rate": round(failures / calls, 4) if calls else 0.0,
+        "_ns": ns,
+    }
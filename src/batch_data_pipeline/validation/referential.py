@@ -0,0 +1,220 @@
+"""
+Referential-integrity checks at ingestion.
+
+The generator points ~5% of orders at unknown customers, and order items and
+payments at unknown orders/products. Without a check those rows are loaded
+and only vanish in the dbt inner joins. ReferenceIndex keeps the keys of
+every parent row that passed validation and moves child rows whose FK isn't
+among them to the quarantine, with an "fk_violation" error.
+
+Keys are held in two tiers per entity:
+- this run: an exact set of the keys ingested so far
+- earlier runs: a scalable Bloom filter, persisted under `root`
+
+The Bloom filter costs under 2 bytes per key at a 1% false-positive rate,
+against 16 bytes packed or ~90 as a Python str, so years of history stay in
+a few MB. A false positive lets an orphan through; a row whose parent exists
+is never quarantined.
+"""
+import hashlib
+import io
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from batch_data_pipeline.validation.helpers import field_getter, move_to_invalid
+
+# child entity → [(FK field, parent entity)]; parents are ingested first
+FOREIGN_KEYS: Dict[str, List[Tuple[str, str]]] = {
+    "orders": [("customer_id", "customers")],
+    "order_items": [("order_id", "orders"), ("product_id", "products")],
+    "payments": [("order_id", "orders")],
+}
+PRIMARY_KEYS: Dict[str, str] = {"customers": "customer_id", "products": "product_id", "orders": "order_id"}
+FK_VIOLATION = "fk_violation"
+
+
+def key_hashes(keys: Iterable[str]) -> np.ndarray:
+    """128-bit hash of each key as an (n, 2) uint64 array."""
+    digests = b"".join(hashlib.blake2b(key.encode(), digest_size=16).digest() for key in keys)
+    return np.frombuffer(digests, dtype=np.uint64).reshape(-1, 2)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over key_hashes(), `k` positions by double hashing."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.m = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self.bits = np.zeros((self.m + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def add(self, hashes: np.ndarray) -> None:
+        positions = self._positions(hashes).ravel()
+        np.bitwise_or.at(self.bits, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+        self.count += len(hashes)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        positions = self._positions(hashes)
+        return ((self.bits[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1).all(axis=1)
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        i = np.arange(self.k, dtype=np.uint64)
+        # uint64 wrap-around is part of the hash
+        with np.errstate(over="ignore"):
+            return (hashes[:, :1] + i * (hashes[:, 1:] | np.uint64(1))) % np.uint64(self.m)
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filters chained as they fill: each new layer has twice the capacity
+    and half the error rate of the last (the first gets error_rate / 2), so
+    the overall false-positive rate stays under error_rate however many keys
+    arrive.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01):
+        self.layers = [BloomFilter(capacity, error_rate / 2)]
+
+    def __len__(self) -> int:
+        return sum(layer.count for layer in self.layers)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(layer.bits.nbytes for layer in self.layers)
+
+    def add(self, hashes: np.ndarray) -> None:
+        while len(hashes):
+            layer = self.layers[-1]
+            room = layer.capacity - layer.count
+            if room <= 0:
+                self.layers.append(BloomFilter(layer.capacity * 2, layer.error_rate / 2))
+                continue
+            layer.add(hashes[:room])
+            hashes = hashes[room:]
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        for layer in self.layers:
+            if layer.count and not found.all():
+                rest = ~found
+                found[rest] = layer.contains(hashes[rest])
+        return found
+
+    def save(self, path: Path) -> None:
+        meta = [[layer.capacity, layer.error_rate, layer.count] for layer in self.layers]
+        buffer = io.BytesIO()
+        np.savez(buffer, *[layer.bits for layer in self.layers], meta=np.array(json.dumps(meta)))
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(buffer.getvalue())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "ScalableBloomFilter":
+        with np.load(path) as data:
+            bloom = cls.__new__(cls)
+            bloom.layers = []
+            for i, (capacity, error_rate, count) in enumerate(json.loads(str(data["meta"]))):
+                layer = BloomFilter(capacity, error_rate)
+                layer.bits[:] = data[f"arr_{i}"]
+                layer.count = count
+                bloom.layers.append(layer)
+        return bloom
+
+
+class ReferenceIndex:
+    """
+    Keys of the parent entities, for FK checks during ingestion.
+
+    register() adds the keys of validated parent rows; split_orphans() moves
+    child rows with an unknown FK to the invalid list. commit() folds this
+    run's keys into the persisted history; without a `root` the index lives
+    in memory only.
+    """
+
+    def __init__(self, root=None, capacity: int = 1_000_000, error_rate: float = 0.01):
+        self.root = Path(root) if root is not None else None
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._today: Dict[str, Set[str]] = {}
+        self._history: Dict[str, ScalableBloomFilter] = {}
+        if self.root is not None:
+            self.root.mkdir(parents=True, exist_ok=True)
+
+    def history(self, entity: str) -> ScalableBloomFilter:
+        """The Bloom filter of `entity` keys from earlier runs (loaded on first use)."""
+        if entity not in self._history:
+            path = self._path(entity)
+            if path is not None and path.exists():
+                self._history[entity] = ScalableBloomFilter.load(path)
+            else:
+                self._history[entity] = ScalableBloomFilter(self.capacity, self.error_rate)
+        return self._history[entity]
+
+    def seed(self, entity: str, keys: Iterable[str]) -> None:
+        """Add keys from earlier days straight to the history."""
+        self.history(entity).add(key_hashes(keys))
+
+    def contains(self, entity: str, keys: Sequence[str]) -> np.ndarray:
+        today = self._today.get(entity, set())
+        found = np.fromiter((key in today for key in keys), dtype=bool, count=len(keys))
+        history = self.history(entity)
+        rest = np.flatnonzero(~found)
+        if len(history) and len(rest):
+            found[rest] = history.contains(key_hashes(keys[i] for i in rest.tolist()))
+        return found
+
+    def register(self, entity: str, rows: Sequence[Any], fieldnames: Optional[Sequence[str]] = None) -> None:
+        """Record the keys of validated `entity` rows (dicts, or tuples in `fieldnames` order)."""
+        if entity in PRIMARY_KEYS and rows:
+            self._today.setdefault(entity, set()).update(map(field_getter(PRIMARY_KEYS[entity], fieldnames), rows))
+
+    def split_orphans(
+        self,
+        entity: str,
+        raw_rows: Sequence[Dict[str, Any]],
+        cleaned: List[Any],
+        invalid: List[Dict[str, Any]],
+        start: int = 0,
+        fieldnames: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Any], List[Dict[str, Any]]]:
+        """
+        Move cleaned rows whose FKs aren't in the index to `invalid`.
+
+        `cleaned` and `invalid` are validate_records' output for `raw_rows`,
+        whose first row has row_index `start`. Orphans get an fk_violation
+        error per missing key (see move_to_invalid).
+        """
+        foreign_keys = FOREIGN_KEYS.get(entity)
+        if not foreign_keys or not cleaned:
+            return cleaned, invalid
+
+        errors: Dict[int, List[Dict[str, Any]]] = {}
+        for field, parent in foreign_keys:
+            values = list(map(field_getter(field, fieldnames), cleaned))
+            for i in np.flatnonzero(~self.contains(parent, values)).tolist():
+                errors.setdefault(i, []).append({
+                    "field": field,
+                    "error": f"{FK_VIOLATION}: no {parent} row with {field} '{values[i]}'",
+                    "input": values[i],
+                })
+        return move_to_invalid(raw_rows, cleaned, invalid, errors, start)
+
+    def commit(self) -> None:
+        """Fold this run's keys into the history and persist it under `root`."""
+        for entity, keys in self._today.items():
+            self.history(entity).add(key_hashes(keys))
+            path = self._path(entity)
+            if path is not None:
+                self._history[entity].save(path)
+        self._today.clear()
+
+    def _path(self, entity: str) -> Optional[Path]:
+        return self.root / f"{entity}.bloom.npz" if self.root is not None else None
+
@@ -0,0 +1,174 @@
+"""
+Compiled variants of the entity schemas.
+
+The schema classes clean fields in `mode="before"` Python validators, so
+pydantic-core calls back into Python for those fields on every row. The
+variants below keep the common case inside pydantic-core: native float /
+datetime parsing with range constraints, and regex patterns for the enum
+and text fields.
+
+Every such field is a left-to-right union: the native member first, the
+original cleaner second. The native member only accepts values on which it
+provably agrees with the cleaner (e.g. a float > 0, a status that is already
+lowercase), and everything else — dirty values, None, the odd whitespace —
+goes to the original cleaner. Cleaned output and the set of rejected rows
+are therefore the same as with the original class. A union's own errors
+list each member, so rejected rows are validated again with the original
+class (its `error_schema`) for their error details; quarantine entries
+read the same with either.
+
+Fields whose CSV text pydantic-core can't clean the same way (digit-only
+ints, the is_active words, the country null words) keep their cleaner as a
+plain BeforeValidator; a union there would only add a failed native attempt
+per row.
+"""
+import re
+from datetime import date, datetime
+from typing import Annotated, Any, Callable, ClassVar, Dict, Optional, Type, Union
+
+from pydantic import AfterValidator, BaseModel, BeforeValidator, Field, PlainValidator, StringConstraints, TypeAdapter
+
+from batch_data_pipeline.validation.email_cache import CachedEmailStr
+from batch_data_pipeline.validation.schema.customer import Customer
+from batch_data_pipeline.validation.schema.order import Order
+from batch_data_pipeline.validation.schema.order_item import OrderItem
+from batch_data_pipeline.validation.schema.payment import Payment
+from batch_data_pipeline.validation.schema.product import Product
+
+# str.strip() also removes \x1c-\x1f, pydantic-core's strip_whitespace doesn't;
+# native text must not start or end with them
+_NO_PY_ONLY_SPACE = r"(?s)^(?:[^\x1c-\x1f](?:.*[^\x1c-\x1f])?)?$"
+
+
+def _either(native: Any, cleaner: Callable[[Any], Any], target: Any) -> Any:
+    """`native` when it validates, else `cleaner`'s output validated as `target`."""
+    adapter = TypeAdapter(target)
+
+    def fallback(v: Any) -> Any:
+        return adapter.validate_python(cleaner(v))
+
+    return Annotated[
+        Union[native, Annotated[Any, PlainValidator(fallback)]],
+        Field(union_mode="left_to_right"),
+    ]
+
+
+def _stripped(v: Any) -> Any:
+    return v.strip() if isinstance(v, str) else v
+
+
+def _choice(*values: str) -> Any:
+    return Annotated[str, StringConstraints(pattern=rf"^(?:{'|'.join(map(re.escape, values))})$")]
+
+
+def _text(min_length: int) -> Any:
+    return Annotated[str, StringConstraints(min_length=min_length, pattern=_NO_PY_ONLY_SPACE)]
+
+
+Timestamp = _either(datetime, _stripped, datetime)
+
+
+# -----------------------------
+# Variants
+# -----------------------------
+
+class CompiledCustomer(BaseModel):
+    error_schema: ClassVar[Type[BaseModel]] = Customer
+
+    customer_id: str = Field(..., min_length=1)
+
+    # "John", "Mary-Kate", "O'Connor": already what validate_name's .title() returns
+    first_name: _either(Annotated[str, StringConstraints(pattern=r"^[A-Z][a-z]+(?:[ '-][A-Z][a-z]+)*$")],
+                        Customer.validate_name, str)
+    last_name: _either(Annotated[str, StringConstraints(pattern=r"^[A-Z][a-z]+(?:[ '-][A-Z][a-z]+)*$")],
+                       Customer.validate_name, str)
+
+    email: Optional[Annotated[CachedEmailStr, AfterValidator(Customer.validate_email)]]
+    country: Optional[Annotated[Any, PlainValidator(Customer.validate_country)]]
+    signup_date: _either(date, _stripped, date)
+
+    model_config = {
+        "str_strip_whitespace": True,
+        "validate_assignment": True,
+    }
+
+
+class CompiledProduct(BaseModel):
+    error_schema: ClassVar[Type[BaseModel]] = Product
+
+    product_id: str = Field(..., min_length=1)
+
+    name: _either(_text(2), Product.validate_name, str)
+    category: _either(_text(2), Product.validate_category, str)
+
+    price: Optional[_either(Annotated[float, Field(gt=0)], Product.clean_price, Optional[float])]
+    stock_count: Annotated[Optional[int], BeforeValidator(Product.clean_stock_count)]
+    created_at: Timestamp
+    is_active: Annotated[bool, BeforeValidator(Product.clean_is_active)]
+
+    model_config = {
+        "str_strip_whitespace": True,
+        "validate_assignment": True,
+    }
+
+
+class CompiledOrder(BaseModel):
+    error_schema: ClassVar[Type[BaseModel]] = Order
+
+    order_id: str = Field(..., min_length=1)
+    customer_id: str = Field(..., min_length=1)
+
+    order_date: Timestamp
+    status: _either(_choice("new", "processing", "shipped", "cancelled", "returned"), Order.clean_status, str)
+    total_amount: Optional[_either(Annotated[float, Field(gt=0)], Order.clean_total_amount, Optional[float])]
+    shipping_cost: Optional[_either(Annotated[float, Field(ge=0)], Order.clean_shipping_cost, Optional[float])]
+    shipping_country: Optional[Annotated[Any, PlainValidator(Order.clean_shipping_country)]]
+    campaign: Optional[_either(_text(1), Order.clean_campaign, Optional[str])]
+
+    model_config = {
+        "str_strip_whitespace": True,
+        "validate_assignment": True,
+    }
+
+
+class CompiledOrderItem(BaseModel):
+    error_schema: ClassVar[Type[BaseModel]] = OrderItem
+
+    order_item_id: str = Field(..., min_length=1)
+    order_id: str = Field(..., min_length=1)
+    product_id: str = Field(..., min_length=1)
+
+    quantity: Annotated[Optional[int], BeforeValidator(OrderItem.clean_quantity)]
+    unit_price: Optional[_either(Annotated[float, Field(gt=0)], OrderItem.clean_unit_price, Optional[float])]
+    line_total: Optional[_either(Annotated[float, Field(gt=0, lt=10_000)], OrderItem.clean_line_total, Optional[float])]
+
+    model_config = {
+        "str_strip_whitespace": True,
+        "validate_assignment": True,
+    }
+
+
+class CompiledPayment(BaseModel):
+    error_schema: ClassVar[Type[BaseModel]] = Payment
+
+    payment_id: str = Field(..., min_length=1)
+    order_id: str = Field(..., min_length=1)
+
+    amount: Optional[_either(Annotated[float, Field(gt=0)], Payment.clean_amount, Optional[float])]
+    payment_method: Optional[_either(_choice("card", "paypal", "bank", "apple_pay"),
+                                     Payment.clean_payment_method, Optional[str])]
+    paid_at: Timestamp
+
+    model_config = {
+        "str_strip_whitespace": True,
+        "validate_assignment": True,
+    }
+
+
+COMPILED_SCHEMAS: Dict[Type[BaseModel], Type[BaseModel]] = {
+    Customer: CompiledCustomer,
+    Product: CompiledProduct,
+    Order: CompiledOrder,
+    OrderItem: CompiledOrderItem,
+    Payment: CompiledPayment,
+}
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 from datetime import date
 
+from batch_data_pipeline.validation.email_cache import CachedEmailStr
+
 
 class Customer(BaseModel):
     # Raw CSV fields come in as strings — Pydantic will cast types.
@@ -12,7 +14,8 @@ class Customer(BaseModel):
     last_name: str
 
     # Email: CSV may contain None, "", or invalid
-    email: Optional[EmailStr]
+    # (EmailStr rules, memoized: customers and domains repeat across rows)
+    email: Optional[CachedEmailStr]
 
 
     # Generator outputs full country names → allow longer strings
@@ -0,0 +1,99 @@
+"""
+Column-at-a-time parsing of the ISO timestamps the generator writes.
+
+The generator emits `date.isoformat()` / `datetime.isoformat()`:
+YYYY-MM-DD and YYYY-MM-DDTHH:MM:SS[.ffffff]. Those layouts are recognized
+with one regex pass plus a calendar check over the whole column, and
+parsed with Arrow's cast. Everything else — offsets, a space instead of
+"T", unix seconds, typos — goes to the general parser (the TypeAdapter the
+schemas use) one value at a time, and is counted as a fallback.
+"""
+from datetime import date, datetime, timezone
+from typing import Any, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pydantic import TypeAdapter, ValidationError
+
+ISO_DATE = r"^[1-9][0-9]{3}-(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])$"
+ISO_DATETIME = r"^[1-9][0-9]{3}-(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])T([01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9](\.[0-9]{1,6})?$"
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# kind → (layout, placeholder in the same layout, Arrow type, NumPy unit, general parser)
+_KINDS = {
+    "date": (ISO_DATE, "2000-01-01", pa.date32(), "D", TypeAdapter(date)),
+    "datetime": (ISO_DATETIME, "2000-01-01T00:00:00", pa.timestamp("us"), "us", TypeAdapter(datetime)),
+}
+
+
+class ParsedColumn(NamedTuple):
+    values: np.ndarray  # datetime64; NaT for None and for values the general parser rejects
+    fallback: int       # values that took the general parser
+    fast: np.ndarray    # rows parsed in bulk, in the generator's layout
+
+
+def iso_layout(text: pa.Array, kind: str = "datetime") -> Tuple[pa.Array, np.ndarray]:
+    """
+    Text column → (the text with every other row replaced by a placeholder,
+    rows in the `kind` layout on a real calendar day).
+
+    The placeholder keeps the returned column safe to slice or cast as a whole.
+    """
+    layout, placeholder = _KINDS[kind][:2]
+    matched = pc.fill_null(pc.match_substring_regex(text, layout), False).to_numpy(zero_copy_only=False)
+    parts = pc.if_else(pa.array(matched), text, placeholder)
+
+    # the regex bounds each field; day-of-month against month/leap year is checked here
+    year = pc.utf8_slice_codeunits(parts, 0, 4).cast(pa.int32()).to_numpy()
+    month = pc.utf8_slice_codeunits(parts, 5, 7).cast(pa.int32()).to_numpy()
+    day = pc.utf8_slice_codeunits(parts, 8, 10).cast(pa.int32()).to_numpy()
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    real_day = day <= _DAYS_IN_MONTH[month] + (leap & (month == 2))
+
+    ok = matched & real_day
+    return pc.if_else(pa.array(ok), parts, placeholder), ok
+
+
+def parse_timestamps(values: Union[Sequence[Any], pa.Array], kind: str = "datetime") -> ParsedColumn:
+    """
+    Parse a column of ISO strings (or date/datetime objects) into datetime64.
+
+    `kind` is "date" or "datetime"; `values` is a sequence or an Arrow
+    array. Strings in the generator's layouts are parsed in bulk; the rest
+    go through pydantic's date/datetime parsing, stripped as the schema
+    cleaners strip them. Aware datetimes from the fallback are converted
+    to UTC.
+    """
+    arrow_type, unit, adapter = _KINDS[kind][2:]
+    out = np.full(len(values), np.datetime64("NaT", unit))
+
+    fast = np.zeros(len(values), dtype=bool)
+    if isinstance(values, pa.Array):
+        column = values
+
+        # only the fallback rows are converted back to Python
+        def value_at(i: int) -> Any:
+            return column[i].as_py()
+    else:
+        value_at = values.__getitem__
+        try:
+            column = pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            column = None
+    if column is not None and pa.types.is_string(column.type):
+        parts, fast = iso_layout(column, kind)
+        out[fast] = parts.filter(pa.array(fast)).cast(arrow_type).to_numpy(zero_copy_only=False)
+
+    rest = [i for i in np.flatnonzero(~fast).tolist() if value_at(i) is not None]
+    for i in rest:
+        value = value_at(i)
+        try:
+            parsed = adapter.validate_python(value.strip() if isinstance(value, str) else value)
+        except ValidationError:
+            continue
+        if isinstance(parsed, datetime) and parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        out[i] = np.datetime64(parsed, unit)
+
+    return ParsedColumn(out, len(rest), fast)
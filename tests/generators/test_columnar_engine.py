@@ -0,0 +1,84 @@
+import csv
+
+import pytest
+
+from batch_data_pipeline.generators.columnar import ColumnarEngine, write_column_batch
+from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+
+
+@pytest.fixture
+def engine():
+    return ColumnarEngine(seed=42, countries=EcommerceDataGenerator.COUNTRY, campaigns=EcommerceDataGenerator.CAMPAIGN)
+
+
+def test_orders_layout_and_fk_picks(engine):
+    customer_ids = ["c1", "c2", "c3"]
+    batch = engine.orders(2000, customer_ids)
+
+    assert batch.fieldnames == [
+        "order_id", "customer_id", "order_date", "status",
+        "total_amount", "shipping_cost", "shipping_country", "campaign",
+    ]
+    assert len(batch) == 2000
+
+    picked = batch.to_lists()["customer_id"]
+    broken = sum(c not in customer_ids for c in picked)
+    # ~5% deliberately broken FKs
+    assert 0.02 < broken / len(picked) < 0.08
+
+
+def test_order_items_line_total_uses_product_price(engine):
+    price_map = {"p1": 10.0, "p2": None}
+    batch = engine.order_items(3000, ["o1"], ["p1", "p2"], price_map)
+    cols = batch.to_lists()
+
+    for i in range(len(batch)):
+        if i in batch.overrides["line_total"] or i in batch.overrides["quantity"]:
+            continue
+        if cols["product_id"][i] == "p1":
+            assert cols["unit_price"][i] == 10.0
+            assert cols["line_total"][i] == round(10.0 * cols["quantity"][i], 2)
+
+
+def test_order_items_reuse_prebuilt_prices(engine):
+    prices = engine.product_prices(["p1", "p2"], {"p1": 10.0, "p2": "FREE"})
+    assert prices[0].tolist() == [10.0, "FREE"]
+
+    # the map isn't consulted once prices are built for the pool
+    batch = engine.order_items(500, ["o1"], ["p1", "p2"], {}, prices)
+    cols = batch.to_lists()
+    assert {cols["unit_price"][i] for i in range(len(batch)) if cols["product_id"][i] == "p2"} == {"FREE"}
+
+
+def test_payments_injection_rate(engine):
+    batch = engine.payments(5000, ["o1", "o2"])
+    bad = set(batch.overrides["amount"]) | set(batch.overrides["payment_method"])
+    # 10% injected, two of three issues touch a column
+    assert 0.04 < len(bad) / len(batch) < 0.10
+
+
+def test_write_column_batch_matches_dictwriter_layout(engine, tmp_path):
+    batch = engine.payments(50, ["o1"])
+    path = tmp_path / "payments.csv"
+    write_column_batch(str(path), batch)
+
+    with path.open() as f:
+        rows = list(csv.DictReader(f))
+
+    assert len(rows) == 50
+    assert list(rows[0]) == batch.fieldnames
+    assert all(r["paid_at"][10] == "T" for r in rows)
+
+
+@pytest.mark.parametrize("reproducible_ids", [False, True])
+def test_ids_repeat_across_same_seed_engines_only_on_request(reproducible_ids):
+    def make():
+        return ColumnarEngine(
+            seed=42, countries=EcommerceDataGenerator.COUNTRY, campaigns=EcommerceDataGenerator.CAMPAIGN,
+            now=1_700_000_000.0, reproducible_ids=reproducible_ids,
+        )
+
+    first, second = make().payments(100, ["o1"]), make().payments(100, ["o1"])
+    same_ids = first.columns["payment_id"].tolist() == second.columns["payment_id"].tolist()
+    assert same_ids is reproducible_ids
+    assert first.columns["paid_at"].tolist() == second.columns["paid_at"].tolist()
@@ -0,0 +1,34 @@
+from batch_data_pipeline.generators.columnar import ColumnarEngine
+from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+from batch_data_pipeline.generators.pools import FakerPools
+
+
+def test_pools_are_distinct_and_cached(tmp_path):
+    pools = FakerPools(seed=7, size=50, cache_dir=str(tmp_path))
+
+    for values in pools.pools.values():
+        assert len(values) == len(set(values))
+    assert len(pools["first_name"]) == 50
+
+    # second load comes from disk and is identical
+    cached = FakerPools(seed=7, size=50, cache_dir=str(tmp_path))
+    assert cached.pools == pools.pools
+    assert (tmp_path / "faker_pools_en_US_7_50.json").exists()
+
+
+def test_customers_drawn_from_pools_have_unique_emails(tmp_path):
+    pools = FakerPools(seed=7, size=50, cache_dir=str(tmp_path))
+    engine = ColumnarEngine(
+        seed=1,
+        countries=EcommerceDataGenerator.COUNTRY,
+        campaigns=EcommerceDataGenerator.CAMPAIGN,
+        categories=EcommerceDataGenerator.CATEGORIES,
+        pools=pools,
+    )
+
+    cols = engine.customers(1000).to_lists()
+    emails = [e for e in cols["email"] if e is not None]
+
+    assert len(emails) == len(set(emails))
+    assert set(cols["first_name"]) <= set(pools["first_name"])
+    assert all("@" in e and e == e.lower() for e in emails)
@@ -0,0 +1,122 @@
+import csv
+import random
+import uuid
+from datetime import date
+
+import pytest
+
+from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+from batch_data_pipeline.generators.id_registry import IdRegistry
+
+
+def _ids(n):
+    return [str(uuid.uuid4()) for _ in range(n)]
+
+
+def test_views_are_bounded_by_day(tmp_path):
+    registry = IdRegistry(str(tmp_path))
+    day1, day2 = _ids(3), _ids(2)
+    registry.append_day("customers", "2025-01-01", day1)
+    registry.append_day("customers", "2025-01-02", day2)
+
+    assert list(registry.view("customers", upto_day="2025-01-01")) == day1
+    assert list(registry.view("customers")) == day1 + day2
+    assert random.choice(registry.view("customers")) in day1 + day2
+
+
+def test_rerunning_a_day_replaces_its_ids(tmp_path):
+    registry = IdRegistry(str(tmp_path))
+    day1, day2 = _ids(3), _ids(2)
+    registry.append_day("orders", "2025-01-01", day1)
+    registry.append_day("orders", "2025-01-02", _ids(4))
+    registry.append_day("orders", "2025-01-02", day2)  # tail day: rewritten in place
+    registry.append_day("orders", "2025-01-01", day1[:1])  # earlier day: old range dropped
+
+    assert sorted(registry.view("orders")) == sorted(day1[:1] + day2)
+    assert registry.count("orders") == 3
+
+
+def test_rewriting_the_tail_day_never_shrinks_a_mapped_file(tmp_path):
+    registry = IdRegistry(str(tmp_path))
+    day1 = _ids(3)
+    registry.append_day("orders", "2025-01-01", day1)
+    registry.append_day("orders", "2025-01-02", _ids(4))
+    ids_file = tmp_path / "orders.ids"
+    size = ids_file.stat().st_size
+    view = registry.view("orders")
+
+    day2 = _ids(1)
+    registry.append_day("orders", "2025-01-02", day2)
+    assert ids_file.stat().st_size == size
+    assert len(view) == 7 and list(view)[:3] == day1  # still readable
+
+    day3 = _ids(2)
+    registry.append_day("orders", "2025-01-03", day3)  # reuses the freed records
+    assert ids_file.stat().st_size == size
+    assert list(registry.view("orders")) == day1 + day2 + day3
+
+
+def test_product_prices_round_trip(tmp_path):
+    registry = IdRegistry(str(tmp_path))
+    ids = _ids(3)
+    registry.append_day("products", "2025-01-01", ids, values=[9.99, None, "FREE"])
+
+    prices = registry.price_map("products")
+    assert prices.get(ids[0]) == 9.99
+    assert prices.get(ids[1]) is None
+    assert prices.get(ids[2]) is None
+
+
+def test_price_map_reads_only_days_added_since_the_last_call(tmp_path, monkeypatch):
+    registry = IdRegistry(str(tmp_path))
+    day1, day2 = _ids(2), _ids(2)
+    registry.append_day("products", "2025-01-01", day1, values=[1.0, 2.0])
+    first = registry.price_map("products")
+    first.set(day1[0], 99.0)  # callers' changes don't leak into the cache
+    registry.append_day("products", "2025-01-02", day2, values=[3.0, 4.0])
+
+    reads = []
+    read_prices = registry._read_prices
+    monkeypatch.setattr(registry, "_read_prices", lambda e, p, ranges: reads.append(ranges) or read_prices(e, p, ranges))
+    prices = registry.price_map("products")
+    assert reads == [[(2, 2)]]
+    assert [prices.get(i) for i in day1 + day2] == [1.0, 2.0, 3.0, 4.0]
+
+    registry.append_day("products", "2025-01-02", day2[:1], values=[5.0])  # re-registered: rebuilt
+    prices = registry.price_map("products")
+    assert len(prices) == 3 and prices.get(day2[0]) == 5.0
+
+
+def test_incremental_orders_reference_earlier_customers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    initial = {"customers": 500, "products": 20, "orders": 10}
+    daily = {"customers": 5, "products": 2, "orders": 400}
+    gen = EcommerceDataGenerator(str(tmp_path), initial, daily, seed=11, persistent_ids=True)
+
+    gen.run_initial_load(date(2025, 1, 1))
+    gen.run_incremental_batch(date(2025, 1, 2))
+
+    with (tmp_path / "2025-01-01" / "customers_2025-01-01.csv").open() as f:
+        first_day = {r["customer_id"] for r in csv.DictReader(f)}
+    with (tmp_path / "2025-01-02" / "orders_2025-01-02.csv").open() as f:
+        orders = list(csv.DictReader(f))
+
+    # with only 5 new customers, most orders must point back at day-one customers
+    assert sum(o["customer_id"] in first_day for o in orders) / len(orders) > 0.8
+    assert len(gen.customer_ids) == 505
+
+
+@pytest.mark.parametrize("persistent_ids", [True, False])
+def test_numpy_emails_stay_unique_across_runs_in_new_processes(tmp_path, monkeypatch, persistent_ids):
+    monkeypatch.chdir(tmp_path)
+    rows = {"customers": 50, "products": 2, "orders": 2}
+    emails = []
+    for i, day in enumerate([date(2025, 1, 1), date(2025, 1, 2)]):
+        # a fresh generator per day, as a scheduled daily run would have
+        gen = EcommerceDataGenerator(str(tmp_path), rows, rows, seed=11, engine="numpy",
+                                     persistent_ids=persistent_ids)
+        (gen.run_initial_load if i == 0 else gen.run_incremental_batch)(day)
+        with (tmp_path / day.isoformat() / f"customers_{day}.csv").open() as f:
+            emails += [r["email"] for r in csv.DictReader(f) if r["email"]]
+
+    assert len(set(emails)) == len(emails)
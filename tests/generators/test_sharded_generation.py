@@ -0,0 +1,95 @@
+import csv
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+from batch_data_pipeline.generators.pools import FakerPools
+from batch_data_pipeline.generators.sharded import ShardedRun, _init_worker, shard_counts
+
+ROW_COUNTS = {"customers": 300, "products": 40, "orders": 500, "order_items": 1500, "payments": 500}
+
+
+def _run(tmp_path, out: str, merge: bool = True, reproducible_ids: bool = True):
+    pool_args = (0, 50, str(tmp_path / "pools"))
+    # ShardedRun.run warms the cache before starting workers; do the same here
+    FakerPools(seed=pool_args[0], size=pool_args[1], cache_dir=pool_args[2])
+    run = ShardedRun(
+        output_path=str(tmp_path / out),
+        day="2025-01-01",
+        row_counts=ROW_COUNTS,
+        master_seed=123,
+        shards=3,
+        constants={
+            "countries": EcommerceDataGenerator.COUNTRY,
+            "campaigns": EcommerceDataGenerator.CAMPAIGN,
+            "categories": EcommerceDataGenerator.CATEGORIES,
+        },
+        pool_seed=pool_args[0],
+        pool_size=pool_args[1],
+        pool_cache_dir=pool_args[2],
+        now=1_700_000_000.0,
+        reproducible_ids=reproducible_ids,
+    )
+    with ThreadPoolExecutor(max_workers=3, initializer=_init_worker, initargs=pool_args) as pool:
+        return run.run_with(pool, merge=merge)
+
+
+def _read(path):
+    with open(path) as f:
+        return list(csv.DictReader(f))
+
+
+def test_shard_counts_cover_all_rows():
+    assert shard_counts(10, 3) == [4, 3, 3]
+    assert sum(shard_counts(100_001, 8)) == 100_001
+
+
+def test_sharded_run_is_deterministic_and_fks_point_at_shard_ids(tmp_path):
+    first = _run(tmp_path, "a")
+    second = _run(tmp_path, "b")
+
+    for table, paths in first.items():
+        assert len(paths) == 1
+        assert _read(paths[0]) == _read(second[table][0])
+        assert len(_read(paths[0])) == ROW_COUNTS[table]
+
+    customer_ids = {r["customer_id"] for r in _read(first["customers"][0])}
+    orders = _read(first["orders"][0])
+    linked = sum(o["customer_id"] in customer_ids for o in orders)
+    assert linked / len(orders) > 0.9
+
+
+def test_ids_differ_between_runs_unless_asked_to_reproduce(tmp_path):
+    first = _read(_run(tmp_path, "a", reproducible_ids=False)["orders"][0])
+    second = _read(_run(tmp_path, "b", reproducible_ids=False)["orders"][0])
+
+    assert {r["order_id"] for r in first}.isdisjoint(r["order_id"] for r in second)
+    assert [r["order_date"] for r in first] == [r["order_date"] for r in second]
+
+
+def test_part_files_kept_without_merge(tmp_path):
+    outputs = _run(tmp_path, "parts", merge=False)
+    assert [p.rsplit("/", 1)[1] for p in outputs["orders"]] == [
+        "orders_2025-01-01_part-0000.csv",
+        "orders_2025-01-01_part-0001.csv",
+        "orders_2025-01-01_part-0002.csv",
+    ]
+
+
+def test_persistent_sharded_runs_register_ids_and_pick_fks_from_history(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    initial = {"customers": 200, "products": 20, "orders": 50}
+    daily = {"customers": 4, "products": 2, "orders": 300}
+    gen = EcommerceDataGenerator(str(tmp_path / "out"), initial, daily, seed=5, engine="numpy", persistent_ids=True)
+    day1, day2 = date(2025, 1, 1), date(2025, 1, 2)
+    gen.run_sharded_load(day1, initial=True, shards=2)
+    gen.run_sharded_load(day2, initial=False, shards=2)
+
+    assert gen.registry.count("customers") == 204
+    assert gen.registry.count("orders") == 350 and len(gen.order_ids) == 350
+    first_day = {r["customer_id"] for r in _read(tmp_path / "out" / str(day1) / f"customers_{day1}.csv")}
+    orders = _read(tmp_path / "out" / str(day2) / f"orders_{day2}.csv")
+    # only 4 new customers on day two: most orders point back at day one
+    assert sum(o["customer_id"] in first_day for o in orders) / len(orders) > 0.8
+    emails = [r["email"] for d in (day1, day2) for r in _read(tmp_path / "out" / str(d) / f"customers_{d}.csv")]
+    assert len(set(e for e in emails if e)) == len([e for e in emails if e])
@@ -0,0 +1,79 @@
+import csv
+import tracemalloc
+from datetime import date
+
+import pytest
+
+from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+from batch_data_pipeline.generators.id_store import CompactIds, CompactPriceMap
+
+
+def _peak_bytes(tmp_path, engine: str, orders: int) -> int:
+    rows = {"customers": 200, "products": 20, "orders": orders}
+    gen = EcommerceDataGenerator(
+        str(tmp_path / f"{engine}_{orders}"),
+        initial_rows=rows,
+        daily_rows=rows,
+        engine=engine,
+        seed=5,
+        pool_size=100,
+        pool_cache_dir=str(tmp_path / "pools"),
+        streaming=True,
+        chunk_size=500,
+    )
+    if engine == "numpy":
+        gen._columnar_engine()  # load pools outside the measured window
+
+    tracemalloc.start()
+    gen.run_incremental_batch(date(2025, 1, 1))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_streaming_peak_memory_stays_flat(tmp_path, monkeypatch, engine):
+    monkeypatch.chdir(tmp_path)  # the generator's log handler writes pipeline.log to cwd
+
+    small = _peak_bytes(tmp_path, engine, orders=1_000)
+    large = _peak_bytes(tmp_path, engine, orders=4_000)
+
+    # 4x the rows; only the packed 16-byte order_ids pool is allowed to grow
+    assert large < small * 1.5
+
+
+def test_streaming_output_keeps_fk_links(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rows = {"customers": 100, "products": 10, "orders": 1_000}
+    gen = EcommerceDataGenerator(str(tmp_path), rows, rows, seed=3, streaming=True, chunk_size=64)
+    gen.run_incremental_batch(date(2025, 1, 1))
+
+    day = tmp_path / "2025-01-01"
+    with (day / "orders_2025-01-01.csv").open() as f:
+        order_ids = {r["order_id"] for r in csv.DictReader(f)}
+    with (day / "order_items_2025-01-01.csv").open() as f:
+        items = list(csv.DictReader(f))
+
+    assert len(order_ids) == 1_000
+    assert len(items) == 3_000
+    assert sum(i["order_id"] in order_ids for i in items) / len(items) > 0.9
+
+
+def test_compact_ids_round_trip():
+    ids = ["6a1f7b50-3c55-4d8c-9c4e-2f1f0e0b7a11", "0d3c1c8e-8f2a-4b59-a6b1-5a0c7d9e2b33"]
+    packed = CompactIds(ids)
+
+    assert list(packed) == ids
+    assert packed[-1] == ids[1]
+    assert packed.take([1, 0]) == [ids[1], ids[0]]
+    assert packed.nbytes == 32
+
+
+def test_compact_price_map_returns_raw_values():
+    prices = CompactPriceMap()
+    prices.set("6a1f7b50-3c55-4d8c-9c4e-2f1f0e0b7a11", 12.5)
+    prices.set("0d3c1c8e-8f2a-4b59-a6b1-5a0c7d9e2b33", "FREE")
+
+    assert prices.get("6a1f7b50-3c55-4d8c-9c4e-2f1f0e0b7a11") == 12.5
+    assert prices.get("0d3c1c8e-8f2a-4b59-a6b1-5a0c7d9e2b33") == "FREE"
+    assert prices.get("ffffffff-3c55-4d8c-9c4e-2f1f0e0b7a11", 1.0) == 1.0
@@ -0,0 +1,35 @@
+import uuid
+
+import numpy as np
+
+from batch_data_pipeline.generators.id_store import CompactIds
+from batch_data_pipeline.generators.uuids import UuidBuffer, format_packed, format_uuids, uuid4_bytes
+
+
+def test_bulk_uuids_are_valid_uuid4():
+    values = format_uuids(uuid4_bytes(1000)).tolist()
+
+    assert len(set(values)) == 1000
+    for value in values:
+        parsed = uuid.UUID(value)
+        assert parsed.version == 4
+        assert parsed.variant == uuid.RFC_4122
+        assert str(parsed) == value
+
+
+def test_seeded_bytes_are_reproducible():
+    first = format_uuids(uuid4_bytes(5, np.random.default_rng(1).bytes))
+    second = format_uuids(uuid4_bytes(5, np.random.default_rng(1).bytes))
+    assert first.tolist() == second.tolist()
+
+
+def test_buffer_refills_across_blocks():
+    buffer = UuidBuffer(block_size=4)
+    values = [buffer.next() for _ in range(6)] + buffer.take(7)
+    assert len(set(values)) == 13
+
+
+def test_format_packed_matches_compact_ids():
+    ids = [str(uuid.uuid4()) for _ in range(10)]
+    packed = CompactIds(ids)
+    assert format_packed(packed.packed([3, 0, 9])).tolist() == [ids[3], ids[0], ids[9]]
@@ -0,0 +1,109 @@
+import csv
+
+import pytest
+
+from batch_data_pipeline.ingestion.utils import csv_io
+from batch_data_pipeline.ingestion.utils.csv_io import (
+    iter_csv_chunks, iter_csv_parts, iter_csv_rows, read_csv, read_csv_header, split_csv_ranges,
+)
+
+TRICKY = (
+    "order_item_id,order_id,quantity,note\r\n"
+    "a1,o1,2,plain\r\n"
+    '"a2","o,2",,"multi\nline"\r\n'
+    "\r\n"
+    'a3,o3,"3","say ""hi"""\r\n'
+    "a4,o4\r\n"
+    "a5,o5,1,x,extra,more\r\n"
+    "a6,ö6, 7 ,ünïcode\r\n"
+)
+
+
+@pytest.fixture
+def tricky(tmp_path):
+    path = tmp_path / "order_items.csv"
+    path.write_bytes(TRICKY.encode("utf-8"))
+    return path
+
+
+def _dict_reader(path):
+    with path.open("r", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_rows_match_dict_reader(tricky):
+    assert read_csv(tricky) == _dict_reader(tricky)
+    assert list(iter_csv_rows(tricky, chunk_size=2)) == _dict_reader(tricky)
+
+
+def test_chunks_concatenate_to_the_file(tricky):
+    chunks = list(iter_csv_chunks(tricky, chunk_size=2))
+    assert [len(c) for c in chunks] == [2, 2, 2]
+    assert [row for c in chunks for row in c] == read_csv(tricky)
+
+
+def test_tuples_and_columns_follow_the_header(tricky):
+    header = read_csv_header(tricky)
+    tuples = [row for c in iter_csv_chunks(tricky, chunk_size=4, output="tuple") for row in c]
+    columns = list(iter_csv_chunks(tricky, output="columns"))[0]
+
+    assert header == ["order_item_id", "order_id", "quantity", "note"]
+    assert tuples[1] == ("a2", "o,2", "", "multi\nline")
+    assert tuples[3] == ("a4", "o4")
+    assert list(columns) == header
+    assert columns["order_id"] == ["o1", "o,2", "o3", "o4", "o5", "ö6"]
+    assert columns["note"][3] is None
+
+
+def test_arrow_batches_hold_the_raw_text(tmp_path):
+    path = tmp_path / "orders.csv"
+    path.write_text('order_id,total_amount\no1,12.5\n"o,2",\n\no3,"FREE"\n', encoding="utf-8")
+    batches = list(iter_csv_chunks(path, output="arrow"))
+
+    assert batches[0].schema.names == ["order_id", "total_amount"]
+    assert [row for b in batches for row in b.to_pylist()] == read_csv(path)
+
+
+@pytest.mark.parametrize("text", ["", "order_id,customer_id\n"])
+def test_files_without_rows(tmp_path, text):
+    path = tmp_path / "orders.csv"
+    path.write_text(text)
+    for output in ("dict", "tuple", "columns", "arrow"):
+        assert list(iter_csv_chunks(path, output=output)) == []
+    assert read_csv(path) == []
+
+
+def test_unknown_output(tricky):
+    with pytest.raises(ValueError):
+        list(iter_csv_chunks(tricky, output="pandas"))
+
+
+@pytest.mark.parametrize("parts", [1, 2, 3, 5, 50])
+def test_ranges_end_on_line_ends_outside_quotes(tricky, parts):
+    ranges = split_csv_ranges(tricky, parts)
+    data = tricky.read_bytes()
+
+    assert ranges[0][0] == data.index(b"\n") + 1
+    assert ranges[-1][1] == len(data)
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    # each range parses on its own, so together they give the whole file
+    rows = [row for start, end in ranges
+            for row in csv_io._parse_range((str(tricky), start, end, read_csv_header(tricky), "dict"))]
+    assert rows == read_csv(tricky)
+    # the quoted newline in row a2 is never a cut
+    assert data.index(b"multi\n") + 6 not in {end for _, end in ranges}
+
+
+def test_parallel_parts_come_back_in_order(tricky):
+    parts = list(iter_csv_parts(tricky, workers=2, parts=4))
+    assert [row for part in parts for row in part.rows] == read_csv(tricky)
+    # start is the file-wide index of each part's first row
+    assert [part.start for part in parts] == [sum(len(p.rows) for p in parts[:i]) for i in range(len(parts))]
+
+
+def test_read_csv_goes_parallel_for_large_files(tricky, monkeypatch):
+    monkeypatch.setattr(csv_io, "PARALLEL_MIN_BYTES", 1)
+    assert read_csv(tricky, workers=2) == _dict_reader(tricky)
+    assert list(iter_csv_parts(tricky, workers=2, output="tuple"))[0].rows[0] == ("a1", "o1", "2", "plain")
+    with pytest.raises(ValueError):
+        list(iter_csv_parts(tricky, workers=2, output="arrow"))
@@ -0,0 +1,143 @@
+import csv
+import importlib
+import io
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+from batch_data_pipeline.ingestion.ingestors import (
+    customer_ingestion,
+    order_ingestion,
+    order_item_ingestion,
+    payment_ingestion,
+    product_ingestion,
+)
+from batch_data_pipeline.validation.referential import ReferenceIndex
+
+DAY = date(2031, 5, 6)
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket, self.name = bucket, name
+        self.size = self.crc32c = None
+
+    def exists(self):
+        return self.name in self.bucket.objects
+
+    def upload_from_filename(self, filename):
+        self.bucket.objects[self.name] = Path(filename).read_bytes()
+
+    def open(self, mode, **kwargs):
+        return FakeUpload(self)
+
+
+class FakeUpload(io.BytesIO):
+    def __init__(self, blob):
+        super().__init__()
+        self.blob = blob
+
+    def close(self):
+        if not self.closed:
+            self.blob.bucket.objects[self.blob.name] = self.getvalue()
+        super().close()
+
+
+class FakeBucket:
+    name = "test-bucket"
+
+    def __init__(self):
+        self.objects = {}
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+    def list_blobs(self, prefix, fields=None):
+        return [FakeBlob(self, name) for name in self.objects if name.startswith(prefix)]
+
+
+class FakeClient:
+    def bucket(self, name):
+        # a new, empty bucket per run: every run uploads and validates again
+        return FakeBucket()
+
+
+class ExistingDay:
+    """Stands in for the generator: the raw day folder is already on disk, as on a retry."""
+
+    def __init__(self, *args, **kwargs):
+        self.registry = None
+
+    def run_incremental_batch(self, day):
+        pass
+
+
+@pytest.fixture
+def main_runner(tmp_path, monkeypatch):
+    monkeypatch.setenv("GCS_BUCKET", "test-bucket")
+    monkeypatch.setenv("ECOMMERCE_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr("google.cloud.storage.Client", FakeClient)
+    monkeypatch.chdir(tmp_path)  # the generator's log handler writes pipeline.log to cwd
+    rows = {"customers": 200, "products": 10, "orders": 100}
+    EcommerceDataGenerator(str(tmp_path), rows, rows, seed=4).run_initial_load(DAY)
+
+    module = importlib.import_module("batch_data_pipeline.main_runner")
+    monkeypatch.setattr(module, "EcommerceDataGenerator", ExistingDay)
+    return module
+
+
+def test_a_rerun_with_unchanged_files_skips_validation(main_runner, monkeypatch):
+    first = main_runner.run_full_ingestion(DAY)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("validated again")
+
+    for module, name in [
+        (customer_ingestion, "validate_customer_rows"),
+        (product_ingestion, "validate_product_rows"),
+        (order_ingestion, "validate_order_rows"),
+        (order_item_ingestion, "validate_order_item_rows"),
+        (payment_ingestion, "validate_payment_rows"),
+    ]:
+        monkeypatch.setattr(module, name, fail)
+
+    rerun = main_runner.run_full_ingestion(DAY)
+    assert rerun["validated_and_quarantine"] == first["validated_and_quarantine"]
+
+
+@pytest.mark.parametrize("options", [{"workers": 2}, {"chunk_size": 500}, {"streaming": True}])
+def test_columnar_options_are_rejected_when_the_config_is_built(main_runner, options):
+    with pytest.raises(ValueError):
+        main_runner.IngestionConfig(engine="columnar", **options)
+    main_runner.IngestionConfig(engine="compiled", **options)
+
+
+def test_the_key_index_is_closed_when_ingestion_fails(main_runner, monkeypatch):
+    closed = []
+
+    class KeyIndex(main_runner.KeyIndex):
+        def close(self):
+            closed.append(self)
+            super().close()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("bucket unavailable")
+
+    monkeypatch.setattr(main_runner, "KeyIndex", KeyIndex)
+    monkeypatch.setattr(main_runner, "ingest_orders", fail)
+    with pytest.raises(RuntimeError):
+        main_runner.run_full_ingestion(DAY, config=main_runner.IngestionConfig(dedup=True))
+    assert len(closed) == 1
+
+
+def test_the_fk_index_only_holds_parents_that_passed_validation(main_runner, tmp_path):
+    main_runner.run_full_ingestion(DAY, config=main_runner.IngestionConfig(fk_check=True))
+
+    with (tmp_path / DAY.isoformat() / f"customers_{DAY}.csv").open() as f:
+        valid, invalid = customer_ingestion.validate_customer_rows(list(csv.DictReader(f)))
+    index = ReferenceIndex(tmp_path / "_fk_index")
+    assert index.contains("customers", [row["customer_id"] for row in valid]).all()
+    quarantined = [row["raw_data"]["customer_id"] for row in invalid]
+    assert quarantined and not index.contains("customers", quarantined).any()
@@ -0,0 +1,105 @@
+from datetime import date, datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+from batch_data_pipeline.ingestion.utils.file_finder import find_day_file
+from batch_data_pipeline.ingestion.utils.csv_io import read_csv
+from batch_data_pipeline.ingestion.utils.parquet_io import (
+    CATEGORICAL,
+    RAW_TEXT_FIELDS,
+    ParquetTableWriter,
+    read_parquet_rows,
+    write_parquet_rows,
+)
+from batch_data_pipeline.validation.helpers import validate_records
+from batch_data_pipeline.validation.schema.order_item import OrderItem
+from batch_data_pipeline.validation.schema.payment import Payment
+from batch_data_pipeline.validation.schema.product import Product
+
+
+def test_bad_values_become_nulls_in_typed_columns(tmp_path):
+    rows = [
+        {"order_item_id": "a", "order_id": "o", "product_id": "p", "quantity": "ten", "unit_price": "12.5", "line_total": "NaN"},
+        {"order_item_id": "b", "order_id": "o", "product_id": "p", "quantity": 3, "unit_price": None, "line_total": 37.5},
+    ]
+    path = tmp_path / "order_items.parquet"
+    write_parquet_rows(rows, path, "order_items")
+
+    schema = pq.read_schema(path)
+    assert schema.field("quantity").type == pa.int32()
+    assert schema.field("unit_price").type == pa.float64()
+
+    out = read_parquet_rows(path)
+    assert [r["quantity"] for r in out] == [None, 3]
+    assert [r["unit_price"] for r in out] == [12.5, None]
+
+
+def test_writer_emits_full_row_groups(tmp_path):
+    path = tmp_path / "payments.parquet"
+    with ParquetTableWriter(path, "payments", row_group_size=4) as writer:
+        for start in range(0, 10, 3):
+            n = min(3, 10 - start)
+            writer.write_columns({
+                "payment_id": [f"p{start + i}" for i in range(n)],
+                "order_id": ["o"] * n,
+                "amount": [10.0] * n,
+                "payment_method": ["card", "bank", "paypal"][:n],
+                "paid_at": ["2025-01-01T10:00:00"] * n,
+            })
+
+    meta = pq.ParquetFile(path).metadata
+    assert [meta.row_group(i).num_rows for i in range(meta.num_row_groups)] == [4, 4, 2]
+    table = pq.read_table(path)
+    assert table.schema.field("payment_method").type == CATEGORICAL
+    assert table.column("paid_at").to_pylist()[0] == datetime(2025, 1, 1, 10)
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_generator_parquet_output_validates(tmp_path, monkeypatch, engine):
+    monkeypatch.chdir(tmp_path)
+    rows = {"customers": 50, "products": 40, "orders": 60}
+    gen = EcommerceDataGenerator(str(tmp_path), rows, rows, engine=engine, seed=4, output_format="parquet", chunk_size=16)
+    day = date(2025, 2, 1)
+    gen.run_initial_load(day)
+
+    path = find_day_file(tmp_path / str(day), "products", day)
+    assert path.suffix == ".parquet"
+    assert pq.read_schema(path).field("created_at").type == pa.timestamp("us")
+
+    products = read_parquet_rows(path)
+    valid, invalid = validate_records(products, Product)
+    assert len(valid) + len(invalid) == 40
+    assert len(valid) > 30
+
+
+@pytest.mark.parametrize("entity, schema", [("products", Product), ("order_items", OrderItem), ("payments", Payment)])
+def test_raw_parquet_quarantines_the_text_csv_does(tmp_path, monkeypatch, entity, schema):
+    monkeypatch.chdir(tmp_path)
+    rows = {"customers": 50, "products": 400, "orders": 400}
+    day = date(2025, 2, 1)
+    raw = {}
+    for output_format in ("csv", "parquet"):
+        root = tmp_path / output_format
+        EcommerceDataGenerator(str(root), rows, rows, seed=6, reproducible_ids=True,
+                               output_format=output_format).run_initial_load(day)
+        path = find_day_file(root / str(day), entity, day)
+        raw[output_format] = read_parquet_rows(path) if output_format == "parquet" else read_csv(path)
+
+    text_fields = RAW_TEXT_FIELDS[entity]
+    assert pq.read_schema(find_day_file(tmp_path / "parquet" / str(day), entity, day)).field(text_fields[0]).type == pa.string()
+
+    def text(rows):
+        # CSV writes None as ""
+        return [[row[f] or None for f in text_fields] for row in rows]
+
+    assert text(raw["parquet"]) == text(raw["csv"])
+    assert {"FREE", "??", "ten", "NaN", "free"} & {v for row in text(raw["parquet"]) for v in row}
+
+    csv_invalid = validate_records(raw["csv"], schema)[1]
+    parquet_invalid = validate_records(raw["parquet"], schema)[1]
+    assert [r["row_index"] for r in parquet_invalid] == [r["row_index"] for r in csv_invalid]
+    assert [[r["raw_data"][f] or None for f in text_fields] for r in parquet_invalid] == \
+        [[r["raw_data"][f] or None for f in text_fields] for r in csv_invalid]
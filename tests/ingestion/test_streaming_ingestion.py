@@ -0,0 +1,214 @@
+import csv
+import io
+from datetime import date, timedelta
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+from batch_data_pipeline.ingestion.ingestors.customer_ingestion import ingest_customers
+from batch_data_pipeline.ingestion.ingestors import order_ingestion
+from batch_data_pipeline.ingestion.ingestors.order_ingestion import ingest_orders
+from batch_data_pipeline.ingestion.ingestors.payment_ingestion import ingest_payments
+from batch_data_pipeline.ingestion.ingestors.streaming import ingest_streaming
+from batch_data_pipeline.ingestion.loaders.quanrantine_helpers import QuarantineCsvWriter, write_quarantine_csv
+from batch_data_pipeline.ingestion.loaders.validated_helpers import ValidatedRowWriter, write_validated_parquet
+from batch_data_pipeline.ingestion.utils.file_finder import find_day_file
+from batch_data_pipeline.ingestion.utils.parquet_io import read_parquet_rows
+from batch_data_pipeline.validation.cache import ValidationCache
+from batch_data_pipeline.validation.dedup import KeyIndex
+from batch_data_pipeline.validation.referential import FK_VIOLATION, ReferenceIndex
+from batch_data_pipeline.validation.schema.order import Order
+from batch_data_pipeline.validation.schema.payment import Payment
+
+DAY = date(2031, 3, 4)
+
+
+class FakeBlob:
+    def __init__(self, bucket, path):
+        self.bucket, self.path = bucket, path
+
+    def exists(self):
+        return self.path in self.bucket.objects
+
+    def upload_from_filename(self, filename):
+        self.bucket.objects[self.path] = Path(filename).read_bytes()
+
+    def open(self, mode, **kwargs):
+        self.bucket.opened.append(self.path)
+        return FakeUpload(self)
+
+
+class FakeUpload(io.BytesIO):
+    def __init__(self, blob):
+        super().__init__()
+        self.blob = blob
+
+    def close(self):
+        if not self.closed:
+            self.blob.bucket.objects[self.blob.path] = self.getvalue()
+        super().close()
+
+
+class FakeBucket:
+    name = "test-bucket"
+
+    def __init__(self):
+        self.objects = {}
+        self.opened = []
+
+    def blob(self, path):
+        return FakeBlob(self, path)
+
+
+@pytest.fixture(scope="module")
+def day_folder(tmp_path_factory):
+    root = tmp_path_factory.mktemp("raw")
+    rows = {"customers": 30, "products": 20, "orders": 300}
+    for output_format in ("csv", "parquet"):
+        EcommerceDataGenerator(str(root / output_format), rows, rows, seed=9, output_format=output_format).run_initial_load(DAY)
+        # the generator's bad values are mostly cleaned to None; blank some IDs for the quarantine
+        for entity in ("orders", "payments"):
+            path = find_day_file(root / output_format / DAY.isoformat(), entity, DAY)
+            if output_format == "parquet":
+                table = pq.read_table(path)
+                ids = [None if i % 7 == 0 else v for i, v in enumerate(table.column("order_id").to_pylist())]
+                pq.write_table(table.set_column(table.schema.get_field_index("order_id"), "order_id", pa.array(ids)), path)
+            else:
+                with path.open() as f:
+                    raw = list(csv.DictReader(f))
+                for i, row in enumerate(raw):
+                    row["order_id"] = "" if i % 7 == 0 else row["order_id"]
+                with path.open("w", newline="") as f:
+                    writer = csv.DictWriter(f, fieldnames=raw[0].keys())
+                    writer.writeheader()
+                    writer.writerows(raw)
+    return lambda output_format: root / output_format / DAY.isoformat()
+
+
+@pytest.mark.parametrize("raw_format", ["csv", "parquet"])
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+@pytest.mark.parametrize("ingest", [ingest_orders, ingest_payments])
+def test_streaming_uploads_the_same_files(tmp_path, day_folder, raw_format, output_format, ingest):
+    in_memory, streamed = FakeBucket(), FakeBucket()
+    expected = ingest(day_folder(raw_format), DAY, in_memory, output_format=output_format)
+    summary = ingest(day_folder(raw_format), DAY, streamed, output_format=output_format, streaming=True)
+
+    assert summary == expected
+    assert expected["invalid_rows"] > 0
+    if output_format == "csv":
+        assert streamed.objects == in_memory.objects
+    else:
+        for path, data in in_memory.objects.items():
+            if path.endswith(".parquet"):
+                (tmp_path / "expected.parquet").write_bytes(data)
+                (tmp_path / "streamed.parquet").write_bytes(streamed.objects[path])
+                assert read_parquet_rows(tmp_path / "streamed.parquet") == read_parquet_rows(tmp_path / "expected.parquet")
+            else:
+                assert streamed.objects[path] == data
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_orders_of_unknown_customers_are_quarantined(day_folder, streaming):
+    fk_index = ReferenceIndex()
+    ingest_customers(day_folder("csv"), DAY, FakeBucket(), fk_index=fk_index)
+    bucket = FakeBucket()
+    summary = ingest_orders(day_folder("csv"), DAY, bucket, fk_index=fk_index, streaming=streaming)
+    without_check = ingest_orders(day_folder("csv"), DAY, FakeBucket())
+
+    quarantined = bucket.objects[summary["quarantine_path"].split(f"{bucket.name}/", 1)[1]].decode()
+    assert summary["invalid_rows"] > without_check["invalid_rows"]
+    assert summary["total_rows"] == without_check["total_rows"]
+    assert FK_VIOLATION in quarantined
+
+
+def test_streaming_fk_check_matches_in_memory(day_folder):
+    summaries = []
+    for streaming, batch_size in [(False, None), (True, 13)]:
+        fk_index = ReferenceIndex()
+        ingest_customers(day_folder("parquet"), DAY, FakeBucket(), fk_index=fk_index)
+        bucket = FakeBucket()
+        path = find_day_file(day_folder("parquet"), "orders", DAY)
+        if streaming:
+            summary = ingest_streaming(path, Order, "orders", DAY, bucket, fk_index=fk_index, batch_size=batch_size)
+        else:
+            summary = ingest_orders(day_folder("parquet"), DAY, bucket, fk_index=fk_index)
+        summaries.append((summary, bucket.objects))
+    assert summaries[0] == summaries[1]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_a_resent_file_is_quarantined_as_duplicates(day_folder, streaming):
+    with KeyIndex() as key_index:
+        first = ingest_orders(day_folder("csv"), DAY, FakeBucket(), key_index=key_index, streaming=streaming)
+        # the same file again as the next day's drop
+        resent = find_day_file(day_folder("csv"), "orders", DAY)
+        summary = ingest_streaming(resent, Order, "orders", DAY + timedelta(days=1), FakeBucket(),
+                                   key_index=key_index, batch_size=50)
+
+    assert first["valid_rows"] > 0
+    assert summary["valid_rows"] == 0
+    assert summary["invalid_rows"] == summary["total_rows"] == first["total_rows"]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_validator_profile_is_added_to_the_summary_on_request(day_folder, streaming):
+    plain = ingest_payments(day_folder("csv"), DAY, FakeBucket(), streaming=streaming)
+    summary = ingest_payments(day_folder("csv"), DAY, FakeBucket(), streaming=streaming, profile_validators=True)
+
+    assert "validator_profile" not in plain
+    assert {k: v for k, v in summary.items() if k != "validator_profile"} == plain
+    assert {r["field"] for r in summary["validator_profile"]} == set(Payment.model_fields)
+
+
+def test_a_retried_file_reuses_the_cached_validation(tmp_path, day_folder, monkeypatch):
+    cache = ValidationCache(tmp_path / "cache")
+    first, retried = FakeBucket(), FakeBucket()
+    expected = ingest_orders(day_folder("csv"), DAY, first, validation_cache=cache)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("validated again")
+
+    monkeypatch.setattr(order_ingestion, "validate_order_rows", fail)
+    assert ingest_orders(day_folder("csv"), DAY, retried, validation_cache=cache) == expected
+    assert retried.objects == first.objects
+
+
+def test_small_batches_give_the_same_summary(day_folder):
+    path = find_day_file(day_folder("csv"), "orders", DAY)
+    expected = ingest_streaming(path, Order, "orders", DAY, FakeBucket())
+    assert ingest_streaming(path, Order, "orders", DAY, FakeBucket(), batch_size=7) == expected
+
+
+def test_streaming_rejects_the_columnar_engine(day_folder):
+    path = find_day_file(day_folder("csv"), "orders", DAY)
+    with pytest.raises(ValueError):
+        ingest_streaming(path, Order, "orders", DAY, FakeBucket(), engine="columnar")
+
+
+def test_existing_objects_are_not_uploaded_again(day_folder):
+    path = find_day_file(day_folder("csv"), "orders", DAY)
+    first = FakeBucket()
+    expected = ingest_streaming(path, Order, "orders", DAY, first)
+
+    rerun = FakeBucket()
+    rerun.objects = dict(first.objects)
+    assert ingest_streaming(path, Order, "orders", DAY, rerun) == expected
+    assert rerun.opened == [] and rerun.objects == first.objects
+
+
+def test_writers_with_no_rows_leave_the_same_empty_files(tmp_path):
+    streamed = io.BytesIO()
+    with ValidatedRowWriter(streamed, "payments", "parquet") as writer:
+        writer.write([])
+    write_validated_parquet([], tmp_path / "expected.parquet", "payments")
+    (tmp_path / "streamed.parquet").write_bytes(streamed.getvalue())
+    quarantined = io.BytesIO()
+    with QuarantineCsvWriter(quarantined):
+        pass
+    write_quarantine_csv([], tmp_path / "expected.csv")
+
+    assert read_parquet_rows(tmp_path / "streamed.parquet") == read_parquet_rows(tmp_path / "expected.parquet") == []
+    assert quarantined.getvalue() == (tmp_path / "expected.csv").read_bytes() == b""
@@ -0,0 +1,251 @@
+import base64
+import io
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import google_crc32c
+import pytest
+from google.api_core.exceptions import NotFound, ServiceUnavailable
+
+from batch_data_pipeline.ingestion.loaders import upload_quarantined_to_bucket as quarantine_loader
+from batch_data_pipeline.ingestion.loaders import upload_validated_to_bucket as validated_loader
+from batch_data_pipeline.ingestion.loaders.blob_manifest import BlobInfo, BlobManifest
+from batch_data_pipeline.ingestion.loaders.upload_csvs_to_bucket import upload_raw_files, upload_raw_files_report
+from batch_data_pipeline.ingestion.loaders.upload_quarantined_to_bucket import upload_quarantine_to_bucket
+from batch_data_pipeline.ingestion.loaders.upload_validated_to_bucket import upload_validated_to_bucket
+from batch_data_pipeline.ingestion.utils.parquet_io import read_parquet_rows
+from batch_data_pipeline.validation.helpers import validate_records
+from batch_data_pipeline.validation.schema.payment import Payment
+
+ROWS = [
+    {"payment_id": f"p{i}", "order_id": "" if i % 5 == 0 else f"o{i}", "amount": f"{i}.25",
+     "payment_method": "Card", "paid_at": f"2024-01-0{i % 9 + 1}T10:00:00"}
+    for i in range(30)
+]
+FIELDS = list(Payment.model_fields)
+
+
+def crc32c(data):
+    return base64.b64encode(google_crc32c.Checksum(data).digest()).decode()
+
+
+class FakeBlob:
+    def __init__(self, bucket, path):
+        self.bucket, self.path = bucket, path
+        self.size = self.crc32c = None
+
+    def exists(self):
+        self.bucket.head_requests += 1
+        return self.path in self.bucket.objects
+
+    def upload_from_filename(self, filename):
+        data = self.bucket.objects[self.path] = Path(filename).read_bytes()
+        # as the client does, from the object resource the upload returns
+        self.size, self.crc32c = len(data), crc32c(data)
+
+    def open(self, mode, **kwargs):
+        assert mode == "wb" and kwargs["ignore_flush"]
+        blob = self
+
+        class Upload(io.BytesIO):
+            def close(self):
+                if not self.closed:
+                    blob.bucket.objects[blob.path] = self.getvalue()
+                super().close()
+
+        return Upload()
+
+
+class FakeBucket:
+    name = "test-bucket"
+
+    def __init__(self):
+        self.objects = {}
+        self.head_requests = 0
+        self.listed = []
+
+    def blob(self, path):
+        return FakeBlob(self, path)
+
+    def get_blob(self, path):
+        self.head_requests += 1
+        data = self.objects.get(path)
+        return None if data is None else SimpleNamespace(name=path, size=len(data), crc32c=crc32c(data))
+
+    def list_blobs(self, prefix, fields=None):
+        self.listed.append(prefix)
+        return [SimpleNamespace(name=name, size=len(data), crc32c=crc32c(data))
+                for name, data in self.objects.items() if name.startswith(prefix)]
+
+
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+@pytest.mark.parametrize("output", ["json", "tuple"])
+def test_streamed_upload_matches_the_temp_file_upload(tmp_path, output_format, output):
+    cleaned, invalid = validate_records(ROWS, Payment, output=output)
+    fieldnames = FIELDS if output == "tuple" else None
+    streamed, via_file = FakeBucket(), FakeBucket()
+    for bucket, stream in ((streamed, True), (via_file, False)):
+        upload_validated_to_bucket(cleaned, bucket, "payments", "2024-01-01", output_format=output_format,
+                                   fieldnames=fieldnames, stream=stream)
+        upload_quarantine_to_bucket(invalid, bucket, "payments", "2024-01-01", stream=stream)
+
+    assert invalid and streamed.objects.keys() == via_file.objects.keys()
+    for path, data in via_file.objects.items():
+        if path.endswith(".parquet"):
+            (tmp_path / "a.parquet").write_bytes(data)
+            (tmp_path / "b.parquet").write_bytes(streamed.objects[path])
+            assert read_parquet_rows(tmp_path / "b.parquet") == read_parquet_rows(tmp_path / "a.parquet")
+        else:
+            assert streamed.objects[path] == data
+
+
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+def test_no_rows_still_upload_an_empty_object(output_format):
+    bucket = FakeBucket()
+    uri = upload_validated_to_bucket([], bucket, "payments", "2024-01-01", output_format=output_format)
+    upload_quarantine_to_bucket([], bucket, "payments", "2024-01-01")
+
+    assert uri == f"gs://test-bucket/validated_raw/run_date=2024-01-01/payments.{output_format}"
+    assert bucket.objects["quarantine_raw/run_date=2024-01-01/payments_quarantine.csv"] == b""
+    assert len(bucket.objects) == 2
+
+
+@pytest.mark.parametrize("stream", [True, False])
+def test_existing_objects_are_skipped_before_serializing(monkeypatch, stream):
+    def fail(*args, **kwargs):
+        raise AssertionError("rows serialized for an existing object")
+
+    for module in (validated_loader, quarantine_loader):
+        for name in ("write_validated_csv", "stream_validated_rows", "write_quarantine_csv", "stream_quarantine_csv"):
+            if hasattr(module, name):
+                monkeypatch.setattr(module, name, fail)
+    bucket = FakeBucket()
+    bucket.objects = {
+        "validated_raw/run_date=2024-01-01/payments.csv": b"old",
+        "quarantine_raw/run_date=2024-01-01/payments_quarantine.csv": b"old",
+    }
+
+    upload_validated_to_bucket(ROWS, bucket, "payments", "2024-01-01", stream=stream)
+    upload_quarantine_to_bucket(ROWS, bucket, "payments", "2024-01-01", stream=stream)
+    assert set(bucket.objects.values()) == {b"old"}
+
+
+class SlowFlakyBucket(FakeBucket):
+    """Uploads take `delay` seconds; the first `failures` calls for a file fail with `error`."""
+
+    def __init__(self, delay=0.0, failures=0, error=ServiceUnavailable):
+        super().__init__()
+        self.delay, self.failures, self.error = delay, failures, error
+        self.calls, self.lock = {}, threading.Lock()
+
+    def blob(self, path):
+        bucket, blob = self, FakeBlob(self, path)
+
+        def upload_from_filename(filename):
+            with bucket.lock:
+                bucket.calls[path] = bucket.calls.get(path, 0) + 1
+                fail = bucket.calls[path] <= bucket.failures
+            time.sleep(bucket.delay)
+            if fail:
+                raise bucket.error("try again")
+            data = bucket.objects[path] = Path(filename).read_bytes()
+            blob.size, blob.crc32c = len(data), crc32c(data)
+
+        blob.upload_from_filename = upload_from_filename
+        return blob
+
+
+@pytest.fixture
+def raw_files(tmp_path):
+    files = []
+    for i, entity in enumerate(["customers", "products", "orders", "order_items", "payments"]):
+        path = tmp_path / f"{entity}_2024-01-01.csv"
+        path.write_text("id\n" + "x\n" * i)
+        files.append(path)
+    return files
+
+
+def test_raw_files_upload_concurrently_in_order(raw_files):
+    bucket = SlowFlakyBucket(delay=0.2)
+    start = time.perf_counter()
+    uris = upload_raw_files(raw_files, bucket, "raw/2024-01-01", max_workers=5)
+
+    assert time.perf_counter() - start < 0.6
+    assert uris == [f"gs://test-bucket/raw/2024-01-01/{f.name}" for f in raw_files]
+    assert bucket.objects == {f"raw/2024-01-01/{f.name}": f.read_bytes() for f in raw_files}
+
+
+def test_transient_errors_are_retried_and_reported(raw_files):
+    bucket = SlowFlakyBucket(failures=2)
+    bucket.objects[f"raw/2024-01-01/{raw_files[0].name}"] = raw_files[0].read_bytes()
+    reports = upload_raw_files_report(raw_files, bucket, "raw/2024-01-01", backoff=0)
+
+    assert [r["file"] for r in reports] == [f.name for f in raw_files]
+    assert reports[0]["skipped"] and reports[0]["bytes"] == 0
+    assert all(r["attempts"] == 3 and not r["skipped"] for r in reports[1:])
+    assert [r["bytes"] for r in reports[1:]] == [f.stat().st_size for f in raw_files[1:]]
+
+
+@pytest.mark.parametrize("failures, error", [(4, ServiceUnavailable), (1, NotFound)])
+def test_retries_give_up_on_persistent_or_permanent_errors(raw_files, failures, error):
+    bucket = SlowFlakyBucket(failures=failures, error=error)
+    with pytest.raises(error):
+        upload_raw_files_report(raw_files, bucket, "raw/2024-01-01", retries=3, backoff=0)
+
+
+def test_a_day_checks_existence_with_one_listing_per_prefix(raw_files):
+    cleaned, invalid = validate_records(ROWS, Payment, output="json")
+
+    def upload_day(bucket):
+        manifest = BlobManifest(bucket)
+        upload_raw_files(raw_files, bucket, "raw/ecommerce/2024-01-01", manifest=manifest)
+        for entity in ("customers", "products", "orders", "order_items", "payments"):
+            upload_validated_to_bucket(cleaned, bucket, entity, "2024-01-01", manifest=manifest)
+            upload_quarantine_to_bucket(invalid, bucket, entity, "2024-01-01", manifest=manifest)
+        return manifest
+
+    bucket = SlowFlakyBucket()
+    manifest = upload_day(bucket)
+    assert bucket.head_requests == 0
+    assert sorted(bucket.listed) == [
+        "quarantine_raw/run_date=2024-01-01/", "raw/ecommerce/2024-01-01/", "validated_raw/run_date=2024-01-01/",
+    ]
+    assert len(bucket.objects) == 15 and all(manifest.exists(name) for name in bucket.objects)
+
+    # a re-run lists again and skips every upload
+    uploaded = dict(bucket.objects)
+    upload_day(bucket)
+    assert bucket.head_requests == 0 and len(bucket.listed) == 6
+    assert bucket.objects == uploaded and all(calls == 1 for calls in bucket.calls.values())
+
+
+def test_raw_objects_that_differ_from_the_file_are_uploaded_again(raw_files):
+    bucket = SlowFlakyBucket()
+    upload_raw_files(raw_files, bucket, "raw/2024-01-01", manifest=BlobManifest(bucket))
+    customers, products = (f"raw/2024-01-01/{f.name}" for f in raw_files[:2])
+    bucket.objects[customers] = b"id\n"[:-1]  # truncated
+    bucket.objects[products] = b"id\ny\n"  # same size, other content
+
+    manifest = BlobManifest(bucket)
+    reports = upload_raw_files_report(raw_files, bucket, "raw/2024-01-01", manifest=manifest)
+    assert [r["skipped"] for r in reports] == [False, False, True, True, True]
+    assert bucket.objects == {f"raw/2024-01-01/{f.name}": f.read_bytes() for f in raw_files}
+    assert manifest.get(products) == BlobInfo(products, 5, crc32c(raw_files[1].read_bytes()))
+
+
+def test_manifest_keeps_size_and_crc32c():
+    bucket = FakeBucket()
+    bucket.objects = {"raw/ecommerce/2024-01-01/orders.csv": b"id\n1\n", "raw/ecommerce/2024-01-02/orders.csv": b""}
+    manifest = BlobManifest(bucket)
+
+    assert manifest.get("raw/ecommerce/2024-01-01/orders.csv") == BlobInfo(
+        "raw/ecommerce/2024-01-01/orders.csv", 5, crc32c(b"id\n1\n")
+    )
+    assert not manifest.exists("raw/ecommerce/2024-01-01/payments.csv")
+    assert manifest.listings == 1
+
+    bucket.objects["raw/ecommerce/2024-01-01/payments.csv"] = b""
+    manifest.forget("raw/ecommerce/2024-01-01/")
+    assert manifest.exists("raw/ecommerce/2024-01-01/payments.csv") and manifest.listings == 2
@@ -0,0 +1,31 @@
+from batch_data_pipeline.ingestion.loaders.validated_helpers import write_validated_csv, write_validated_parquet
+from batch_data_pipeline.ingestion.utils.parquet_io import read_parquet_rows
+from batch_data_pipeline.validation.helpers import validate_records
+from batch_data_pipeline.validation.schema.payment import Payment
+
+ROWS = [
+    {"payment_id": f"p{i}", "order_id": f"o{i}", "amount": "FREE" if i % 4 == 0 else f"{i}.25",
+     "payment_method": "Card", "paid_at": f"2024-01-0{i % 9 + 1}T10:00:00"}
+    for i in range(20)
+]
+FIELDS = list(Payment.model_fields)
+
+
+def test_tuple_rows_write_the_same_csv_as_dicts(tmp_path):
+    dicts, _ = validate_records(ROWS, Payment, output="json")
+    tuples, _ = validate_records(ROWS, Payment, output="tuple")
+
+    write_validated_csv(dicts, tmp_path / "dicts.csv")
+    write_validated_csv(tuples, tmp_path / "tuples.csv", fieldnames=FIELDS)
+
+    assert (tmp_path / "tuples.csv").read_text() == (tmp_path / "dicts.csv").read_text()
+
+
+def test_tuple_rows_write_the_same_parquet_as_dicts(tmp_path):
+    dicts, _ = validate_records(ROWS, Payment, output="json")
+    tuples, _ = validate_records(ROWS, Payment, output="tuple")
+
+    write_validated_parquet(dicts, tmp_path / "dicts.parquet", "payments")
+    write_validated_parquet(tuples, tmp_path / "tuples.parquet", "payments", fieldnames=FIELDS)
+
+    assert read_parquet_rows(tmp_path / "tuples.parquet") == read_parquet_rows(tmp_path / "dicts.parquet")
@@ -0,0 +1,102 @@
+import csv
+import random
+from datetime import date, datetime
+
+import pytest
+
+from batch_data_pipeline.generators.generator import EcommerceDataGenerator
+from batch_data_pipeline.ingestion.utils.parquet_io import read_parquet_rows
+from batch_data_pipeline.validation.schema.customer import Customer
+from batch_data_pipeline.validation.schema.order import Order
+from batch_data_pipeline.validation.schema.order_item import OrderItem
+from batch_data_pipeline.validation.schema.payment import Payment
+from batch_data_pipeline.validation.schema.product import Product
+
+DAY = date(2025, 1, 1)
+ROWS = {"customers": 50, "products": 50, "orders": 400}
+
+
+@pytest.fixture(scope="session")
+def generated_rows(tmp_path_factory):
+    """(table, output_format) → the rows of one generated day, as the ingestors read them."""
+    root = tmp_path_factory.mktemp("generated")
+    for output_format in ("csv", "parquet"):
+        gen = EcommerceDataGenerator(str(root / output_format), ROWS, ROWS, seed=5, output_format=output_format)
+        gen.run_initial_load(DAY)
+
+    def read(table, output_format):
+        path = root / output_format / DAY.isoformat() / f"{table}_{DAY}.{output_format}"
+        if output_format == "parquet":
+            return read_parquet_rows(path)
+        with path.open() as f:
+            return list(csv.DictReader(f))
+
+    return read
+
+
+# values a faster validator must either clean exactly like the schema or leave to its cleaners
+NUMBERS = [
+    "12.5", "0", "-3", "0.0", " 7 ", "\x1c7\x1c", "1e3", "+5", ".5", "5.", "1_000", "inf", "-Infinity",
+    "NaN", "nan", "FREE", "free", "null", "", "??", "ten", "٣", "１２", "9999.99", "10000", "123456789012345678901",
+    None,
+]
+TEXT = ["card", " Card ", "PAYPAL", "apple_pay", "bank\x1f", "banK", "crypto", "???", "", "  ", "--", "NULL",
+        "Unknown", "UK", "Summer Sale ", "x", "Toys & Games", "é", None]
+IDS = ["a1", "  b2  ", "", " ", "\x1d", "é", None]
+TIMESTAMPS = [
+    "2025-04-01T05:55:32.448490", "2025-04-01T05:55:32", "2025-04-01T05:55:32.000000", "2025-04-01T05:55:32.1",
+    " 2025-04-01T05:55:32.5 ", "2024-02-29T00:00:00", "2023-02-29T00:00:00", "2025-04-31T10:00:00",
+    "2025-04-01 05:55:32", "2025-04-01T05:55:32Z", "2025-04-01T05:55:32+02:00", "2025-04-01T24:00:00",
+    "2025-04-01T05:55:32.1234567", "2025-04-01", "1700000000", "0999-01-01T00:00:00", "yesterday", "", None,
+]
+FLAGS = ["True", "false", " YES ", "1", "0", "maybe", "", None]
+STATUS = ["new", " Shipped ", "RETURNED", "processing ", "lost", "", None]
+
+# the same columns as Parquet hands them over
+FLOATS = [12.5, 0.0, -2.0, 9999.5, 10000.0, float("nan"), float("inf"), None]
+INTS = [3, 0, -2, None]
+DATETIMES = [datetime(2025, 4, 1, 5, 55, 32), datetime(2025, 4, 1, 5, 55, 32, 120000), None]
+BOOLS = [True, False, None]
+
+NAMES = ["John", "mary-kate", " O'Connor ", "McDonald", "J", "Jo3", "Zoë", "", None]
+EMAILS = ["john@example.com", " jo@example.org ", "bad-email", "", None]
+COUNTRIES = ["United States", " France ", "N/A", "unknown", "", None]
+DATES = ["2024-01-01", " 2024-02-29 ", "2023-02-29", "01/02/2024", "", None]
+
+# field → (values as text, values as typed)
+FIELDS = {
+    Customer: {"customer_id": (IDS, IDS), "first_name": (NAMES, NAMES), "last_name": (NAMES, NAMES),
+               "email": (EMAILS, EMAILS), "country": (COUNTRIES, COUNTRIES),
+               "signup_date": (DATES, [date(2024, 1, 1), None])},
+    Order: {"order_id": (IDS, IDS), "customer_id": (IDS, IDS), "order_date": (TIMESTAMPS, DATETIMES),
+            "status": (STATUS, STATUS), "total_amount": (NUMBERS, FLOATS), "shipping_cost": (NUMBERS, FLOATS),
+            "shipping_country": (TEXT, TEXT), "campaign": (TEXT, TEXT)},
+    OrderItem: {"order_item_id": (IDS, IDS), "order_id": (IDS, IDS), "product_id": (IDS, IDS),
+                "quantity": (NUMBERS, INTS), "unit_price": (NUMBERS, FLOATS), "line_total": (NUMBERS, FLOATS)},
+    Payment: {"payment_id": (IDS, IDS), "order_id": (IDS, IDS), "amount": (NUMBERS, FLOATS),
+              "payment_method": (TEXT, TEXT), "paid_at": (TIMESTAMPS, DATETIMES)},
+    Product: {"product_id": (IDS, IDS), "name": (TEXT, TEXT), "category": (TEXT, TEXT), "price": (NUMBERS, FLOATS),
+              "stock_count": (NUMBERS, INTS), "created_at": (TIMESTAMPS, DATETIMES), "is_active": (FLAGS, BOOLS)},
+}
+
+
+def _fuzz_rows(schema, n, seed, typed):
+    """Clean rows (first value of each list) with one awkward value in a random field."""
+    rng = random.Random(seed)
+    values = {name: pools[typed] for name, pools in FIELDS[schema].items()}
+    clean = {name: pool[0] for name, pool in values.items()}
+    rows = []
+    for _ in range(n):
+        row = dict(clean)
+        name = rng.choice(list(values))
+        row[name] = rng.choice(values[name])
+        if rng.random() < 0.02:
+            del row[rng.choice(list(row))]
+        rows.append(row)
+    return rows
+
+
+@pytest.fixture
+def fuzz_rows():
+    """fuzz_rows(schema, n, seed, typed) → rows to compare validators on."""
+    return _fuzz_rows
@@ -0,0 +1,84 @@
+import pytest
+from pydantic import BaseModel
+
+from batch_data_pipeline.validation.columnar import validate_columnar
+from batch_data_pipeline.validation.helpers import validate_records
+from batch_data_pipeline.validation.schema.customer import Customer
+from batch_data_pipeline.validation.schema.order import Order
+from batch_data_pipeline.validation.schema.order_item import OrderItem
+from batch_data_pipeline.validation.schema.payment import Payment
+from batch_data_pipeline.validation.schema.product import Product
+
+SCHEMAS = {"customers": Customer, "products": Product, "orders": Order, "order_items": OrderItem, "payments": Payment}
+
+
+def _pydantic(rows, schema):
+    valid, invalid = validate_records(rows, schema)
+    return [m.model_dump(mode="json") for m in valid], invalid
+
+
+def _assert_same(rows, schema):
+    assert validate_columnar(rows, schema) == _pydantic(rows, schema)
+
+
+@pytest.mark.parametrize("table", list(SCHEMAS))
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+def test_matches_pydantic_on_generated_data(generated_rows, table, output_format):
+    _assert_same(generated_rows(table, output_format), SCHEMAS[table])
+
+
+@pytest.mark.parametrize("schema", [Customer, Order, OrderItem, Payment, Product])
+@pytest.mark.parametrize("typed", [False, True])
+def test_matches_pydantic_on_awkward_values(fuzz_rows, schema, typed):
+    _assert_same(fuzz_rows(schema, 2_000, seed=3, typed=typed), schema)
+
+
+def test_mixed_types_in_a_column_fall_back_to_pydantic(fuzz_rows):
+    rows = fuzz_rows(OrderItem, 200, seed=4, typed=False)
+    rows[7]["unit_price"] = 12.5
+    rows[9]["quantity"] = True
+    _assert_same(rows, OrderItem)
+
+
+def test_customer_rows_left_to_the_model_keep_its_errors():
+    rows = [
+        {"customer_id": "1", "first_name": "john", "last_name": "o'connor",
+         "email": "John@Example.com", "country": "US", "signup_date": "2024-01-01"},
+        {"customer_id": "2", "first_name": "A", "last_name": "X",
+         "email": "bad-email", "country": "US", "signup_date": "2024-01-01"},
+    ]
+    _assert_same(rows, Customer)
+    assert validate_columnar(rows, Customer)[0][0]["last_name"] == "O'Connor"
+
+
+# control characters and everything str.isspace() calls whitespace
+EDGE_CHARACTERS = [chr(c) for c in range(0x3001) if c < 0x20 or 0x7f <= c <= 0xa0 or chr(c).isspace()]
+
+
+@pytest.mark.parametrize("schema", [Order, OrderItem])
+def test_keys_are_stripped_like_the_model_strips_them(schema):
+    keys = [f"{c}ab{c}" for c in EDGE_CHARACTERS] + [c for c in EDGE_CHARACTERS] + ["\x1cab", "ab\u3000", "\u00e9"]
+    rows = []
+    for i, key in enumerate(keys):
+        row = {name: None for name in schema.model_fields}
+        if schema is Order:
+            row.update(order_id=key, customer_id=f"c{i}", order_date="2025-01-01T00:00:00", status="new")
+        else:
+            row.update(order_item_id=f"i{i}", order_id=f"o{i}", product_id=key)
+        rows.append(row)
+    _assert_same(rows, schema)
+
+
+class Note(BaseModel):
+    text: str
+
+
+def test_schema_without_rules_goes_through_pydantic():
+    rows = [{"text": "a"}, {"text": None}]
+    _assert_same(rows, Note)
+
+
+@pytest.mark.parametrize("options", [{"workers": 2}, {"chunk_size": 500}])
+def test_process_pool_options_are_rejected(options):
+    with pytest.raises(ValueError):
+        validate_columnar([], Order, **options)
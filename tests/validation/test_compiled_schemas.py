@@ -0,0 +1,43 @@
+import pytest
+
+from batch_data_pipeline.validation.helpers import validate_records
+from batch_data_pipeline.validation.schema.compiled import COMPILED_SCHEMAS
+from batch_data_pipeline.validation.schema.customer import Customer
+from batch_data_pipeline.validation.schema.order import Order
+from batch_data_pipeline.validation.schema.order_item import OrderItem
+from batch_data_pipeline.validation.schema.payment import Payment
+from batch_data_pipeline.validation.schema.product import Product
+
+SCHEMAS = {"customers": Customer, "products": Product, "orders": Order, "order_items": OrderItem, "payments": Payment}
+
+
+def _outcome(rows, schema, output="model"):
+    """Cleaned rows, plus each rejected row with its error details."""
+    valid, invalid = validate_records(rows, schema, output=output)
+    if output == "model":
+        valid = [m.model_dump(mode="json") for m in valid]
+    return valid, [(row["row_index"], row["errors"]) for row in invalid]
+
+
+def _assert_same(rows, schema):
+    assert _outcome(rows, COMPILED_SCHEMAS[schema]) == _outcome(rows, schema)
+
+
+@pytest.mark.parametrize("table", list(SCHEMAS))
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+def test_compiled_schema_matches_on_generated_data(generated_rows, table, output_format):
+    _assert_same(generated_rows(table, output_format), SCHEMAS[table])
+
+
+@pytest.mark.parametrize("schema", list(SCHEMAS.values()))
+@pytest.mark.parametrize("typed", [False, True])
+def test_compiled_schema_matches_on_awkward_values(fuzz_rows, schema, typed):
+    _assert_same(fuzz_rows(schema, 2_000, seed=11, typed=typed), schema)
+
+
+@pytest.mark.parametrize("schema", list(SCHEMAS.values()))
+def test_quarantine_errors_read_the_same_with_either_schema(fuzz_rows, schema):
+    rows = fuzz_rows(schema, 1_000, seed=5, typed=False)
+    compiled = _outcome(rows, COMPILED_SCHEMAS[schema], output="tuple")
+    assert compiled[1]  # the fuzz rows include rejected ones
+    assert compiled == _outcome(rows, schema, output="tuple")
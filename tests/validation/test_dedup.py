@@ -0,0 +1,91 @@
+from datetime import date
+
+import pytest
+
+from batch_data_pipeline.validation.dedup import DUPLICATE_KEY, KeyIndex
+
+DAY1, DAY2 = date(2025, 1, 1), date(2025, 1, 2)
+
+
+def _orders(*ids):
+    return [{"order_id": order_id, "customer_id": "c1"} for order_id in ids]
+
+
+def test_duplicates_within_a_file_keep_the_first_row():
+    raw = _orders("o1", "o2", "o1", "o3", "o2")
+    with KeyIndex() as index:
+        kept, invalid = index.split_duplicates("orders", raw, list(raw), [], DAY1)
+
+    assert kept == raw[:2] + [raw[3]]
+    assert [row["row_index"] for row in invalid] == [2, 4]
+    assert invalid[0]["errors"] == [{
+        "field": "order_id", "error": f"{DUPLICATE_KEY}: order_id 'o1' already loaded earlier in this file", "input": "o1",
+    }]
+
+
+def test_keys_loaded_on_an_earlier_day_are_quarantined(tmp_path):
+    with KeyIndex(tmp_path / "keys.sqlite") as index:
+        index.split_duplicates("orders", _orders("o1", "o2"), _orders("o1", "o2"), [], DAY1)
+
+    raw = _orders("o2", "", "o3")
+    invalid = [{"row_index": 1, "raw_data": raw[1], "errors": []}]
+    with KeyIndex(tmp_path / "keys.sqlite") as index:
+        kept, invalid = index.split_duplicates("orders", raw, [raw[0], raw[2]], invalid, DAY2, start=10)
+        assert index.loaded_on("orders", ["o1", "o2", "o3", "o4"]) == {"o1": "2025-01-01", "o2": "2025-01-01", "o3": "2025-01-02"}
+
+    assert kept == [raw[2]]
+    assert [row["row_index"] for row in invalid] == [1, 10]
+    assert invalid[1]["errors"][0]["error"] == f"{DUPLICATE_KEY}: order_id 'o2' already loaded on 2025-01-01"
+
+
+def test_rerunning_a_day_does_not_flag_its_own_keys(tmp_path):
+    raw = _orders("o1", "o2")
+    for _ in range(2):
+        with KeyIndex(tmp_path / "keys.sqlite") as index:
+            assert index.split_duplicates("orders", raw, list(raw), [], DAY1) == (raw, [])
+
+
+def test_batches_of_one_run_share_the_index():
+    fieldnames = ["payment_id", "order_id"]
+    with KeyIndex() as index:
+        index.split_duplicates("payments", [{}], [("p1", "o1")], [], DAY1, fieldnames=fieldnames)
+        kept, invalid = index.split_duplicates("payments", [{}], [("p1", "o1")], [], DAY1, start=1, fieldnames=fieldnames)
+
+    assert kept == []
+    assert invalid[0]["row_index"] == 1
+    assert "earlier in this file" in invalid[0]["errors"][0]["error"]
+
+
+@pytest.mark.parametrize("entity", ["customers", "products"])
+def test_entities_without_dedup_keys_pass_through(entity):
+    rows = [{"customer_id": "c1", "product_id": "p1"}] * 2
+    with KeyIndex() as index:
+        assert index.split_duplicates(entity, rows, rows, [], DAY1) == (rows, [])
+
+
+def test_compact_drops_keys_past_retention():
+    with KeyIndex() as index:
+        index.split_duplicates("orders", _orders("o1"), _orders("o1"), [], DAY1)
+        index.split_duplicates("orders", _orders("o2"), _orders("o2"), [], DAY2)
+
+        assert index.compact(date(2025, 1, 31), retention_days=29) == 1
+        assert index.loaded_on("orders", ["o1", "o2"]) == {"o2": "2025-01-02"}
+        assert index.count("orders") == 1
+
+
+def test_compact_gives_pages_back_only_once_many_are_free(tmp_path):
+    vacuums = []
+    with KeyIndex(tmp_path / "keys.sqlite") as index:
+        for day, prefix, n in ((DAY1, "a", 500), (DAY2, "b", 5000)):
+            keys = [f"{prefix}{i:06d}" for i in range(n)]
+            index.split_duplicates("orders", _orders(*keys), _orders(*keys), [], day)
+        index.split_duplicates("orders", _orders("c1"), _orders("c1"), [], date(2025, 1, 3))
+        index._db.set_trace_callback(lambda sql: vacuums.append(sql) if sql.endswith(("VACUUM", "incremental_vacuum")) else None)
+
+        pages = index._db.execute("PRAGMA page_count").fetchone()[0]
+        index.compact(date(2025, 1, 31), retention_days=29)  # a few free pages: left for reuse
+        assert vacuums == []
+        index.compact(date(2025, 2, 1), retention_days=29)
+        assert vacuums == ["PRAGMA incremental_vacuum"]
+        assert index._db.execute("PRAGMA page_count").fetchone()[0] < pages
+        assert index.count("orders") == 1
@@ -0,0 +1,85 @@
+import pytest
+from pydantic import EmailStr, TypeAdapter, ValidationError
+
+from batch_data_pipeline.validation import email_cache
+from batch_data_pipeline.validation.email_cache import (
+    CachedEmailStr,
+    LRUCache,
+    clear_email_cache,
+    email_cache_stats,
+)
+from batch_data_pipeline.validation.helpers import validate_records
+from batch_data_pipeline.validation.schema.customer import Customer
+
+VALUES = [
+    "john@example.com", "John.Smith+tag@Example.COM", "INFO@example.com", "a@b@c.com",
+    "bad-email", "@example.com", "john@", "john@-x.com", "john@localhost", "john@test",
+    "john..doe@example.com", "John Doe <john@example.com>", '"john doe"@example.com',
+    "jöhn@bücher.de", "john@xn--bcher-kva.ch", "john@[1.2.3.4]", "john@exa mple.com",
+    "john@example.com\n", "x" * 65 + "@example.com", "x" * 64 + "@" + "y" * 190 + ".com",
+    "john＠example.com", " john@example.com ", "",
+    "POSTMASTER@Example.com", "john@EXAMPLE.xn--p1ai", "john@example.com.", "john@.example.com",
+    "x" * 64 + "@" + "y" * 185 + ".com", "x" * 64 + "@" + "y" * 186 + ".com", '"john"@example.com',
+    "john.@example.com", ".john@example.com", "john@exam_ple.com", "john@example..com", "a@a.co",
+]
+
+
+def _outcome(adapter, value):
+    try:
+        return adapter.validate_python(value)
+    except ValidationError as e:
+        return [(err["type"], err["msg"]) for err in e.errors()]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_email_cache()
+    yield
+    clear_email_cache()
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_matches_email_str(value):
+    cached = TypeAdapter(CachedEmailStr)
+    # the second call is answered from the cache
+    assert _outcome(cached, value) == _outcome(TypeAdapter(EmailStr), value)
+    assert _outcome(cached, value) == _outcome(TypeAdapter(EmailStr), value)
+
+
+def test_counters_are_shared_across_validate_records_calls():
+    rows = [
+        {"customer_id": str(i), "first_name": "John", "last_name": "Doe",
+         "email": f"user{i % 3}@example.com", "country": "US", "signup_date": "2024-01-01"}
+        for i in range(6)
+    ]
+    validate_records(rows, Customer)
+    validate_records(rows, Customer)
+
+    stats = email_cache_stats()
+    assert stats["emails"]["misses"] == 3
+    assert stats["emails"]["hits"] == 9
+    assert stats["emails"]["hit_rate"] == 0.75
+    # the three addresses share one domain check
+    assert stats["domains"]["misses"] == 1
+    assert stats["domains"]["hits"] == 2
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.get_or_compute("a", str.upper)
+    cache.get_or_compute("b", str.upper)
+    cache.get_or_compute("a", str.upper)
+    cache.get_or_compute("c", str.upper)
+    cache.get_or_compute("a", str.upper)
+    cache.get_or_compute("b", str.upper)
+
+    assert cache.stats() == {"hits": 2, "misses": 4, "hit_rate": 2 / 6, "size": 2, "maxsize": 2}
+
+
+def test_errors_are_cached(monkeypatch):
+    adapter = TypeAdapter(CachedEmailStr)
+    _outcome(adapter, "bad-email")
+    monkeypatch.setattr(email_cache, "validate_email", None)
+
+    with pytest.raises(ValidationError, match="must have an @-sign"):
+        adapter.validate_python("bad-email")
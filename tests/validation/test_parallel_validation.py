@@ -0,0 +1,57 @@
+import pytest
+
+from batch_data_pipeline.validation import parallel
+from batch_data_pipeline.validation.helpers import validate_records
+from batch_data_pipeline.validation.schema.order_item import OrderItem
+
+
+def _rows(n):
+    return [
+        {
+            "order_item_id": f"i{i}",
+            "order_id": "" if i % 11 == 0 else f"o{i}",  # invalid
+            "product_id": f"p{i % 7}",
+            "quantity": "ten" if i % 9 == 0 else str(i % 5 + 1),
+            "unit_price": "12.50",
+            "line_total": "25.00",
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with parallel.validation_pool(2) as pool:
+        yield pool
+
+
+def test_parallel_validation_matches_single_process(pool):
+    rows = _rows(1_000)
+
+    valid, invalid = validate_records(rows, OrderItem)
+    par_valid, par_invalid = validate_records(rows, OrderItem, workers=2, chunk_size=150, pool=pool)
+
+    assert par_invalid == invalid
+    assert [r["row_index"] for r in par_invalid] == list(range(0, 1_000, 11))
+    assert [m.model_dump() for m in par_valid] == [m.model_dump() for m in valid]
+
+
+def test_parallel_validation_passes_the_output_mode(pool):
+    rows = _rows(400)
+
+    valid, invalid = validate_records(rows, OrderItem, output="json")
+    par_valid, par_invalid = validate_records(rows, OrderItem, workers=2, chunk_size=150, output="json", pool=pool)
+
+    assert (par_valid, par_invalid) == (valid, invalid)
+    assert isinstance(par_valid[0], dict)
+
+
+def test_small_inputs_without_a_pool_stay_in_process(monkeypatch):
+    def no_pool(workers):
+        raise AssertionError("started a pool")
+
+    monkeypatch.setattr(parallel, "validation_pool", no_pool)
+    rows = _rows(400)
+
+    assert validate_records(rows, OrderItem, workers=2, chunk_size=150, output="json") == \
+        validate_records(rows, OrderItem, output="json")
@@ -0,0 +1,81 @@
+import pytest
+
+from batch_data_pipeline.validation.helpers import iter_validate_records, validate_records
+from batch_data_pipeline.validation.profiling import FIELD, TYPE, ValidatorProfile
+from batch_data_pipeline.validation.schema.compiled import COMPILED_SCHEMAS
+from batch_data_pipeline.validation.schema.customer import Customer
+from batch_data_pipeline.validation.schema.order import Order
+from batch_data_pipeline.validation.schema.order_item import OrderItem
+from batch_data_pipeline.validation.schema.payment import Payment
+from batch_data_pipeline.validation.schema.product import Product
+
+TABLES = [
+    (Customer, "customers"), (Product, "products"), (Order, "orders"), (OrderItem, "order_items"), (Payment, "payments"),
+]
+CUSTOMERS = [
+    {"customer_id": "1", "first_name": "john", "last_name": "Doe", "email": "john@example.com",
+     "country": "US", "signup_date": "2024-01-01"},
+    {"customer_id": "2", "first_name": "A", "last_name": "X", "email": "bad-email",
+     "country": "N/A", "signup_date": "2024-01-01"},
+    {"customer_id": "3", "first_name": "Ann", "last_name": "Lee", "email": "",
+     "country": None, "signup_date": "2024-13-01"},
+]
+
+
+def _by_step(profile):
+    return {(r["field"], r["step"]): r for r in profile.rows()}
+
+
+@pytest.mark.parametrize("engine", ["pydantic", "compiled"])
+@pytest.mark.parametrize("Schema, table", TABLES)
+def test_profiling_does_not_change_the_result(generated_rows, Schema, table, engine):
+    schema = COMPILED_SCHEMAS[Schema] if engine == "compiled" else Schema
+    rows = generated_rows(table, "csv")
+    profile = ValidatorProfile()
+
+    assert validate_records(rows, schema, output="json", profile=profile) == validate_records(rows, schema, output="json")
+    steps = _by_step(profile)
+    for field in schema.model_fields:
+        assert steps[(field, FIELD)]["calls"] == len(rows)
+
+
+def test_counts_time_and_failures_per_validator():
+    profile = ValidatorProfile()
+    valid, invalid = validate_records(CUSTOMERS, Customer, profile=profile)
+    steps = _by_step(profile)
+
+    assert len(valid) == 1 and len(invalid) == 2
+    # validate_name runs for both name fields, and is counted per field
+    assert steps[("first_name", "validate_name")]["calls"] == 3
+    assert steps[("first_name", "validate_name")]["failures"] == 1
+    assert steps[("last_name", "validate_name")]["failures"] == 1
+    assert steps[("first_name", TYPE)]["failures"] == 0
+    # "bad-email" and "" fail in EmailStr itself, so validate_email never sees them
+    assert steps[("email", FIELD)]["failures"] == 2
+    assert steps[("email", TYPE)]["failures"] == 2
+    assert steps[("email", "validate_email")]["calls"] == 1
+    assert steps[("signup_date", TYPE)]["failure_rate"] == pytest.approx(1 / 3, abs=1e-4)
+    assert all(r["total_ms"] >= 0 for r in profile.rows())
+
+
+def test_profiles_accumulate_across_calls_and_batches():
+    profile = ValidatorProfile()
+    validate_records(CUSTOMERS, Customer, profile=profile)
+    for _ in iter_validate_records(CUSTOMERS, Customer, batch_size=2, profile=profile):
+        pass
+
+    assert _by_step(profile)[("country", "validate_country")]["calls"] == 6
+
+
+def test_table_lists_every_step():
+    profile = ValidatorProfile()
+    validate_records(CUSTOMERS, Customer, profile=profile)
+    table = profile.format_table().splitlines()
+
+    assert table[0].split()[:3] == ["schema", "field", "step"]
+    assert len(table) == 2 + len(profile.rows())
+
+
+def test_profiling_runs_in_one_process():
+    with pytest.raises(ValueError):
+        validate_records(CUSTOMERS, Customer, workers=2, profile=ValidatorProfile())
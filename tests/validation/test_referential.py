@@ -0,0 +1,85 @@
+import uuid
+
+import numpy as np
+import pytest
+
+from batch_data_pipeline.validation.referential import (
+    FK_VIOLATION, ReferenceIndex, ScalableBloomFilter, key_hashes,
+)
+
+
+def _keys(n, seed):
+    rng = np.random.default_rng(seed)
+    return [str(uuid.UUID(bytes=rng.bytes(16))) for _ in range(n)]
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = ScalableBloomFilter(capacity=5_000, error_rate=0.01)
+    present, absent = key_hashes(_keys(20_000, 1)), key_hashes(_keys(20_000, 2))
+    bloom.add(present)
+
+    assert len(bloom.layers) == 3  # 5k + 10k + 20k capacity
+    assert len(bloom) == 20_000
+    assert bloom.contains(present).all()
+    assert bloom.contains(absent).mean() < 0.01
+
+
+def test_bloom_filter_roundtrips_through_a_file(tmp_path):
+    bloom = ScalableBloomFilter(capacity=100)
+    keys = key_hashes(_keys(250, 3))
+    bloom.add(keys)
+    bloom.save(tmp_path / "keys.bloom.npz")
+
+    loaded = ScalableBloomFilter.load(tmp_path / "keys.bloom.npz")
+    assert len(loaded) == 250
+    assert [layer.capacity for layer in loaded.layers] == [layer.capacity for layer in bloom.layers]
+    assert np.array_equal(loaded.contains(keys), bloom.contains(keys))
+
+
+def test_split_orphans_moves_rows_with_unknown_parents():
+    index = ReferenceIndex()
+    index.register("customers", [{"customer_id": "c1"}, {"customer_id": "c2"}])
+    raw = [{"order_id": f"o{i}", "customer_id": customer} for i, customer in enumerate(["c1", "c9", "", "c2", "c8"])]
+    cleaned = [raw[0], raw[1], raw[3], raw[4]]
+    invalid = [{"row_index": 2, "raw_data": raw[2], "errors": []}]
+
+    kept, invalid = index.split_orphans("orders", raw, cleaned, invalid)
+
+    assert kept == [raw[0], raw[3]]
+    assert [row["row_index"] for row in invalid] == [1, 2, 4]
+    assert invalid[0]["raw_data"] == raw[1]
+    assert invalid[0]["errors"] == [
+        {"field": "customer_id", "error": f"{FK_VIOLATION}: no customers row with customer_id 'c9'", "input": "c9"}
+    ]
+
+
+def test_split_orphans_reads_tuples_by_fieldnames_and_offsets_row_index():
+    index = ReferenceIndex()
+    index.register("orders", [("o1",)], fieldnames=["order_id"])
+    index.register("products", [("p1",)], fieldnames=["product_id"])
+    fieldnames = ["order_item_id", "order_id", "product_id"]
+    cleaned = [("i1", "o1", "p1"), ("i2", "o2", "p2"), ("i3", "o1", "p3")]
+    raw = [dict(zip(fieldnames, row)) for row in cleaned]
+
+    kept, invalid = index.split_orphans("order_items", raw, cleaned, [], start=100, fieldnames=fieldnames)
+
+    assert kept == [cleaned[0]]
+    assert [row["row_index"] for row in invalid] == [101, 102]
+    assert [e["field"] for e in invalid[0]["errors"]] == ["order_id", "product_id"]
+    assert [e["field"] for e in invalid[1]["errors"]] == ["product_id"]
+
+
+@pytest.mark.parametrize("entity", ["customers", "products"])
+def test_entities_without_foreign_keys_pass_through(entity):
+    rows = [{"customer_id": "c1", "product_id": "p1"}]
+    assert ReferenceIndex().split_orphans(entity, rows, rows, []) == (rows, [])
+
+
+def test_committed_keys_are_known_to_later_runs(tmp_path):
+    first = ReferenceIndex(tmp_path)
+    first.seed("customers", ["c0"])
+    first.register("customers", [{"customer_id": "c1"}])
+    first.commit()
+
+    later = ReferenceIndex(tmp_path)
+    assert later.contains("customers", ["c0", "c1", "c2"]).tolist() == [True, True, False]
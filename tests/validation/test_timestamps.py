@@ -0,0 +1,119 @@
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pyarrow as pa
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from batch_data_pipeline.validation.schema.customer import Customer
+from batch_data_pipeline.validation.schema.order import Order
+from batch_data_pipeline.validation.timestamps import iso_layout, parse_timestamps
+
+DATETIMES = [
+    "2025-04-01T05:55:32.448490", "2025-04-01T05:55:32", "2025-04-01T05:55:32.1", " 2025-04-01T05:55:32.5 ",
+    "2024-02-29T00:00:00", "2023-02-29T00:00:00", "2025-04-31T10:00:00", "2025-04-01 05:55:32",
+    "2025-04-01T05:55:32Z", "2025-04-01T05:55:32+02:00", "2025-04-01T24:00:00", "2025-04-01T05:55:32.1234567",
+    "2025-04-01", "1700000000", "0999-01-01T00:00:00", "yesterday", "", None, datetime(2025, 4, 1, 5, 55, 32),
+]
+DATES = ["2024-01-01", " 2024-02-29 ", "2023-02-29", "2024-01-01T00:00:00", "01/02/2024", "", None, date(2024, 1, 1)]
+
+
+def _one_by_one(values, target):
+    adapter = TypeAdapter(target)
+    out = []
+    for v in values:
+        try:
+            parsed = adapter.validate_python(v.strip() if isinstance(v, str) else v)
+        except ValidationError:
+            parsed = None
+        if isinstance(parsed, datetime) and parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        out.append(parsed)
+    return out
+
+
+@pytest.mark.parametrize("kind, target, values", [
+    ("datetime", datetime, DATETIMES),
+    ("date", date, DATES),
+])
+def test_matches_pydantic_value_by_value(kind, target, values):
+    parsed = parse_timestamps(values, kind)
+    assert [None if np.isnat(v) else v.item() for v in parsed.values] == _one_by_one(values, target)
+
+
+def test_generator_layouts_take_no_fallback():
+    values = ["2025-04-01T05:55:32.448490", "2025-04-01T05:55:32", "2024-02-29T23:59:59.5", None]
+    parsed = parse_timestamps(values)
+    assert parsed.fallback == 0
+    assert parsed.values[2] == np.datetime64("2024-02-29T23:59:59.500000")
+    assert parse_timestamps(["2024-01-01", "2024-02-29"], "date").fallback == 0
+
+
+def test_counts_fallback_rows():
+    values = ["2025-04-01T05:55:32", " 2025-04-01T05:55:32 ", "2025-04-01 05:55:32", "2023-02-29T00:00:00",
+              "yesterday", None]
+    assert parse_timestamps(values).fallback == 4
+    # a column Arrow can't type as text goes value by value
+    assert parse_timestamps(values + [datetime(2025, 4, 1)]).fallback == 6
+
+
+@pytest.mark.parametrize("schema, field, kind, values", [
+    (Order, "order_date", "datetime", DATETIMES),
+    (Customer, "signup_date", "date", DATES),
+])
+def test_matches_the_models_parsing(schema, field, kind, values):
+    # mixed layouts and invalid text, through the schema's own cleaner and parser
+    parsed = parse_timestamps(values, kind)
+    for value, out in zip(values, parsed.values):
+        try:
+            expected = schema.__pydantic_validator__.validate_assignment(
+                schema.model_construct(), field, value,
+            )
+        except ValidationError:
+            assert np.isnat(out), value
+            continue
+        got = getattr(expected, field)
+        if isinstance(got, datetime) and got.tzinfo is not None:
+            got = got.astimezone(timezone.utc).replace(tzinfo=None)
+        assert out.item() == got, value
+
+
+def test_arrow_input_matches_python_input():
+    values = [v for v in DATETIMES if not isinstance(v, datetime)]
+    from_arrow = parse_timestamps(pa.array(values, type=pa.string()))
+    from_python = parse_timestamps(values)
+    assert np.array_equal(from_arrow.values, from_python.values, equal_nan=True)
+    assert from_arrow.fallback == from_python.fallback
+    assert from_arrow.fast.tolist() == from_python.fast.tolist()
+
+
+@pytest.mark.parametrize("kind, target, values", [
+    ("datetime", datetime, DATETIMES),
+    ("date", date, DATES),
+])
+def test_recognized_rows_are_ones_pydantic_parses_the_same(kind, target, values):
+    adapter = TypeAdapter(target)
+    values = [v for v in values if v is None or isinstance(v, str)]
+    parts, ok = iso_layout(pa.array(values, type=pa.string()), kind)
+
+    for value, part, recognized in zip(values, parts.to_pylist(), ok.tolist()):
+        if not recognized:
+            continue
+        try:
+            expected = adapter.validate_python(value)
+        except ValidationError:
+            pytest.fail(f"{value!r} recognized but rejected by Pydantic")
+        assert adapter.validate_python(part) == expected
+
+
+def test_generator_layouts_are_recognized():
+    values = ["2025-04-01T05:55:32.448490", "2025-04-01T05:55:32", "2024-02-29T23:59:59.5", None]
+    assert iso_layout(pa.array(values))[1].tolist() == [True, True, True, False]
+    assert iso_layout(pa.array(["2024-01-01", "2024-02-29"]), "date")[1].all()
+
+
+def test_other_rows_get_the_placeholder():
+    values = ["2025-04-01T05:55:32", "2025-04-01 05:55:32", "2023-02-29T00:00:00", "yesterday", None]
+    parts, ok = iso_layout(pa.array(values))
+    assert ok.tolist() == [True, False, False, False, False]
+    assert parts.to_pylist() == ["2025-04-01T05:55:32"] + ["2000-01-01T00:00:00"] * 4
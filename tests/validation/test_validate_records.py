@@ -19,7 +19,7 @@
 
 
 import pytest
-from batch_data_pipeline.validation.helpers import validate_records
+from batch_data_pipeline.validation.helpers import iter_validate_records, validate_records
 
 from batch_data_pipeline.validation.schema.customer import Customer
 from batch_data_pipeline.validation.schema.product import Product
@@ -181,3 +181,86 @@ def test_validate_records_logic(Schema, rows):
     assert "errors" in bad
     assert isinstance(bad["errors"], list)
     assert len(bad["errors"]) >= 1
+
+
+def _per_row(rows, Schema):
+    """Reference: the plain model_validate loop validate_records must match."""
+    from pydantic import ValidationError
+    from batch_data_pipeline.validation.helpers import extract_error_details
+
+    valid, invalid = [], []
+    for idx, record in enumerate(rows):
+        try:
+            valid.append(Schema.model_validate(record))
+        except ValidationError as e:
+            invalid.append({"row_index": idx, "raw_data": record, "errors": extract_error_details(e)})
+    return valid, invalid
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_chunked_validation_matches_per_row(chunk_size):
+    rows = [
+        {
+            "payment_id": str(i),
+            "order_id": "" if i % 13 == 0 else f"o{i}",  # ~8% invalid, clustered and spread
+            "amount": "FREE" if i % 5 == 0 else str(i + 0.5),
+            "payment_method": "card",
+            "paid_at": "2024-01-01T00:00:00" if i % 97 else "not-a-date",
+        }
+        for i in range(2_500)
+    ]
+
+    valid, invalid = validate_records(rows, Payment, chunk_size=chunk_size)
+    expected_valid, expected_invalid = _per_row(rows, Payment)
+
+    assert invalid == expected_invalid
+    assert [m.model_dump() for m in valid] == [m.model_dump() for m in expected_valid]
+
+
+@pytest.mark.parametrize("Schema", [Customer, Product, Order, OrderItem, Payment])
+@pytest.mark.parametrize("chunk_size", [1, 1000])
+def test_json_and_tuple_outputs_match_model_dump(fuzz_rows, Schema, chunk_size):
+    rows = fuzz_rows(Schema, 600, seed=2, typed=False)
+    models, invalid = validate_records(rows, Schema, chunk_size=chunk_size)
+    dumped = [m.model_dump(mode="json") for m in models]
+
+    assert validate_records(rows, Schema, chunk_size=chunk_size, output="json") == (dumped, invalid)
+    assert validate_records(rows, Schema, chunk_size=chunk_size, output="tuple") == (
+        [tuple(row.values()) for row in dumped],
+        invalid,
+    )
+
+
+def test_unknown_output_is_rejected():
+    with pytest.raises(ValueError):
+        validate_records([], Payment, output="models")
+
+
+@pytest.mark.parametrize("batch_size", [1, 333, 5_000])
+def test_iter_validate_records_batches_concatenate_to_validate_records(fuzz_rows, batch_size):
+    rows = fuzz_rows(Order, 2_000, seed=6, typed=False)
+    expected = validate_records(rows, Order, chunk_size=100, output="json")
+
+    valid, invalid = [], []
+    for valid_batch, invalid_batch in iter_validate_records(
+        iter(rows), Order, chunk_size=100, output="json", batch_size=batch_size
+    ):
+        valid.extend(valid_batch)
+        invalid.extend(invalid_batch)
+
+    assert (valid, invalid) == expected
+
+
+def test_iter_validate_records_reads_one_batch_ahead_at_most():
+    consumed = []
+
+    def source():
+        for i in range(100):
+            consumed.append(i)
+            yield {"payment_id": str(i), "order_id": "o", "amount": "1", "payment_method": "card",
+                   "paid_at": "2024-01-01T00:00:00"}
+
+    batches = iter_validate_records(source(), Payment, batch_size=10)
+    valid, invalid = next(batches)
+
+    assert (len(valid), invalid, len(consumed)) == (10, [], 10)
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from batch_data_pipeline.validation.cache import ValidationCache
+from batch_data_pipeline.validation.helpers import validate_records
+from batch_data_pipeline.validation.schema.customer import Customer
+from batch_data_pipeline.validation.schema.order import Order
+
+ROWS = [
+    {"customer_id": "1", "first_name": "john", "last_name": "Doe", "email": "john@example.com",
+     "country": "US", "signup_date": "2024-01-01"},
+    {"customer_id": "2", "first_name": "A", "last_name": "X", "email": "bad-email",
+     "country": "US", "signup_date": "2024-01-01"},
+]
+
+
+class Counter:
+    def __init__(self, result):
+        self.result, self.calls = result, 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.result
+
+
+@pytest.fixture
+def raw_file(tmp_path):
+    path = tmp_path / "customers_2025-01-01.csv"
+    path.write_text("customer_id\n1\n2\n")
+    return path
+
+
+def test_a_second_validation_of_the_same_file_is_loaded(tmp_path, raw_file):
+    cache = ValidationCache(tmp_path / "cache")
+    validate = Counter(validate_records(ROWS, Customer, output="json"))
+
+    first = cache.get_or_validate(raw_file, Customer, "pydantic", validate)
+    again = ValidationCache(tmp_path / "cache").get_or_validate(raw_file, Customer, "pydantic", validate)
+
+    assert validate.calls == 1
+    assert again == first == validate.result
+
+
+def test_key_follows_content_schema_and_engine(tmp_path, raw_file):
+    cache = ValidationCache(tmp_path / "cache")
+    key = cache.key(raw_file, Customer, "pydantic")
+    assert cache.key(raw_file, Customer, "compiled") != key
+    assert cache.key(raw_file, Order, "pydantic") != key
+
+    copy = tmp_path / "elsewhere.csv"
+    copy.write_bytes(raw_file.read_bytes())
+    assert cache.key(copy, Customer, "pydantic") == key
+    raw_file.write_text("customer_id\n1\n3\n")
+    assert cache.key(raw_file, Customer, "pydantic") != key
+
+
+def test_evicts_least_recently_used_entries_over_max_bytes(tmp_path):
+    cache = ValidationCache(tmp_path / "cache")
+    payload = ([{"v": os.urandom(1000).hex()}], [])
+    for i, key in enumerate("abc"):
+        cache.put(key, *payload)
+        os.utime(cache._entry(key), ns=(i * 10**9, i * 10**9))
+    cache.get("a")  # a is now the most recently used
+
+    cache.max_bytes = 2 * cache._entry("a").stat().st_size
+    assert cache.evict() == 1
+    assert cache.get("b") is None
+    assert cache.get("a") == cache.get("c") == payload
+
+
+def test_unreadable_entries_are_dropped(tmp_path):
+    cache = ValidationCache(tmp_path / "cache")
+    cache._entry("k").write_bytes(b"not a cache entry")
+
+    assert cache.get("k") is None
+    assert not cache._entry("k").exists()